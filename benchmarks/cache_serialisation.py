@@ -0,0 +1,83 @@
+"""
+Benchmark of saving and loading a figure cache using pickle and the columnar format.
+
+Creates a figure with several plots containing large arrays (lines, scatter points and hexbins) and many small
+elements (each with its own fonts), then reports the file size and the time taken to save and load it using each
+format. Columnar files are loaded both with and without memory-mapping.
+
+Usage:
+    python benchmarks/cache_serialisation.py [--points 1000000] [--small-elements 500] [--repeats 5] [--directory benchmark_cache]
+"""
+import argparse
+import os
+import shutil
+import time
+from typing import Callable
+
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+
+from QuasarCode.Data import Rect
+from QuasarCode.IO.Caching import CacheTarget
+from QuasarCode.Plotting import CachedFigureGrid, CachedPlot, CachedPlotFontInfo, CachedPlotHexbin, CachedPlotLine, CachedPlotScatter
+
+def make_figure(number_of_points: int, number_of_small_elements: int) -> CachedFigureGrid:
+    rng = np.random.default_rng(0)
+    grid = CachedFigureGrid(mosaic = [["a", "b"], ["c", "d"]], figure_size = (8, 8))
+    for plot_tag in ("a", "b", "c", "d"):
+        plot = CachedPlot(extent = Rect.create_from_limits(0, 1, 0, 1))
+        x = rng.random(number_of_points)
+        y = rng.random(number_of_points)
+        plot.add_element("line", CachedPlotLine(x = np.sort(x), y = y))
+        plot.add_element("scatter", CachedPlotScatter(x = x, y = y, colour = rng.random(number_of_points)))
+        hexbin_centres = np.stack(np.meshgrid(np.linspace(0, 1, 101), np.linspace(0, 1, 58)), axis = -1).reshape(-1, 2)
+        plot.add_element("hexbin", CachedPlotHexbin(extent = plot.extent, gridsize = 100, polygon_offsets = hexbin_centres, bin_values = rng.random(len(hexbin_centres))))
+        for index in range(number_of_small_elements // 4):
+            plot.add_element(f"small_{index}", CachedPlotLine(x = np.arange(5.0), y = rng.random(5), label = f"Line {index}", font = CachedPlotFontInfo(size = 8 + index % 4, family = ["serif"])))
+        grid.set_plot(plot_tag, plot)
+    return grid
+
+def time_call(function: Callable[[], object], repeats: int) -> float:
+    """
+    Get the fastest time taken by a function over several calls.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type = int, default = 1000000, help = "Number of points in each large element.")
+    parser.add_argument("--small-elements", type = int, default = 500, help = "Total number of small elements.")
+    parser.add_argument("--repeats", type = int, default = 5, help = "Number of times to repeat each measurement (the fastest is reported).")
+    parser.add_argument("--directory", default = "benchmark_cache", help = "Directory in which to write the cache files (removed afterwards).")
+    args = parser.parse_args()
+
+    grid = make_figure(args.points, args.small_elements)
+    data = grid.__get_cache_data__()
+    os.makedirs(args.directory, exist_ok = True)
+    try:
+        print(f"{'format':<22}{'size (MB)':>12}{'save (s)':>12}{'load (s)':>12}{'load + sum (s)':>16}")
+        for name, target in (
+            ("pickle", CacheTarget("figure.pickle")),
+            ("pickle (out-of-line)", CacheTarget("figure_out_of_line.pickle", out_of_line_arrays = True)),
+            ("columnar (mmap)", CacheTarget("figure.qcc")),
+            ("columnar (read)", CacheTarget("figure.qcc", mmap_mode = None)),
+        ):
+            save_time = time_call(lambda: target.save_data(args.directory, data), args.repeats)
+            load_time = time_call(lambda: CachedFigureGrid.__from_cache_data__(target.load_data(args.directory)), args.repeats)
+            # Time to load and then read all the data of one element (memory-mapped arrays are read on access)
+            load_and_read_time = time_call(lambda: float(np.sum(CachedFigureGrid.__from_cache_data__(target.load_data(args.directory)).plots["a"].plot_elements["scatter"].x)), args.repeats)
+            size = os.path.getsize(target.get_filepath(args.directory))
+            if os.path.isdir(target.get_sidecar_directory(args.directory)):
+                size += sum(entry.stat().st_size for entry in os.scandir(target.get_sidecar_directory(args.directory)))
+            print(f"{name:<22}{size / 2**20:>12.1f}{save_time:>12.4f}{load_time:>12.4f}{load_and_read_time:>16.4f}")
+    finally:
+        shutil.rmtree(args.directory)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Memory-leak regression benchmark for CachedFigureGrid figure creation.
+
+Renders and saves a large number of small figures, closing each one after saving, and reports the growth in
+memory use over the run. Growth should remain bounded (a few MB) regardless of the number of figures.
+
+Usage:
+    python benchmarks/figure_memory.py [--figures 10000] [--threads 1] [--pyplot] [--trace]
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import gc
+import io
+import os
+import resource
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+
+from QuasarCode.Data import Rect
+from QuasarCode.Plotting import CachedFigureGrid, CachedPlot, CachedPlotLine, CachedPlotScatter
+
+def render_figure(index: int, use_pyplot: bool) -> int:
+    grid = CachedFigureGrid(mosaic = [["a", "b"]], figure_size = (4, 2), use_pyplot = use_pyplot)
+    x = np.linspace(0, 1, 100)
+    line_plot = CachedPlot(extent = Rect.create_from_limits(0, 1, -1, 1))
+    line_plot.add_element("line", CachedPlotLine(x = x, y = np.sin(x * index)))
+    scatter_plot = CachedPlot(extent = Rect.create_from_limits(0, 1, 0, 1))
+    scatter_plot.add_element("scatter", CachedPlotScatter(x = x, y = x[::-1]))
+    grid.set_plot("a", line_plot)
+    grid.set_plot("b", scatter_plot)
+    grid.render()
+    buffer = io.BytesIO()
+    grid.figure.savefig(buffer, format = "png")
+    grid.close_figure()
+    return len(buffer.getvalue())
+
+def get_memory_use() -> float:
+    """
+    Get the current memory use of the process in MB (the peak use where the current value is unavailable).
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--figures", type = int, default = 10000, help = "Number of figures to render.")
+    parser.add_argument("--threads", type = int, default = 1, help = "Number of threads to render with (requires headless figures).")
+    parser.add_argument("--pyplot", action = "store_true", help = "Create figures using pyplot.")
+    parser.add_argument("--trace", action = "store_true", help = "Also measure growth of Python allocations using tracemalloc (much slower).")
+    parser.add_argument("--report-every", type = int, default = 1000, help = "Number of figures between progress reports.")
+    args = parser.parse_args()
+    if args.pyplot and args.threads > 1:
+        parser.error("Figures created using pyplot can't be rendered concurrently.")
+
+    # Warm up font and text caches so that they are not counted as growth
+    render_figure(0, args.pyplot)
+    gc.collect()
+    if args.trace:
+        tracemalloc.start()
+    baseline_traced, _ = tracemalloc.get_traced_memory()
+    baseline = get_memory_use()
+    start_time = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers = args.threads) as executor:
+        for start in range(0, args.figures, args.report_every):
+            count = min(args.report_every, args.figures - start)
+            list(executor.map(render_figure, range(start, start + count), [args.pyplot] * count))
+            gc.collect()
+            traced_report = f", {(tracemalloc.get_traced_memory()[0] - baseline_traced) / 2**20:8.2f} MB traced" if args.trace else ""
+            print(f"{start + count:>7} figures: {get_memory_use() - baseline:8.2f} MB growth{traced_report}, {time.perf_counter() - start_time:8.1f} s")
+
+    growth = get_memory_use() - baseline
+    print(f"Total growth over {args.figures} figures: {growth:.2f} MB ({growth * 2**20 / args.figures:.0f} bytes per figure)")
+
+if __name__ == "__main__":
+    main()
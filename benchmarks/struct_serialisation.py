@@ -0,0 +1,46 @@
+"""
+Benchmark of converting a figure to and from cache data with and without the compiled CacheableStruct schemas.
+
+Creates a figure with many small elements (so that the time is dominated by the structs rather than their arrays)
+and reports the time taken to get its cache data and to recreate it from that data, both using the schemas
+compiled for each struct type and using getattr and setattr for every attribute (`CacheableStruct._USE_CACHE_SCHEMA`),
+as well as the total time to save and load the figure using a pickle cache file.
+
+Usage:
+    python benchmarks/struct_serialisation.py [--small-elements 4000] [--points 1000] [--repeats 5] [--directory benchmark_cache]
+"""
+import argparse
+import shutil
+
+from QuasarCode.IO.Caching import CacheTarget
+from QuasarCode.Plotting import CachedFigureGrid
+from QuasarCode.Tools import CacheableStruct
+
+from cache_serialisation import make_figure, time_call
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--small-elements", type = int, default = 4000, help = "Total number of small elements.")
+    parser.add_argument("--points", type = int, default = 1000, help = "Number of points in each large element.")
+    parser.add_argument("--repeats", type = int, default = 5, help = "Number of times to repeat each measurement (the fastest is reported).")
+    parser.add_argument("--directory", default = "benchmark_cache", help = "Directory in which to write the cache file (removed afterwards).")
+    args = parser.parse_args()
+
+    grid = make_figure(args.points, args.small_elements)
+    target = CacheTarget("figure.pickle")
+    try:
+        print(f"{'path':<12}{'encode (s)':>12}{'decode (s)':>12}{'save (s)':>12}{'load (s)':>12}")
+        for name, use_schema in (("getattr", False), ("schema", True)):
+            CacheableStruct._USE_CACHE_SCHEMA = use_schema
+            data = grid.__get_cache_data__()
+            encode_time = time_call(grid.__get_cache_data__, args.repeats)
+            decode_time = time_call(lambda: CachedFigureGrid.__from_cache_data__(data), args.repeats)
+            save_time = time_call(lambda: target.save_object(args.directory, grid), args.repeats)
+            load_time = time_call(lambda: target.load_object(args.directory, CachedFigureGrid), args.repeats)
+            print(f"{name:<12}{encode_time:>12.4f}{decode_time:>12.4f}{save_time:>12.4f}{load_time:>12.4f}")
+    finally:
+        CacheableStruct._USE_CACHE_SCHEMA = True
+        shutil.rmtree(args.directory, ignore_errors = True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+from types import ModuleType
+from typing import Any, BinaryIO, Iterable
+
+from ._hashing import hash_cache_data
+
+def _hash_file(filepath: str) -> str:
+    hasher = hashlib.blake2b(digest_size = 32)
+    with open(filepath, "rb") as file:
+        for block in iter(lambda: file.read(2**20), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+def _get_file_state(filepath: str, hash_contents: bool) -> dict[str, Any]|None:
+    # None if the file doesn't exist
+    try:
+        if hash_contents:
+            return { "hash" : _hash_file(filepath) }
+        status = os.stat(filepath)
+        return { "mtime_ns" : status.st_mtime_ns, "size" : status.st_size }
+    except FileNotFoundError:
+        return None
+
+class CacheDependencies(object):
+    """
+    The inputs used to create cached data - input files, parameters and code versions.
+
+    A fingerprint of the dependencies can be saved with the data (see `CacheTarget.save_data`) and later
+    compared to decide whether the data needs to be recreated (see `CacheTarget.check_exists`).
+
+    Parameters:
+        Iterable[str] files:
+            Input files, identified by their modification time and size.
+        Iterable[str] hashed_files:
+            Input files, identified by a hash of their contents (slower, but unaffected by copying or touching files).
+        dict[str, Any]|None parameters:
+            Parameters used to create the data. Any cache data is supported, including numpy arrays.
+        dict[str, str]|None code_versions:
+            Versions of the code used to create the data, by name.
+    """
+
+    def __init__(self, files: Iterable[str] = (), hashed_files: Iterable[str] = (), parameters: dict[str, Any]|None = None, code_versions: dict[str, str]|None = None) -> None:
+        self.__files: dict[str, bool] = {}
+        self.__parameters: dict[str, Any] = {}
+        self.__code_versions: dict[str, str] = {}
+        for filepath in files:
+            self.add_file(filepath)
+        for filepath in hashed_files:
+            self.add_file(filepath, hash_contents = True)
+        if parameters is not None:
+            self.add_parameters(**parameters)
+        if code_versions is not None:
+            for name, version in code_versions.items():
+                self.add_code_version(name, version)
+
+    def copy(self) -> "CacheDependencies":
+        """
+        Create a copy of the dependencies that can be modified independently.
+
+        Returns:
+            CacheDependencies -> The new object.
+        """
+        result = CacheDependencies(parameters = self.__parameters, code_versions = self.__code_versions)
+        result.__files.update(self.__files)
+        return result
+
+    def add_file(self, filepath: str, hash_contents: bool = False) -> "CacheDependencies":
+        """
+        Add an input file.
+
+        Parameters:
+            str filepath:
+                The file.
+            bool hash_contents:
+                Identify the file by a hash of its contents rather than its modification time and size.
+
+        Returns:
+            CacheDependencies -> This object.
+        """
+        self.__files[os.path.abspath(filepath)] = hash_contents
+        return self
+
+    def add_parameters(self, **parameters: Any) -> "CacheDependencies":
+        """
+        Add parameters used to create the data.
+
+        Returns:
+            CacheDependencies -> This object.
+        """
+        self.__parameters.update(parameters)
+        return self
+
+    def add_code_version(self, name: str, version: str) -> "CacheDependencies":
+        """
+        Add the version of some code used to create the data.
+
+        Returns:
+            CacheDependencies -> This object.
+        """
+        self.__code_versions[name] = str(version)
+        return self
+
+    def add_module(self, module: ModuleType) -> "CacheDependencies":
+        """
+        Add the version of a module used to create the data.
+        This is the module's `__version__` if it has one, otherwise a hash of its source file.
+
+        Returns:
+            CacheDependencies -> This object.
+        """
+        version = getattr(module, "__version__", None)
+        if version is None:
+            if getattr(module, "__file__", None) is None:
+                raise ValueError(f"Unable to identify the version of module \"{module.__name__}\".")
+            version = _hash_file(module.__file__) # type: ignore[arg-type]
+        return self.add_code_version(module.__name__, version)
+
+    def get_fingerprint(self) -> dict[str, Any]:
+        """
+        Get the current state of the dependencies.
+
+        Returns:
+            dict[str, Any] -> JSON serialisable description of the dependencies.
+            Parameters are represented by a hash of their values.
+        """
+        return {
+            "files" : { filepath : _get_file_state(filepath, hash_contents) for filepath, hash_contents in self.__files.items() },
+            "parameters" : hash_cache_data(self.__parameters),
+            "code_versions" : dict(self.__code_versions),
+        }
+
+def check_files_unchanged(fingerprint: dict[str, Any]) -> bool:
+    """
+    Check whether the input files recorded in a fingerprint are unchanged.
+
+    Parameters:
+        dict[str, Any] fingerprint:
+            A fingerprint from `CacheDependencies.get_fingerprint`.
+
+    Returns:
+        bool -> True if all the files are in the same state.
+    """
+    for filepath, state in fingerprint["files"].items():
+        if _get_file_state(filepath, state is not None and "hash" in state) != state:
+            return False
+    return True
+
+DEPENDENCIES_MAGIC = b"QCDEPv1\0"
+# The data after the header starts at a multiple of this many bytes, so that aligned sections of the data
+# (see `ColumnarSerialiser.ALIGNMENT`) are also aligned in the file
+FINGERPRINT_HEADER_ALIGNMENT = 64
+
+def write_fingerprint_header(file: BinaryIO, fingerprint: dict[str, Any]) -> None:
+    """
+    Write a fingerprint to the start of a cache file.
+    The JSON is padded with spaces so that the data following the header is aligned.
+    """
+    encoded = json.dumps(fingerprint, separators = (",", ":"), sort_keys = True).encode("utf-8")
+    header_length = len(DEPENDENCIES_MAGIC) + 8 + len(encoded)
+    encoded += b" " * (-header_length % FINGERPRINT_HEADER_ALIGNMENT)
+    file.write(DEPENDENCIES_MAGIC)
+    file.write(len(encoded).to_bytes(8, "little"))
+    file.write(encoded)
+
+def read_fingerprint_header(file: BinaryIO) -> tuple[dict[str, Any]|None, int]:
+    """
+    Read the fingerprint at the start of a cache file (if any).
+
+    Returns:
+        tuple[dict[str, Any]|None, int] -> The fingerprint (None if the file has none) and the offset of the data in the file.
+    """
+    if file.read(len(DEPENDENCIES_MAGIC)) != DEPENDENCIES_MAGIC:
+        return None, 0
+    length = int.from_bytes(file.read(8), "little")
+    return json.loads(file.read(length)), len(DEPENDENCIES_MAGIC) + 8 + length
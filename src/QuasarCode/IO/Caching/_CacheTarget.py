@@ -1,23 +1,189 @@
+from concurrent.futures import ThreadPoolExecutor
+import io
 import os
 import pickle
-from typing import Any, Type, TypeVar
+import shutil
+import stat
+import tempfile
+import uuid
+from threading import Lock
+from typing import Any, BinaryIO, Callable, Iterable, Literal, Sequence, Type, TypeVar, cast
+
+import numpy as np
 
 from ._Cacheable import Cacheable
+from ._CacheDependencies import CacheDependencies, check_files_unchanged, read_fingerprint_header, write_fingerprint_header
+from ._ObjectCache import ObjectCache
+from ._PackedCacheStore import PackedCacheStore
+from ._compression import CompressionType, check_compression_available, get_available_compression, get_compression, open_compressed_writer, open_decompressed_reader
+from ._serialisers import CacheSerialiser, get_serialiser_for_data, get_serialiser_for_file
 
 T = TypeVar("T", bound = Cacheable)
 
+class _ArraySidecarPickler(pickle.Pickler):
+    """
+    Pickler that writes large numpy arrays to separate .npy files in a subdirectory of a directory.
+    The files are referenced by their paths relative to the directory.
+    """
+    def __init__(self, file: BinaryIO, sidecar_directory: str, subdirectory: str, threshold_bytes: int, fsync: bool = False) -> None:
+        super().__init__(file, protocol = pickle.HIGHEST_PROTOCOL)
+        self.__sidecar_directory = sidecar_directory
+        self.__subdirectory = subdirectory
+        self.__threshold_bytes = threshold_bytes
+        self.__fsync = fsync
+        self.__number_of_arrays = 0
+    def persistent_id(self, obj: Any) -> Any:
+        if type(obj) in (np.ndarray, np.memmap) and not obj.dtype.hasobject and obj.nbytes >= self.__threshold_bytes:
+            filename = f"{self.__number_of_arrays}.npy"
+            self.__number_of_arrays += 1
+            with open(os.path.join(self.__sidecar_directory, self.__subdirectory, filename), "wb") as file:
+                np.save(file, obj, allow_pickle = False)
+                if self.__fsync:
+                    file.flush()
+                    os.fsync(file.fileno())
+            return ("ndarray", f"{self.__subdirectory}/{filename}")
+        return None
+
+class _ArraySidecarUnpickler(pickle.Unpickler):
+    """
+    Unpickler that memory-maps arrays stored in .npy files by `_ArraySidecarPickler`.
+    """
+    def __init__(self, file: BinaryIO, sidecar_directory: str, mmap_mode: Literal["r", "c", "r+"]|None) -> None:
+        super().__init__(file)
+        self.__sidecar_directory = sidecar_directory
+        self.__mmap_mode = mmap_mode
+    def persistent_load(self, pid: Any) -> Any:
+        kind, filename = pid
+        if kind != "ndarray":
+            raise pickle.UnpicklingError(f"Unsupported persistent object type \"{kind}\".")
+        return np.load(os.path.join(self.__sidecar_directory, *filename.split("/")), mmap_mode = self.__mmap_mode, allow_pickle = False)
+
+_umask_lock = Lock()
+
+def _get_new_file_mode(filepath: str) -> int:
+    # Replacing a file keeps its permissions, otherwise use those of a file created with open()
+    try:
+        return stat.S_IMODE(os.stat(filepath).st_mode)
+    except FileNotFoundError:
+        pass
+    # The umask can only be read by setting it
+    with _umask_lock:
+        umask = os.umask(0o022)
+        os.umask(umask)
+    return 0o666 & ~umask
+
+def _fsync_directory(directory: str) -> None:
+    # Ensure that renames in a directory are written to disk (not supported on all platforms)
+    try:
+        file_descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(file_descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(file_descriptor)
+
+class BulkCacheError(Exception):
+    """
+    Raised by `CacheTarget.load_many` and `CacheTarget.save_many` after all files have been processed if any failed.
+
+    Attributes:
+        list[Any] results:
+            The result for each file, with None for those that failed.
+        dict[int, BaseException] errors:
+            The error raised for each file that failed, by index.
+    """
+    def __init__(self, results: list[Any], errors: dict[int, BaseException]) -> None:
+        super().__init__(f"{len(errors)} of {len(results)} cache files failed. First error (file {min(errors)}): {errors[min(errors)]!r}")
+        self.results: list[Any] = results
+        self.errors: dict[int, BaseException] = errors
+
+def _run_many(function: Callable[[int], Any], number_of_items: int, max_workers: int, return_exceptions: bool) -> list[Any]:
+    def run(index: int) -> tuple[bool, Any]:
+        try:
+            return True, function(index)
+        except Exception as error:
+            return False, error
+    with ThreadPoolExecutor(max_workers = max(1, min(max_workers, number_of_items))) as executor:
+        outcomes = list(executor.map(run, range(number_of_items)))
+    if return_exceptions:
+        return [value for _, value in outcomes]
+    errors = { index : value for index, (succeeded, value) in enumerate(outcomes) if not succeeded }
+    results = [value if succeeded else None for succeeded, value in outcomes]
+    if len(errors) > 0:
+        raise BulkCacheError(results, errors)
+    return results
+
 class CacheTarget(object):
     """
     A class to manage caching of data to and from pickle files.
 
+    Other formats may be used by registering them for the extension of the cache file (see `register_serialiser`)
+    or by specifying one directly. Files with the extension ".qcc" use the columnar format (see `ColumnarSerialiser`),
+    which stores arrays so that they can be memory-mapped. Files are loaded using the format they were saved in.
+
+    Data is written to a temporary file that then replaces the cache file, so an interrupted save leaves the
+    previous file intact. Files may optionally be compressed (compressed files can't be memory-mapped, so are
+    read into memory when loaded). Compression is detected automatically when loading.
+
+    Large arrays may optionally be stored out-of-line as .npy files in a directory alongside the cache file
+    (named as the cache file with ".arrays" appended). When loaded, these are memory-mapped so that only the
+    parts of the data that are accessed are read from disk. Each save writes its arrays to a new subdirectory,
+    which is only used once the cache file has been replaced, so an interrupted save leaves the previous
+    file and its arrays intact. Files with out-of-line arrays are always loaded
+    this way, regardless of the settings of the target used to load them.
+
+    Alternatively, the data may be stored as an entry in a container file holding the data of many targets
+    (see `PackedCacheStore`), keyed by the relative file path. Data in a container file can't be memory-mapped.
+
     Parameters:
         str relative_file_path:
             The relative file path to the cache file.
             This path is relative to the root directory provided when saving or loading data.
+        bool out_of_line_arrays:
+            Store numpy arrays of at least `out_of_line_threshold` bytes in separate .npy files.
+        int out_of_line_threshold:
+            The minimum size in bytes of arrays to store out-of-line.
+        str|None mmap_mode:
+            The mode used to memory-map out-of-line arrays when loading (see `np.load`).
+            The default ("c") is copy-on-write - changes are held in memory only. Set to None to read arrays fully.
+            Also used for arrays in files using a format that supports memory-mapping.
+        CacheSerialiser|None serialiser:
+            The format used to save the data. Defaults to the format registered for the file's extension, or pickle.
+            Out-of-line arrays are only used with pickle.
+        str|None compression:
+            Compress the file using "zstd" (requires the zstandard package), "lz4" (requires the lz4 package) or "gzip".
+            Use "auto" for the fastest of these that is available. Out-of-line arrays are not compressed.
+        int|None compression_level:
+            The compression level. Defaults to 3 for zstd, 0 for lz4 and 6 for gzip. Lower levels are faster.
+        bool fsync:
+            Flush the data to disk before replacing the cache file (so that it is intact after a system crash).
+            This makes saving slower, particularly on network filesystems.
+        ObjectCache|None object_cache:
+            In-memory cache of loaded data, used to avoid reading the file again if it has not changed.
+        str|None packed_store:
+            The path (relative to the root directory) of a container file in which to store the data instead of a
+            separate file.
     """
 
-    def __init__(self, relative_file_path: str) -> None:
+    def __init__(self, relative_file_path: str, out_of_line_arrays: bool = False, out_of_line_threshold: int = 65536, mmap_mode: Literal["r", "c", "r+"]|None = "c", serialiser: CacheSerialiser|None = None, compression: CompressionType|Literal["auto"]|None = None, compression_level: int|None = None, fsync: bool = False, object_cache: ObjectCache|None = None, packed_store: str|None = None) -> None:
         self.__relative_file_path: str = relative_file_path
+        self.__out_of_line_arrays: bool = out_of_line_arrays
+        self.__out_of_line_threshold: int = out_of_line_threshold
+        self.__mmap_mode: Literal["r", "c", "r+"]|None = mmap_mode
+        self.__serialiser: CacheSerialiser|None = serialiser if serialiser is not None else get_serialiser_for_file(relative_file_path)
+        self.__compression: CompressionType|None = get_available_compression() if compression == "auto" else compression
+        if self.__compression is not None:
+            check_compression_available(self.__compression)
+        self.__compression_level: int|None = compression_level
+        self.__fsync: bool = fsync
+        self.__object_cache: ObjectCache|None = object_cache
+        self.__packed_store: str|None = packed_store
+        self.__packed_store_key: str = os.path.normpath(relative_file_path).replace(os.sep, "/")
+        # Number of bytes to read to identify the format of a file
+        self.__magic_length: int = max(16, len(self.__serialiser.magic) if self.__serialiser is not None else 0)
 
     @property
     def relative_filepath(self) -> str:
@@ -44,20 +210,123 @@ class CacheTarget(object):
         """
         return os.path.join(root_directory, self.__relative_file_path)
 
-    def check_exists(self, root_directory: str) -> bool:
+    @property
+    def serialiser(self) -> CacheSerialiser|None:
+        """
+        CacheSerialiser|None -> The format used to save data (None for pickle).
+        """
+        return self.__serialiser
+
+    def get_packed_store(self, root_directory: str) -> PackedCacheStore|None:
+        """
+        Get the container file used to store the data.
+
+        Parameters:
+            str root_directory:
+                The root directory to which the relative path of the container file will be appended.
+
+        Returns:
+            PackedCacheStore|None -> The store, or None if the data is stored in its own file.
+        """
+        if self.__packed_store is None:
+            return None
+        return PackedCacheStore.open(self.__get_packed_store_filepath(root_directory))
+
+    def __get_packed_store_filepath(self, root_directory: str) -> str:
+        return os.path.join(os.path.abspath(root_directory), cast(str, self.__packed_store))
+
+    def __check_packed_store_missing(self, root_directory: str) -> bool:
+        # Avoid creating a container file (and its directories) just to find that it doesn't contain the data
+        return self.__packed_store is not None and not os.path.exists(self.__get_packed_store_filepath(root_directory))
+
+    @property
+    def object_cache(self) -> ObjectCache|None:
+        """
+        ObjectCache|None -> The in-memory cache of loaded data (if any).
+        """
+        return self.__object_cache
+
+    @property
+    def compression(self) -> CompressionType|None:
+        """
+        str|None -> The compression used when saving (None if uncompressed).
+        """
+        return self.__compression
+
+    @property
+    def out_of_line_arrays(self) -> bool:
+        """
+        bool -> Are large arrays stored in separate files?
+        """
+        return self.__out_of_line_arrays
+
+    def get_sidecar_directory(self, root_directory: str) -> str:
+        """
+        Get the directory used to store out-of-line arrays (in a subdirectory for each save).
+
+        Parameters:
+            str root_directory:
+                The root directory to which the relative file path will be appended.
+
+        Returns:
+            str -> The directory path.
+        """
+        return self.get_filepath(root_directory) + ".arrays"
+
+    def check_exists(self, root_directory: str, check_fresh: bool = False, dependencies: CacheDependencies|None = None) -> bool:
         """
         Check if the cache file exists at the specified location.
 
+        Optionally, also check that the data is up to date with its dependencies (see `save_data`).
+        Only the header of the file is read.
+
+        Parameters:
+            str root_directory:
+                The root directory to which the relative file path will be appended.
+            bool check_fresh:
+                Also check that the input files recorded when the data was saved are unchanged.
+            CacheDependencies|None dependencies:
+                The current dependencies of the data. If specified, also check that these match the dependencies
+                recorded when the data was saved (implies `check_fresh`).
+                Files saved without dependencies are out of date.
+
+        Returns:
+            bool -> True if the cache file exists (and is up to date, if checked), False otherwise.
+        """
+        if self.__check_packed_store_missing(root_directory):
+            return False
+        store = self.get_packed_store(root_directory)
+        if not (os.path.exists(self.get_filepath(root_directory)) if store is None else self.__packed_store_key in store):
+            return False
+        if not check_fresh and dependencies is None:
+            return True
+        fingerprint = self.get_dependency_fingerprint(root_directory)
+        if fingerprint is None:
+            return dependencies is None
+        if dependencies is not None and dependencies.get_fingerprint() != fingerprint:
+            return False
+        return check_files_unchanged(fingerprint)
+
+    def get_dependency_fingerprint(self, root_directory: str) -> dict[str, Any]|None:
+        """
+        Read the fingerprint of the dependencies recorded when the data was saved, without loading the data.
+
         Parameters:
             str root_directory:
                 The root directory to which the relative file path will be appended.
 
         Returns:
-            bool -> True if the cache file exists, False otherwise.
+            dict[str, Any]|None -> The fingerprint (see `CacheDependencies.get_fingerprint`), or None if the data was saved without one.
         """
-        return os.path.exists(self.get_filepath(root_directory))
+        if self.__check_packed_store_missing(root_directory):
+            raise FileNotFoundError(f"Unable to locate cache store at \"{self.__get_packed_store_filepath(root_directory)}\".")
+        store = self.get_packed_store(root_directory)
+        if store is not None:
+            return store.read_fingerprint(self.__packed_store_key)
+        with open(self.get_filepath(root_directory), "rb") as file:
+            return read_fingerprint_header(file)[0]
     
-    def save_data(self, root_directory: str, data: dict[str, Any]) -> None:
+    def save_data(self, root_directory: str, data: dict[str, Any], dependencies: CacheDependencies|None = None) -> None:
         """
         Save data to a pickle file using this target from a given root directory.
 
@@ -66,19 +335,84 @@ class CacheTarget(object):
                 The root directory to which the relative file path will be appended.
             dict[str, Any] data:
                 The data to save to the pickle file.
+            CacheDependencies|None dependencies:
+                The inputs used to create the data. A fingerprint of these is stored in a header at the start of the
+                file, so that `check_exists` can determine whether the data is out of date.
         """
+        store = self.get_packed_store(root_directory)
+        if store is not None:
+            buffer = io.BytesIO()
+            self.__write_data(buffer, data, None)
+            store.write(self.__packed_store_key, buffer.getvalue(), dependencies.get_fingerprint() if dependencies is not None else None)
+            if self.__object_cache is not None:
+                self.__object_cache.invalidate(os.path.join(store.filepath, self.__packed_store_key))
+            return
+
         filepath = self.get_filepath(os.path.abspath(root_directory))
-        directory = os.path.dirname(self.get_filepath(root_directory))
-        if not os.path.exists(directory):
-            paths_to_make = []
-            test_path = directory
-            while not os.path.exists(test_path):
-                paths_to_make.append(test_path)
-                test_path = os.path.dirname(test_path)
-            for path in paths_to_make[::-1]:
-                os.mkdir(path)
-        with open(filepath, "wb") as file:
-            pickle.dump(data, file)
+        os.makedirs(os.path.dirname(filepath), exist_ok = True)
+        sidecar_directory = self.get_sidecar_directory(os.path.abspath(root_directory))
+        use_sidecar = self.__serialiser is None and self.__out_of_line_arrays
+        # Write the arrays to a new subdirectory, referenced by the new file, so that the old file's arrays remain valid
+        # until the file is replaced (and arrays memory-mapped from them, which may be being saved, remain readable)
+        sidecar_subdirectory = uuid.uuid4().hex
+        new_sidecar_directory = os.path.join(sidecar_directory, sidecar_subdirectory)
+        if use_sidecar:
+            os.makedirs(new_sidecar_directory)
+
+        # Write to a temporary file and then replace the cache file, so that an interrupted save never leaves a partial file
+        # This also keeps arrays memory-mapped from the old file valid
+        file_descriptor, temporary_filepath = tempfile.mkstemp(prefix = f".{os.path.basename(filepath)}.", suffix = ".tmp", dir = os.path.dirname(filepath))
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                # Temporary files are created accessible only by their owner
+                if hasattr(os, "fchmod"):
+                    os.fchmod(file.fileno(), _get_new_file_mode(filepath))
+                if dependencies is not None:
+                    write_fingerprint_header(file, dependencies.get_fingerprint())
+                self.__write_data(file, data, (sidecar_directory, sidecar_subdirectory) if use_sidecar else None)
+                if self.__fsync:
+                    file.flush()
+                    os.fsync(file.fileno())
+            if use_sidecar and self.__fsync:
+                _fsync_directory(new_sidecar_directory)
+                _fsync_directory(sidecar_directory)
+            os.replace(temporary_filepath, filepath)
+        except BaseException:
+            if os.path.exists(temporary_filepath):
+                os.remove(temporary_filepath)
+            if os.path.exists(new_sidecar_directory):
+                shutil.rmtree(new_sidecar_directory)
+            raise
+        if self.__fsync:
+            _fsync_directory(os.path.dirname(filepath))
+        if self.__object_cache is not None:
+            self.__object_cache.invalidate(filepath)
+
+        # Remove the arrays of previous saves (any that can't be removed yet are removed by a later save)
+        if use_sidecar:
+            for name in os.listdir(sidecar_directory):
+                if name != sidecar_subdirectory:
+                    path = os.path.join(sidecar_directory, name)
+                    if os.path.isdir(path):
+                        shutil.rmtree(path, ignore_errors = True)
+                    else:
+                        try:
+                            os.remove(path)
+                        except OSError:
+                            pass
+        elif os.path.exists(sidecar_directory):
+            shutil.rmtree(sidecar_directory)
+
+    def __write_data(self, file: BinaryIO, data: dict[str, Any], sidecar_location: tuple[str, str]|None) -> None:
+        stream: BinaryIO = file if self.__compression is None else open_compressed_writer(file, self.__compression, self.__compression_level)
+        if self.__serialiser is not None:
+            self.__serialiser.save(stream, data)
+        elif sidecar_location is not None:
+            _ArraySidecarPickler(stream, *sidecar_location, self.__out_of_line_threshold, self.__fsync).dump(data)
+        else:
+            pickle.dump(data, stream, protocol = pickle.HIGHEST_PROTOCOL)
+        if stream is not file:
+            stream.close()
 
     def load_data(self, root_directory: str) -> dict[str, Any]:
         """
@@ -91,15 +425,58 @@ class CacheTarget(object):
         Returns:
             dict[str, Any] -> The data loaded from the pickle file.
         """
+        if self.__check_packed_store_missing(root_directory):
+            raise FileNotFoundError(f"Unable to locate cache store at \"{self.__get_packed_store_filepath(root_directory)}\".")
+        store = self.get_packed_store(root_directory)
+        if store is not None:
+            key = os.path.join(store.filepath, self.__packed_store_key)
+            version = store.get_version(self.__packed_store_key)
+            if version is None:
+                if self.__object_cache is not None:
+                    self.__object_cache.invalidate(key)
+                raise FileNotFoundError(f"Unable to locate entry \"{self.__packed_store_key}\" in cache store \"{store.filepath}\".")
+            load_entry = lambda: self.__read_data(io.BytesIO(store.read(self.__packed_store_key)), None, root_directory)
+            if self.__object_cache is not None:
+                return self.__object_cache.load(key, load_entry, stamp = (version, os.stat(store.filepath).st_ino, 0))
+            return load_entry()
+
         filepath = self.get_filepath(os.path.abspath(root_directory))
         if not os.path.exists(filepath):
+            if self.__object_cache is not None:
+                self.__object_cache.invalidate(filepath)
             raise FileNotFoundError(f"Unable to locate cache file at \"{filepath}\".")
+        if self.__object_cache is not None:
+            return self.__object_cache.load(filepath, lambda: self.__read_file(root_directory, filepath))
+        return self.__read_file(root_directory, filepath)
+
+    def __read_file(self, root_directory: str, filepath: str) -> dict[str, Any]:
         with open(filepath, "rb") as file:
-            return pickle.load(file)
+            return self.__read_data(file, filepath, root_directory)
+
+    def __read_data(self, file: BinaryIO, filepath: str|None, root_directory: str) -> dict[str, Any]:
+        # Data can only be memory-mapped if the path of the file is known
+        _, offset = read_fingerprint_header(file)
+        file.seek(offset)
+        compression = get_compression(file.read(4))
+        file.seek(offset)
+        if compression is None:
+            serialiser = get_serialiser_for_data(file.read(self.__magic_length), self.__serialiser)
+            file.seek(offset)
+            if serialiser is not None:
+                return serialiser.load(filepath, self.__mmap_mode, offset) if filepath is not None else serialiser.load(file, None)
+            return _ArraySidecarUnpickler(file, self.get_sidecar_directory(os.path.abspath(root_directory)), self.__mmap_mode).load()
+        # Compressed files are read into memory
+        with open_decompressed_reader(file, compression) as stream:
+            serialiser = get_serialiser_for_data(stream.read(self.__magic_length), self.__serialiser)
+        file.seek(offset)
+        with open_decompressed_reader(file, compression) as stream:
+            if serialiser is not None:
+                return serialiser.load(stream, None)
+            return _ArraySidecarUnpickler(stream, self.get_sidecar_directory(os.path.abspath(root_directory)), self.__mmap_mode).load()
         
     # Handle objects of type Cacheable
 
-    def save_object(self, root_directory: str, obj: Cacheable) -> None:
+    def save_object(self, root_directory: str, obj: Cacheable, dependencies: CacheDependencies|None = None) -> None:
         """
         Save a Cacheable object to a pickle file using this target from a given root directory.
 
@@ -108,10 +485,12 @@ class CacheTarget(object):
                 The root directory to which the relative file path will be appended.
             object obj:
                 The Cacheable object to save.
+            CacheDependencies|None dependencies:
+                The inputs used to create the object (see `save_data`).
         """
         if not isinstance(obj, Cacheable):
             raise TypeError("The object must be an instance of Cacheable.")
-        self.save_data(root_directory, obj.__get_cache_data__())
+        self.save_data(root_directory, obj.__get_cache_data__(), dependencies)
 
     def load_object(self, root_directory: str, cls: Type[T]) -> T:
         """
@@ -128,3 +507,66 @@ class CacheTarget(object):
         """
         data = self.load_data(root_directory)
         return cls.__from_cache_data__(data)
+
+    # Handle many targets at once
+
+    @staticmethod
+    def load_many(targets: Sequence["CacheTarget"], root_directory: str, cls: Type[T]|None = None, max_workers: int = 16, return_exceptions: bool = False) -> list[Any]:
+        """
+        Load data (or Cacheable objects) from many cache files concurrently.
+
+        Files are read and deserialised by a pool of threads, which hides the latency of opening each file
+        (significant on network and parallel filesystems).
+
+        Parameters:
+            Sequence[CacheTarget] targets:
+                The targets to load.
+            str root_directory:
+                The root directory to which the relative file paths will be appended.
+            Type[T]|None cls:
+                The type of Cacheable object to load. If None, the data is returned.
+            int max_workers:
+                The maximum number of files to read at once.
+            bool return_exceptions:
+                Return the errors raised for files that fail in place of their results.
+                Otherwise, a `BulkCacheError` is raised once all the files have been processed.
+
+        Returns:
+            list[Any] -> The data or object loaded from each file, in the same order as the targets.
+        """
+        if cls is None:
+            return _run_many(lambda index: targets[index].load_data(root_directory), len(targets), max_workers, return_exceptions)
+        return _run_many(lambda index: targets[index].load_object(root_directory, cls), len(targets), max_workers, return_exceptions)
+
+    @staticmethod
+    def save_many(targets: Sequence["CacheTarget"], root_directory: str, items: Iterable[dict[str, Any]|Cacheable], max_workers: int = 16, return_exceptions: bool = False) -> list[BaseException|None]:
+        """
+        Save data (or Cacheable objects) to many cache files concurrently.
+
+        Parameters:
+            Sequence[CacheTarget] targets:
+                The targets to save to.
+            str root_directory:
+                The root directory to which the relative file paths will be appended.
+            Iterable[dict[str, Any]|Cacheable] items:
+                The data or object to save to each target.
+            int max_workers:
+                The maximum number of files to write at once.
+            bool return_exceptions:
+                Return the error raised for each file that fails (None for those that succeed).
+                Otherwise, a `BulkCacheError` is raised once all the files have been processed.
+
+        Returns:
+            list[BaseException|None] -> None for each file (or the error raised, if `return_exceptions` is set).
+        """
+        items = list(items)
+        if len(items) != len(targets):
+            raise ValueError(f"Number of items ({len(items)}) does not match the number of targets ({len(targets)}).")
+        def save(index: int) -> None:
+            item = items[index]
+            if isinstance(item, Cacheable):
+                targets[index].save_object(root_directory, item)
+            else:
+                targets[index].save_data(root_directory, item)
+        results = _run_many(save, len(targets), max_workers, return_exceptions)
+        return [result if isinstance(result, BaseException) else None for result in results]
@@ -1,4 +1,7 @@
+from typing import Any
+
 from ._CacheTarget import CacheTarget
+from ._ObjectCache import ObjectCache
 
 class CacheTargetFactory(object):
     """
@@ -11,6 +14,13 @@ class CacheTargetFactory(object):
             This path will be relative to the cache directory and, as such, should have no drive component or preceding "/".
         (args) tuple[str,...] label_names:
             The names of the labels that will be used to create the file path.
+        (kwargs) target_options:
+            Options passed to each new CacheTarget (e.g. `out_of_line_arrays`, `serialiser` or `compression`).
+            Set `packed_store` to the path of a container file to store the data of all the targets in one file (see `PackedCacheStore`).
+            The format of the files is otherwise selected by the extension in the template (e.g. ".qcc" for the columnar format).
+        ObjectCache|bool object_cache:
+            In-memory cache of loaded data shared by all targets created by the factory.
+            Set to True to create a new cache with the default size, or pass an existing cache to share it with other factories.
 
     Examples:
         ```
@@ -23,9 +33,11 @@ class CacheTargetFactory(object):
         ```
     """
 
-    def __init__(self, filename_template: str, *label_names: str) -> None:
+    def __init__(self, filename_template: str, *label_names: str, object_cache: ObjectCache|bool = False, **target_options: Any) -> None:
         self.__relative_filepath_template: str = filename_template
         self.__label_names: tuple[str, ...] = label_names
+        self.__object_cache: ObjectCache|None = ObjectCache() if object_cache is True else object_cache if isinstance(object_cache, ObjectCache) else None
+        self.__target_options: dict[str, Any] = target_options
 
     def new(self, **labels: str) -> CacheTarget:
         """
@@ -46,7 +58,7 @@ class CacheTargetFactory(object):
         for label_name in self.__label_names:
             if label_name not in labels:
                 raise KeyError(f"No value provided for required label \"{label_name}\".")
-        return CacheTarget(self.__relative_filepath_template.format(**{ label_name : labels[label_name] for label_name in self.__label_names }))
+        return CacheTarget(self.__relative_filepath_template.format(**{ label_name : labels[label_name] for label_name in self.__label_names }), object_cache = self.__object_cache, **self.__target_options)
 
     @property
     def label_names(self) -> tuple[str, ...]:
@@ -67,3 +79,13 @@ class CacheTargetFactory(object):
             str -> The template string.
         """
         return self.__relative_filepath_template
+
+    @property
+    def object_cache(self) -> ObjectCache|None:
+        """
+        The in-memory cache of loaded data shared by the targets created by this factory.
+
+        Returns:
+            ObjectCache|None -> The cache, or None if loaded data is not cached.
+        """
+        return self.__object_cache
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, TypeVar, Type
+from typing import Any, Sequence, TypeVar, Type
 
 T = TypeVar("T", bound = "Cacheable")
 
@@ -10,6 +10,10 @@ class Cacheable(ABC):
     Abstract Methods:
         __from_cache_data__
         __get_cache_data__
+
+    Optional Methods:
+        __from_batch_cache_data__
+        __get_batch_cache_data__
     """
 
     @classmethod
@@ -33,3 +37,32 @@ class Cacheable(ABC):
             dict[str, Any] -> The data to be cached.
         """
         raise NotImplementedError("This method must be implemented by subclasses.")
+
+    @classmethod
+    def __from_batch_cache_data__(cls: Type[T], data: dict[str, Any]) -> list[T]:
+        """
+        Load several objects of this type from the data created by `__get_batch_cache_data__`.
+
+        Parameters:
+            dict[str, Any] data:
+                The data to load the objects from.
+
+        Returns:
+            list -> The loaded objects.
+        """
+        return [cls.__from_cache_data__(item_data) for item_data in data["data"]]
+
+    @classmethod
+    def __get_batch_cache_data__(cls, items: Sequence["Cacheable"]) -> dict[str, Any]:
+        """
+        Get the data to be cached for several objects of exactly this type (e.g. the items of a CacheableList).
+        Override this to store the objects' data together (for example, as concatenated arrays).
+
+        Parameters:
+            Sequence[Cacheable] items:
+                The objects.
+
+        Returns:
+            dict[str, Any] -> The data to be cached.
+        """
+        return { "data" : [item.__get_cache_data__() for item in items] }
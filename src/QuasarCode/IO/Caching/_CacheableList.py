@@ -1,4 +1,4 @@
-from typing import Any, Iterable
+from typing import Any, Iterable, cast
 from typing import TypeVar
 
 from ._Cacheable import Cacheable
@@ -31,13 +31,36 @@ class CacheableList[T](list[T], Cacheable):
         
         Returns:
             CacheableList -> The loaded list of cacheable objects.
+
+        Items stored together may share memory (see `Cacheable.__from_batch_cache_data__` for each type), in which
+        case keeping any of the loaded items keeps the data of all of them in memory.
         """
+        if "type" in data:
+            return cls(data["type"].__from_batch_cache_data__(data["batch"]))
         number_of_items: int = data["count"]
-        return cls([data["types"][i].__from_cache_data__(data["data"]) for i in range(number_of_items)])
+        return cls([data["types"][i].__from_cache_data__(data["data"][i]) for i in range(number_of_items)])
 
     def __get_cache_data__(self) -> dict[str, Any]:
+        """
+        Get the data to be cached.
+
+        Where all the items have the same type, the type is stored once along with the data of all the items
+        (see `Cacheable.__get_batch_cache_data__`). Otherwise, the type and data of each item is stored.
+
+        Returns:
+            dict[str, Any] -> The data to be cached.
+        """
+        items = cast(list[Cacheable], self)
+        if len(items) > 0:
+            item_type: type[Cacheable] = type(items[0])
+            if all(type(item) is item_type for item in items):
+                return {
+                    "count": len(items),
+                    "type": item_type,
+                    "batch": item_type.__get_batch_cache_data__(items),
+                }
         return {
-            "count": len(self),
-            "types": [type(item) for item in self],
-            "data": [item.__get_cache_data__() for item in self],
+            "count": len(items),
+            "types": [type(item) for item in items],
+            "data": [item.__get_cache_data__() for item in items],
         }
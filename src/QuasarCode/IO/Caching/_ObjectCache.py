@@ -0,0 +1,181 @@
+from collections import OrderedDict
+import os
+from threading import Lock
+from typing import Any, Callable
+
+import numpy as np
+
+from ._Cacheable import Cacheable
+
+def _estimate_size(data: Any) -> int:
+    # Approximate memory used by cache data, dominated by the size of any arrays
+    if isinstance(data, np.ndarray):
+        return data.nbytes
+    if isinstance(data, dict):
+        return 64 + sum(_estimate_size(key) + _estimate_size(value) for key, value in data.items())
+    if isinstance(data, (list, tuple, set, frozenset)):
+        return 64 + sum(_estimate_size(value) for value in data)
+    if isinstance(data, (str, bytes)):
+        return 48 + len(data)
+    if isinstance(data, Cacheable):
+        return _estimate_size(data.__get_cache_data__())
+    return 32
+
+class ObjectCache(object):
+    """
+    Thread-safe in-memory cache of data loaded from cache files, so that repeated loads of the same file within a
+    process do not read it again.
+
+    Entries are keyed by the absolute path of the file and are only used while the file's modification time, size
+    and inode are unchanged. When the estimated size of the cached data (mostly the size of its arrays) exceeds the
+    maximum, the least recently used entries are discarded.
+
+    Loaded data is shared between all loads of a file, so the arrays and containers it holds should not be modified
+    in-place (assigning new values to the attributes of loaded objects is safe).
+
+    Pass to `CacheTarget` or `CacheTargetFactory` as `object_cache`.
+
+    Parameters:
+        int maximum_size:
+            The maximum estimated size of the cached data in bytes. Data larger than this is never cached.
+    """
+
+    def __init__(self, maximum_size: int = 2**30) -> None:
+        self.__maximum_size: int = maximum_size
+        self.__entries: OrderedDict[str, tuple[tuple[int, int, int], dict[str, Any], int]] = OrderedDict()
+        self.__size: int = 0
+        self.__hits: int = 0
+        self.__misses: int = 0
+        self.__evictions: int = 0
+        self.__lock: Lock = Lock()
+
+    @property
+    def maximum_size(self) -> int:
+        """
+        int -> The maximum estimated size of the cached data in bytes.
+        """
+        return self.__maximum_size
+    @maximum_size.setter
+    def maximum_size(self, value: int) -> None:
+        with self.__lock:
+            self.__maximum_size = value
+            self.__evict()
+
+    @property
+    def size(self) -> int:
+        """
+        int -> The estimated size of the cached data in bytes.
+        """
+        return self.__size
+
+    @property
+    def hits(self) -> int:
+        """
+        int -> The number of loads that used cached data.
+        """
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """
+        int -> The number of loads that read the file.
+        """
+        return self.__misses
+
+    @property
+    def evictions(self) -> int:
+        """
+        int -> The number of entries discarded to limit the size of the cache.
+        """
+        return self.__evictions
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        float -> The fraction of loads that used cached data.
+        """
+        total = self.__hits + self.__misses
+        return self.__hits / total if total > 0 else 0.0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, filepath: str) -> bool:
+        return os.path.abspath(filepath) in self.__entries
+
+    def load(self, filepath: str, loader: Callable[[], dict[str, Any]], stamp: tuple[int, int, int]|None = None) -> dict[str, Any]:
+        """
+        Get the data of a file, loading it if it is not cached or the file has changed.
+
+        Parameters:
+            str filepath:
+                The file to load.
+            Callable[[], dict[str, Any]] loader:
+                Function that loads the data from the file.
+            tuple[int, int, int]|None stamp:
+                Identifies the current version of the data (e.g. for entries in a container file).
+                Defaults to the file's modification time, size and inode.
+
+        Returns:
+            dict[str, Any] -> The data.
+        """
+        key = os.path.abspath(filepath)
+        if stamp is None:
+            try:
+                status = os.stat(key)
+            except FileNotFoundError:
+                self.invalidate(key)
+                raise
+            stamp = (status.st_mtime_ns, status.st_size, status.st_ino)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self.__entries.move_to_end(key)
+                self.__hits += 1
+                return entry[1]
+            self.__misses += 1
+        # Load without holding the lock so that other files can be loaded concurrently
+        data = loader()
+        size = _estimate_size(data)
+        with self.__lock:
+            previous_entry = self.__entries.pop(key, None)
+            if previous_entry is not None:
+                self.__size -= previous_entry[2]
+            if size <= self.__maximum_size:
+                self.__entries[key] = (stamp, data, size)
+                self.__size += size
+                self.__evict()
+        return data
+
+    def invalidate(self, filepath: str|None = None) -> None:
+        """
+        Discard the cached data of a file.
+
+        Parameters:
+            str|None filepath:
+                The file. If None, all data is discarded.
+        """
+        with self.__lock:
+            if filepath is None:
+                self.__entries.clear()
+                self.__size = 0
+                return
+            entry = self.__entries.pop(os.path.abspath(filepath), None)
+            if entry is not None:
+                self.__size -= entry[2]
+
+    def reset_statistics(self) -> None:
+        """
+        Set the number of hits, misses and evictions to zero.
+        """
+        with self.__lock:
+            self.__hits = 0
+            self.__misses = 0
+            self.__evictions = 0
+
+    def __evict(self) -> None:
+        # Must be called while holding the lock
+        while self.__size > self.__maximum_size and len(self.__entries) > 0:
+            _, (_, _, size) = self.__entries.popitem(last = False)
+            self.__size -= size
+            self.__evictions += 1
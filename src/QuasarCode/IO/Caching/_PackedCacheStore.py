@@ -0,0 +1,168 @@
+import json
+import os
+import sqlite3
+from threading import Lock
+from typing import Any, ClassVar
+
+class PackedCacheStore(object):
+    """
+    A single container file (an SQLite database) holding the data of many cache targets, keyed by their relative
+    file paths. This avoids creating large numbers of small files, which is slow on parallel filesystems.
+
+    Each entry is stored as a BLOB with an index on its key, so entries can be read without scanning the file.
+    Space left by replaced or deleted entries is reused, and can be returned to the filesystem using `compact`.
+
+    Use `PackedCacheStore.open` to get the store for a file (stores are shared by all targets using the same file),
+    or pass `packed_store` to `CacheTarget` or `CacheTargetFactory` to store targets' data in a container file.
+
+    Parameters:
+        str filepath:
+            The path of the container file. It is created if it doesn't exist.
+    """
+
+    __open_stores: ClassVar[dict[str, "PackedCacheStore"]] = {}
+    __open_stores_lock: ClassVar[Lock] = Lock()
+
+    def __init__(self, filepath: str) -> None:
+        self.__filepath: str = os.path.abspath(filepath)
+        os.makedirs(os.path.dirname(self.__filepath), exist_ok = True)
+        self.__lock: Lock = Lock()
+        self.__connection: sqlite3.Connection = sqlite3.connect(self.__filepath, check_same_thread = False, isolation_level = None)
+        self.__connection.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, version INTEGER NOT NULL, fingerprint TEXT, data BLOB NOT NULL)")
+        # Counter shared by all entries, so that an entry that is deleted and written again never reuses a version
+        self.__connection.execute("CREATE TABLE IF NOT EXISTS sequence (value INTEGER NOT NULL)")
+        self.__connection.execute("INSERT INTO sequence (value) SELECT COALESCE(MAX(version), 0) FROM entries WHERE NOT EXISTS (SELECT 1 FROM sequence)")
+
+    @staticmethod
+    def open(filepath: str) -> "PackedCacheStore":
+        """
+        Get the store for a container file, opening it if it is not already open.
+
+        Parameters:
+            str filepath:
+                The path of the container file.
+
+        Returns:
+            PackedCacheStore -> The store.
+        """
+        key = os.path.abspath(filepath)
+        with PackedCacheStore.__open_stores_lock:
+            store = PackedCacheStore.__open_stores.get(key)
+            if store is None:
+                store = PackedCacheStore.__open_stores[key] = PackedCacheStore(key)
+            return store
+
+    @property
+    def filepath(self) -> str:
+        """
+        str -> The absolute path of the container file.
+        """
+        return self.__filepath
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return self.__connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        return self.get_version(key) is not None
+
+    def keys(self) -> list[str]:
+        """
+        Get the keys of all the entries.
+
+        Returns:
+            list[str] -> The keys, in sorted order.
+        """
+        with self.__lock:
+            return [row[0] for row in self.__connection.execute("SELECT key FROM entries ORDER BY key")]
+
+    def get_version(self, key: str) -> int|None:
+        """
+        Get the version of an entry (None if it doesn't exist).
+        Each write to the store gives the entry written a new version, greater than any previously used in the store.
+        """
+        with self.__lock:
+            row = self.__connection.execute("SELECT version FROM entries WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def read(self, key: str) -> bytes:
+        """
+        Read the data of an entry.
+
+        Parameters:
+            str key:
+                The key of the entry.
+
+        Returns:
+            bytes -> The data.
+        """
+        with self.__lock:
+            row = self.__connection.execute("SELECT data FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Unable to locate entry \"{key}\" in cache store \"{self.__filepath}\".")
+        return row[0]
+
+    def read_fingerprint(self, key: str) -> dict[str, Any]|None:
+        """
+        Read the dependency fingerprint of an entry, without reading its data.
+
+        Returns:
+            dict[str, Any]|None -> The fingerprint, or None if the entry was saved without one.
+        """
+        with self.__lock:
+            row = self.__connection.execute("SELECT fingerprint FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Unable to locate entry \"{key}\" in cache store \"{self.__filepath}\".")
+        return json.loads(row[0]) if row[0] is not None else None
+
+    def write(self, key: str, data: bytes, fingerprint: dict[str, Any]|None = None) -> None:
+        """
+        Add or replace an entry. The change is written to disk atomically.
+
+        Parameters:
+            str key:
+                The key of the entry.
+            bytes data:
+                The data.
+            dict[str, Any]|None fingerprint:
+                The dependency fingerprint of the data.
+        """
+        encoded_fingerprint = json.dumps(fingerprint, separators = (",", ":"), sort_keys = True) if fingerprint is not None else None
+        with self.__lock:
+            # Lock the file for writing before reading the counter, so that other processes can't use the same version
+            self.__connection.execute("BEGIN IMMEDIATE")
+            try:
+                self.__connection.execute("UPDATE sequence SET value = value + 1")
+                version = self.__connection.execute("SELECT value FROM sequence").fetchone()[0]
+                self.__connection.execute(
+                    "INSERT INTO entries (key, version, fingerprint, data) VALUES (?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET version = excluded.version, fingerprint = excluded.fingerprint, data = excluded.data",
+                    (key, version, encoded_fingerprint, sqlite3.Binary(data))
+                )
+            except BaseException:
+                self.__connection.execute("ROLLBACK")
+                raise
+            self.__connection.execute("COMMIT")
+
+    def delete(self, key: str) -> None:
+        """
+        Remove an entry (if it exists).
+        """
+        with self.__lock:
+            self.__connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def compact(self) -> None:
+        """
+        Rewrite the container file to release the space left by replaced and deleted entries.
+        """
+        with self.__lock:
+            self.__connection.execute("VACUUM")
+
+    def close(self) -> None:
+        """
+        Close the container file. Subsequent calls to `open` will reopen it.
+        """
+        with PackedCacheStore.__open_stores_lock:
+            if PackedCacheStore.__open_stores.get(self.__filepath) is self:
+                del PackedCacheStore.__open_stores[self.__filepath]
+        with self.__lock:
+            self.__connection.close()
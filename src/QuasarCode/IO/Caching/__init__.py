@@ -1,3 +1,9 @@
 from ._Cacheable import Cacheable
-from ._CacheTarget import CacheTarget
+from ._CacheDependencies import CacheDependencies
+from ._CacheTarget import CacheTarget, BulkCacheError
 from ._CacheTargetFactory import CacheTargetFactory
+from ._ObjectCache import ObjectCache
+from ._PackedCacheStore import PackedCacheStore
+from ._cached import cached
+from ._hashing import hash_cache_data
+from ._serialisers import CacheSerialiser, ColumnarSerialiser, register_serialiser
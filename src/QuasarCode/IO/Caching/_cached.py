@@ -0,0 +1,144 @@
+import functools
+import inspect
+from typing import Any, Callable, ParamSpec, TypeVar
+
+from ._Cacheable import Cacheable
+from ._CacheDependencies import CacheDependencies
+from ._CacheTarget import CacheTarget
+from ._CacheTargetFactory import CacheTargetFactory
+from ._hashing import hash_cache_data
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+def _format_label(value: Any) -> str:
+    # Simple values are used directly in file paths, anything else (e.g. arrays) by a digest of its data
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return str(value)
+    return hash_cache_data(value, digest_size = 8)
+
+def cached(
+    factory: CacheTargetFactory,
+    key: Callable[..., dict[str, Any]]|None = None,
+    root_directory: str = ".",
+    dependencies: CacheDependencies|Callable[..., CacheDependencies|None]|None = None,
+    mpi: bool = False
+) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """
+    Decorator that caches the result of a function using cache targets created by a factory.
+
+    The result is loaded if a cache file exists for the arguments and is up to date, otherwise the function is called
+    and its result saved. Results may be Cacheable objects or any other (pickle-able) values.
+
+    The labels of the factory's template are taken from the arguments with the same names (values other than strings
+    and numbers, such as arrays, are represented by a digest of their data). A label named "hash" is set to a digest of
+    all the arguments. A fingerprint of all the arguments and the function's name is saved with the result, so results
+    are recalculated if any arguments differ from those the file was created with.
+
+    The decorated function has a `get_target` method that returns the cache target for a set of arguments.
+
+    Parameters:
+        CacheTargetFactory factory:
+            Factory used to create the cache target for each call.
+        Callable[..., dict[str, Any]]|None key:
+            Function taking the same arguments as the decorated function and returning the values of some or all labels.
+        str root_directory:
+            The root directory of the cache files.
+        CacheDependencies|Callable[..., CacheDependencies|None]|None dependencies:
+            Additional dependencies of the result (e.g. input files), or a function taking the same arguments as
+            the decorated function that returns them.
+        bool mpi:
+            Share results between MPI ranks (see `QuasarCode.MPI.MPI_Config`). The root rank decides whether the result
+            is up to date. If not, the function is called on every rank (so it may itself use MPI) and only the root
+            saves the result (if this fails, the error is raised on every rank). Otherwise, every rank loads it.
+
+    Examples:
+        ```
+        @cached(CacheTargetFactory("histograms/{name}_{hash}.qcc", "name", "hash"))
+        def make_histogram(name: str, values: np.ndarray, bins: int) -> np.ndarray:
+            ...
+        ```
+    """
+    def decorator(function: Callable[P, R]) -> Callable[P, R]:
+        signature = inspect.signature(function)
+        function_name = f"{function.__module__}.{function.__qualname__}"
+
+        def get_arguments(*args: Any, **kwargs: Any) -> dict[str, Any]:
+            bound_arguments = signature.bind(*args, **kwargs)
+            bound_arguments.apply_defaults()
+            return dict(bound_arguments.arguments)
+
+        def get_target(*args: P.args, **kwargs: P.kwargs) -> CacheTarget:
+            """
+            Get the cache target used for a set of arguments.
+            """
+            arguments = get_arguments(*args, **kwargs)
+            labels = key(*args, **kwargs) if key is not None else {}
+            for label_name in factory.label_names:
+                if label_name in labels:
+                    continue
+                if label_name in arguments:
+                    labels[label_name] = arguments[label_name]
+                elif label_name == "hash":
+                    labels[label_name] = hash_cache_data(arguments, digest_size = 8)
+                else:
+                    raise KeyError(f"Unable to determine a value for label \"{label_name}\" of the cache file template. It does not match the name of an argument of {function_name}.")
+            return factory.new(**{ label_name : _format_label(labels[label_name]) for label_name in factory.label_names })
+
+        def get_dependencies(*args: Any, **kwargs: Any) -> CacheDependencies:
+            extra_dependencies = dependencies(*args, **kwargs) if callable(dependencies) else dependencies
+            # Copy the dependencies given, as they may be shared with other calls
+            result = CacheDependencies() if extra_dependencies is None else extra_dependencies.copy()
+            return result.add_parameters(**{ "__cached_function_arguments__" : hash_cache_data(get_arguments(*args, **kwargs)) }).add_code_version("__cached_function__", function_name)
+
+        def load(target: CacheTarget) -> Any:
+            data = target.load_data(root_directory)
+            if "cacheable_type" in data:
+                return data["cacheable_type"].__from_cache_data__(data["data"])
+            return data["result"]
+
+        def save(target: CacheTarget, result: Any, result_dependencies: CacheDependencies) -> None:
+            if isinstance(result, Cacheable):
+                data = { "cacheable_type" : type(result), "data" : result.__get_cache_data__() }
+            else:
+                data = { "result" : result }
+            target.save_data(root_directory, data, result_dependencies)
+
+        @functools.wraps(function)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            target = get_target(*args, **kwargs)
+            result_dependencies = get_dependencies(*args, **kwargs)
+            if not mpi:
+                if target.check_exists(root_directory, dependencies = result_dependencies):
+                    return load(target)
+                result = function(*args, **kwargs)
+                save(target, result, result_dependencies)
+                return result
+
+            from ...MPI import MPI_Config
+            comm = MPI_Config.comm
+            is_fresh = MPI_Config.is_root and target.check_exists(root_directory, dependencies = result_dependencies)
+            if comm is not None:
+                is_fresh = comm.bcast(is_fresh, root = MPI_Config.root)
+            if is_fresh:
+                return load(target)
+            result = function(*args, **kwargs)
+            save_error: Exception|None = None
+            if MPI_Config.is_root:
+                try:
+                    save(target, result, result_dependencies)
+                except Exception as error:
+                    save_error = error
+            # Every rank waits for the result to be saved, and raises an error if it could not be
+            save_error_message = repr(save_error) if save_error is not None else None
+            if comm is not None:
+                save_error_message = comm.bcast(save_error_message, root = MPI_Config.root)
+            if save_error is not None:
+                raise save_error
+            if save_error_message is not None:
+                raise RuntimeError(f"Failed to save the result of {function_name} on the root rank: {save_error_message}")
+            return result
+
+        wrapper.get_target = get_target # type: ignore[attr-defined]
+        return wrapper
+    return decorator
@@ -0,0 +1,73 @@
+import gzip
+import io
+from typing import BinaryIO, Literal
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+CompressionType = Literal["zstd", "lz4", "gzip"]
+
+_MAGIC: dict[CompressionType, bytes] = {
+    "zstd" : b"\x28\xb5\x2f\xfd",
+    "lz4"  : b"\x04\x22\x4d\x18",
+    "gzip" : b"\x1f\x8b",
+}
+
+def get_available_compression() -> CompressionType:
+    """
+    Get the fastest compression available (zstd, then lz4, then gzip).
+    """
+    if zstandard is not None:
+        return "zstd"
+    if lz4_frame is not None:
+        return "lz4"
+    return "gzip"
+
+def check_compression_available(compression: CompressionType) -> None:
+    """
+    Raise an error if the package required for a type of compression is not installed.
+    """
+    if compression == "zstd" and zstandard is None:
+        raise ModuleNotFoundError("zstd compression requires the \"zstandard\" package.")
+    if compression == "lz4" and lz4_frame is None:
+        raise ModuleNotFoundError("lz4 compression requires the \"lz4\" package.")
+    if compression not in _MAGIC:
+        raise ValueError(f"Unsupported compression \"{compression}\". Valid options are: {', '.join(_MAGIC)}.")
+
+def get_compression(initial_bytes: bytes) -> CompressionType|None:
+    """
+    Get the compression used by a file from the bytes at its start (None if uncompressed).
+    """
+    for compression, magic in _MAGIC.items():
+        if initial_bytes.startswith(magic):
+            return compression
+    return None
+
+def open_compressed_writer(file: BinaryIO, compression: CompressionType, level: int|None) -> BinaryIO:
+    """
+    Create a stream that compresses data written to it into an open file.
+    Closing the stream finishes the compressed data but leaves the file open.
+    """
+    check_compression_available(compression)
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level = level if level is not None else 3).stream_writer(file, closefd = False) # type: ignore[union-attr]
+    if compression == "lz4":
+        return lz4_frame.LZ4FrameFile(file, mode = "wb", compression_level = level if level is not None else 0) # type: ignore[union-attr]
+    return gzip.GzipFile(fileobj = file, mode = "wb", compresslevel = level if level is not None else 6, mtime = 0) # type: ignore[return-value]
+
+def open_decompressed_reader(file: BinaryIO, compression: CompressionType) -> BinaryIO:
+    """
+    Create a stream that reads decompressed data from an open file.
+    """
+    check_compression_available(compression)
+    if compression == "zstd":
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(file, closefd = False)) # type: ignore[union-attr, arg-type]
+    if compression == "lz4":
+        return lz4_frame.LZ4FrameFile(file, mode = "rb") # type: ignore[union-attr]
+    return gzip.GzipFile(fileobj = file, mode = "rb") # type: ignore[return-value]
@@ -0,0 +1,78 @@
+import hashlib
+import pickle
+import sys
+from typing import Any
+
+import numpy as np
+
+from ._Cacheable import Cacheable
+
+def hash_cache_data(*data: Any, digest_size: int = 32) -> str:
+    """
+    Calculate a hash of cache data (such as that returned by `Cacheable.__get_cache_data__`).
+
+    Dictionaries, lists and tuples are hashed recursively (dictionaries in insertion order), Cacheable objects are
+    hashed using their cache data and numpy arrays are hashed using their dtype, shape and raw data.
+    Matplotlib colour maps are hashed using their name, size and colours (their pickled representation changes
+    once they have been used). Any other objects are hashed using their pickled representation.
+
+    Parameters:
+        (args) tuple[Any, ...] data:
+            The data to hash. Multiple values are hashed in order.
+        int digest_size:
+            The size of the digest in bytes (at most 64).
+
+    Returns:
+        str -> The hexadecimal BLAKE2b digest.
+    """
+    hasher = hashlib.blake2b(digest_size = digest_size)
+    for item in data:
+        _update_hash(hasher, item)
+    return hasher.hexdigest()
+
+def _update_hash(hasher: "hashlib._Hash", data: Any) -> None:
+    if data is None:
+        hasher.update(b"N")
+    elif isinstance(data, Cacheable):
+        hasher.update(b"C")
+        _update_hash(hasher, type(data))
+        _update_hash(hasher, data.__get_cache_data__())
+    elif isinstance(data, np.ndarray) and not data.dtype.hasobject:
+        hasher.update(f"A{data.dtype.str}{data.shape}".encode())
+        hasher.update(np.ascontiguousarray(data).data)
+    elif isinstance(data, dict):
+        hasher.update(f"D{len(data)}".encode())
+        for key, value in data.items():
+            _update_hash(hasher, key)
+            _update_hash(hasher, value)
+    elif isinstance(data, (list, tuple)):
+        hasher.update(f"{'L' if isinstance(data, list) else 'T'}{len(data)}".encode())
+        for value in data:
+            _update_hash(hasher, value)
+    elif isinstance(data, str):
+        encoded = data.encode()
+        hasher.update(f"S{len(encoded)}:".encode())
+        hasher.update(encoded)
+    elif isinstance(data, bytes):
+        hasher.update(f"B{len(data)}:".encode())
+        hasher.update(data)
+    elif isinstance(data, (bool, int, float, complex, np.generic)):
+        hasher.update(f"V{type(data).__name__}:{data!r};".encode())
+    elif isinstance(data, type):
+        hasher.update(f"Y{data.__module__}.{data.__qualname__};".encode())
+    elif _is_colourmap(data):
+        hasher.update(b"M")
+        _update_hash(hasher, type(data))
+        _update_hash(hasher, (data.name, data.N, data.colorbar_extend))
+        # Sampling the colour map builds its lookup table, so this doesn't depend on whether it has been used
+        _update_hash(hasher, np.asarray(data(np.arange(data.N)), dtype = np.float64))
+        _update_hash(hasher, tuple(np.asarray(colour, dtype = np.float64) for colour in (data.get_bad(), data.get_under(), data.get_over())))
+    else:
+        pickled = pickle.dumps(data, protocol = pickle.HIGHEST_PROTOCOL)
+        hasher.update(f"P{len(pickled)}:".encode())
+        hasher.update(pickled)
+
+def _is_colourmap(data: Any) -> bool:
+    # Colour maps can only exist if matplotlib has been imported, so avoid importing it here
+    colors_module = sys.modules.get("matplotlib.colors")
+    return colors_module is not None and isinstance(data, colors_module.Colormap)
@@ -0,0 +1,277 @@
+import base64
+import importlib
+import json
+import math
+import os
+import pickle
+import struct
+from typing import Any, BinaryIO, Literal
+
+import numpy as np
+
+from ._Cacheable import Cacheable
+
+class CacheSerialiser(object):
+    """
+    Base class for formats used to store cache data as an alternative to pickle.
+
+    Each format is identified by a magic byte string at the start of its files, so files can be loaded
+    regardless of the format selected for saving. Register formats using `register_serialiser`.
+    """
+
+    magic: bytes = b""
+
+    def save(self, file: BinaryIO, data: dict[str, Any]) -> None:
+        """
+        Write cache data to an open (binary) file.
+
+        Parameters:
+            BinaryIO file:
+                The file to write to.
+            dict[str, Any] data:
+                The data to save.
+        """
+        raise NotImplementedError()
+
+    def load(self, file: str|BinaryIO, mmap_mode: Literal["r", "c", "r+"]|None, offset: int = 0) -> dict[str, Any]:
+        """
+        Read cache data from a file.
+
+        Parameters:
+            str|BinaryIO file:
+                The path of the file to read, or an open (binary) file positioned at the start of the data.
+                Memory-mapping is only possible when a path is given.
+            str|None mmap_mode:
+                The mode used to memory-map arrays (see `np.load`), or None to read the file into memory.
+            int offset:
+                The position of the data in the file (if a path is given).
+
+        Returns:
+            dict[str, Any] -> The data.
+        """
+        raise NotImplementedError()
+
+class ColumnarSerialiser(CacheSerialiser):
+    """
+    Binary format storing the structure of cache data in a compact JSON header, with each numpy array in a
+    separate aligned section of the file so that it can be read without copying (or memory-mapped).
+
+    Scalars, strings, lists, tuples, dictionaries, types and Cacheable objects are stored in the header.
+    Bytes and any other objects (pickled) are stored in binary sections. Types are stored by name, so unlike
+    pickle the file only refers to classes when they are loaded.
+
+    Layout:
+        8 byte magic, 8 byte little-endian header length, UTF-8 JSON header (a line containing the tables of types
+        and sections, then a line containing the data), padding, then the binary sections (each starting at a
+        multiple of 64 bytes from the start of the file, as a dependency header written before the data by
+        `CacheTarget` is padded to a multiple of 64 bytes).
+
+    Registered for files with the extension ".qcc".
+    """
+
+    magic: bytes = b"QCCOLv1\0"
+    ALIGNMENT: int = 64
+
+    def save(self, file: BinaryIO, data: dict[str, Any]) -> None:
+        sections: list[memoryview|bytes] = []
+        section_offsets: list[int] = []
+        types: list[list[str]] = []
+        type_indices: dict[type, int] = {}
+        # Arrays referenced more than once are stored once (as by pickle)
+        encoded_arrays: dict[int, tuple[np.ndarray, dict[str, Any]]] = {}
+        data_size = 0
+
+        def add_section(buffer: memoryview|bytes) -> int:
+            nonlocal data_size
+            section_offsets.append(data_size)
+            sections.append(buffer)
+            data_size += -(-len(buffer) // self.ALIGNMENT) * self.ALIGNMENT
+            return len(sections) - 1
+
+        def encode_type(value: type) -> dict[str, Any]:
+            index = type_indices.get(value)
+            if index is None:
+                index = type_indices[value] = len(types)
+                types.append([value.__module__, value.__qualname__])
+            return { "@" : "type", "i" : index }
+
+        def encode(value: Any) -> Any:
+            value_type = type(value)
+            if value is None or value_type is str or value_type is bool or value_type is int:
+                return value
+            if value_type is float:
+                return value if math.isfinite(value) else { "@" : "float", "v" : repr(value) }
+            if value_type is dict:
+                if all(type(key) is str for key in value) and "@" not in value:
+                    return { key : encode(item) for key, item in value.items() }
+                return { "@" : "dict", "v" : [[encode(key), encode(item)] for key, item in value.items()] }
+            if value_type is list:
+                return [encode(item) for item in value]
+            if value_type is tuple:
+                return { "@" : "tuple", "v" : [encode(item) for item in value] }
+            if (value_type is np.ndarray or value_type is np.memmap) and not value.dtype.hasobject:
+                if id(value) in encoded_arrays:
+                    return encoded_arrays[id(value)][1]
+                array = np.ascontiguousarray(value)
+                encoded = { "@" : "array", "dtype" : np.lib.format.dtype_to_descr(array.dtype), "shape" : list(array.shape), "s" : add_section(array.reshape(-1).view(np.uint8).data if array.size > 0 else b"") }
+                encoded_arrays[id(value)] = (value, encoded)
+                return encoded
+            if isinstance(value, np.generic) and not isinstance(value, np.object_):
+                return { "@" : "scalar", "dtype" : np.lib.format.dtype_to_descr(value.dtype), "v" : base64.b64encode(value.tobytes()).decode("ascii") }
+            if value_type is bytes:
+                return { "@" : "bytes", "s" : add_section(value) }
+            if value_type is complex:
+                return { "@" : "complex", "v" : [encode(value.real), encode(value.imag)] }
+            if isinstance(value, type):
+                return encode_type(value)
+            if isinstance(value, Cacheable):
+                return { "@" : "cacheable", "type" : encode_type(value_type), "v" : encode(value.__get_cache_data__()) }
+            # Fall back to pickle for anything else
+            return { "@" : "pickle", "s" : add_section(pickle.dumps(value, protocol = pickle.HIGHEST_PROTOCOL)) }
+
+        root = encode(data)
+        tables = { "types" : types, "sections" : [[offset, len(section)] for offset, section in zip(section_offsets, sections)] }
+        header = (json.dumps(tables, separators = (",", ":")) + "\n" + json.dumps(root, separators = (",", ":"), allow_nan = False)).encode("utf-8")
+        data_start = -(-(len(self.magic) + 8 + len(header)) // self.ALIGNMENT) * self.ALIGNMENT
+        file.write(self.magic)
+        file.write(struct.pack("<Q", len(header)))
+        file.write(header)
+        file.write(b"\0" * (data_start - len(self.magic) - 8 - len(header)))
+        position = 0
+        for offset, section in zip(section_offsets, sections):
+            if offset > position:
+                file.write(b"\0" * (offset - position))
+            file.write(section)
+            position = offset + len(section)
+
+    def load(self, file: str|BinaryIO, mmap_mode: Literal["r", "c", "r+"]|None, offset: int = 0) -> dict[str, Any]:
+        if isinstance(file, str):
+            with open(file, "rb") as opened_file:
+                opened_file.seek(offset)
+                return self.__load(opened_file, file, mmap_mode, offset)
+        return self.__load(file, None, None, 0)
+
+    def __load(self, file: BinaryIO, filepath: str|None, mmap_mode: Literal["r", "c", "r+"]|None, offset: int) -> dict[str, Any]:
+        if file.read(len(self.magic)) != self.magic:
+            raise ValueError(f"File \"{filepath if filepath is not None else file}\" is not in the columnar cache format.")
+        header_length: int = struct.unpack("<Q", file.read(8))[0]
+        tables_json, root_json = file.read(header_length).split(b"\n", 1)
+        tables = json.loads(tables_json)
+        data_start = -(-(len(self.magic) + 8 + header_length) // self.ALIGNMENT) * self.ALIGNMENT
+        buffer: np.ndarray
+        if sum(length for _, length in tables["sections"]) == 0:
+            buffer = np.empty(0, dtype = np.uint8)
+        elif filepath is None:
+            # Stream (e.g. decompressed data)
+            file.read(data_start - len(self.magic) - 8 - header_length)
+            buffer = np.frombuffer(bytearray(file.read()), dtype = np.uint8)
+        elif mmap_mode is not None:
+            # Arrays are plain views of the mapped memory (creating memmap instances is slow for many small arrays)
+            buffer = np.memmap(filepath, dtype = np.uint8, mode = mmap_mode, offset = offset + data_start).view(np.ndarray)
+        else:
+            file.seek(offset + data_start)
+            buffer = np.empty(os.fstat(file.fileno()).st_size - offset - data_start, dtype = np.uint8)
+            file.readinto(buffer.data) # type: ignore[attr-defined]
+
+        types: list[type|None] = [None] * len(tables["types"])
+        sections: list[list[int]] = tables["sections"]
+
+        def get_type(index: int) -> type:
+            value = types[index]
+            if value is None:
+                module_name, qualified_name = tables["types"][index]
+                value = importlib.import_module(module_name)
+                for name in qualified_name.split("."):
+                    value = getattr(value, name)
+                types[index] = value
+            return value # type: ignore[return-value]
+
+        def get_section(index: int) -> np.ndarray:
+            offset, length = sections[index]
+            return buffer[offset : offset + length]
+
+        dtypes: dict[str, np.dtype] = {}
+
+        def get_dtype(descr: str|list) -> np.dtype:
+            if type(descr) is not str:
+                return np.lib.format.descr_to_dtype([tuple(field) for field in descr])
+            dtype = dtypes.get(descr)
+            if dtype is None:
+                dtype = dtypes[descr] = np.lib.format.descr_to_dtype(descr)
+            return dtype
+
+        def decode(value: Any) -> Any:
+            # Called by json for each object, from the innermost outwards, so any contents have already been decoded
+            tag = value.get("@")
+            if tag is None:
+                return value
+            if tag == "array":
+                dtype = get_dtype(value["dtype"])
+                shape = tuple(value["shape"])
+                section = get_section(value["s"])
+                if len(section) == 0:
+                    return np.empty(shape, dtype = dtype)
+                return section.view(dtype).reshape(shape)
+            if tag == "type":
+                return get_type(value["i"])
+            if tag == "tuple":
+                return tuple(value["v"])
+            if tag == "dict":
+                return { key : item for key, item in value["v"] }
+            if tag == "float":
+                return float(value["v"])
+            if tag == "complex":
+                return complex(*value["v"])
+            if tag == "scalar":
+                return np.frombuffer(base64.b64decode(value["v"]), dtype = get_dtype(value["dtype"]))[0]
+            if tag == "bytes":
+                return get_section(value["s"]).tobytes()
+            if tag == "cacheable":
+                return value["type"].__from_cache_data__(value["v"])
+            if tag == "pickle":
+                return pickle.loads(get_section(value["s"]).tobytes())
+            raise ValueError(f"Unsupported value type \"{tag}\" in cache file \"{filepath if filepath is not None else file}\".")
+
+        return json.loads(root_json, object_hook = decode)
+
+_serialisers: dict[str, CacheSerialiser] = {}
+
+def register_serialiser(extension: str, serialiser: CacheSerialiser|None) -> None:
+    """
+    Set the format used to save cache files with a given extension. Files with other extensions are pickled.
+
+    Parameters:
+        str extension:
+            The file extension (including the "."), e.g. ".qcc".
+        CacheSerialiser|None serialiser:
+            The format to use, or None to use pickle.
+    """
+    if serialiser is None:
+        _serialisers.pop(extension.lower(), None)
+    else:
+        _serialisers[extension.lower()] = serialiser
+
+def get_serialiser_for_file(filepath: str) -> CacheSerialiser|None:
+    """
+    Get the format registered for the extension of a file (None for pickle).
+    """
+    return _serialisers.get(os.path.splitext(filepath)[1].lower())
+
+def get_serialiser_for_data(initial_bytes: bytes, serialiser: CacheSerialiser|None = None) -> CacheSerialiser|None:
+    """
+    Get the format matching the magic bytes at the start of a file (None for pickle).
+
+    Parameters:
+        bytes initial_bytes:
+            The start of the file.
+        CacheSerialiser|None serialiser:
+            A format to check before the registered formats (e.g. one that is used without being registered).
+    """
+    if serialiser is not None and len(serialiser.magic) > 0 and initial_bytes.startswith(serialiser.magic):
+        return serialiser
+    for registered_serialiser in set(_serialisers.values()):
+        if len(registered_serialiser.magic) > 0 and initial_bytes.startswith(registered_serialiser.magic):
+            return registered_serialiser
+    return None
+
+register_serialiser(".qcc", ColumnarSerialiser())
@@ -0,0 +1,150 @@
+from matplotlib import pyplot as plt
+from matplotlib.axes import Axes
+from matplotlib.colors import Colormap
+from matplotlib.image import AxesImage
+import numpy as np
+
+from ..Data._Rect import Rect
+from ._CachedPlotElements import CachedPlotImage
+from ._Hexbin import Hexbin, COLOUR_FUNCTION_TYPE
+
+class BinnedImage(object):
+    """
+    Bin data onto a rectangular grid and display it as a single image.
+
+    This is a faster alternative to `Hexbin` for plots that do not require hexagonal cells.
+    Colour functions are shared with `Hexbin` (see the `Hexbin.create_hexbin_*` methods).
+    Where a colour function provides a vectorised statistic, all bins are calculated at once using `np.bincount`.
+    """
+
+    def __init__(
+        self,
+        x_data: np.ndarray[tuple[int], np.dtype[np.floating]],
+        y_data: np.ndarray[tuple[int], np.dtype[np.floating]],
+        colour_function: COLOUR_FUNCTION_TYPE|None = None,
+        cache: CachedPlotImage|None = None
+    ) -> None:
+        super().__init__()
+        self.__x_data = x_data
+        self.__y_data = y_data
+        self.__colour_function = colour_function if colour_function is not None else Hexbin.create_hexbin_count()
+        self.__cache_object = cache if cache is not None else CachedPlotImage()
+
+    @property
+    def colour_function(self) -> COLOUR_FUNCTION_TYPE: # type: ignore[valid-type]
+        """
+        The function used to generate another function for calculating the colour of the image pixels.
+        """
+        return self.__colour_function
+
+    @property
+    def data(self) -> CachedPlotImage:
+        """
+        Get the cache object for this image.
+        """
+        return self.__cache_object
+
+    def calculate_image(
+        self,
+        extent: Rect,
+        gridsize: int|tuple[int, int],
+        default_bin_value: float = np.nan,
+        min_value: float|None = None,
+        max_value: float|None = None
+    ) -> np.ndarray[tuple[int, int], np.dtype[np.floating]]:
+        """
+        Calculate the value of each pixel.
+
+        Parameters:
+            Rect extent:
+                The region to bin.
+            int|tuple[int, int] gridsize:
+                The number of pixels in each direction, or a tuple of the number of pixels in the x and y directions.
+            float default_bin_value:
+                The value assigned to pixels containing no data (or where the statistic fails).
+            float min_value:
+                Values below this are clipped to this value.
+            float max_value:
+                Values above this are clipped to this value.
+
+        Returns:
+            np.ndarray[(ny, nx), float] -> The image, with the first row at the bottom of the extent.
+        """
+        nx, ny = (gridsize, gridsize) if not np.iterable(gridsize) else gridsize # type: ignore[misc]
+        x_min, x_max, y_min, y_max = extent.extent
+        ix = np.floor((self.__x_data - x_min) * (nx / (x_max - x_min))).astype(np.int64)
+        iy = np.floor((self.__y_data - y_min) * (ny / (y_max - y_min))).astype(np.int64)
+        # Include the upper edge in the last pixel (as np.histogram2d does)
+        ix[self.__x_data == x_max] = nx - 1
+        iy[self.__y_data == y_max] = ny - 1
+        indices = np.nonzero((ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny))[0]
+        bin_indices = iy[indices] * nx + ix[indices]
+        number_of_bins = nx * ny
+
+        vectorised_statistic = getattr(self.__colour_function, "vectorised_statistic", None)
+        if vectorised_statistic is not None:
+            occupied = np.bincount(bin_indices, minlength = number_of_bins) > 0
+            with np.errstate(divide = "ignore", invalid = "ignore"):
+                values = np.asarray(vectorised_statistic(indices, bin_indices, number_of_bins), dtype = float)
+            if min_value is not None or max_value is not None:
+                values = np.clip(values, min_value, max_value)
+            values[~occupied] = default_bin_value
+        else:
+            # Fall back to calling the colour function once per occupied bin
+            calculate_bin_colour = self.__colour_function(min_value, max_value, default_bin_value)
+            values = np.full(number_of_bins, default_bin_value, dtype = float)
+            order = np.argsort(bin_indices, kind = "stable")
+            occupied_bins, starts = np.unique(bin_indices[order], return_index = True)
+            for bin_index, bin_members in zip(occupied_bins, np.split(indices[order], starts[1:])):
+                values[bin_index] = calculate_bin_colour(bin_members)
+
+        return values.reshape((ny, nx))
+
+    def plot_image(
+        self,
+        default_bin_value: float = np.nan,
+        extent: Rect|None = None,
+        gridsize: int|tuple[int, int]|None = None,
+        colourmap: str|Colormap|None = None,
+        min_value: float|None = None,
+        max_value: float|None = None,
+        axis: Axes|None = None,
+        **imshow_kwargs
+    ) -> AxesImage:
+        """
+        Plot the binned data as an image using a pre-defined colour scheme.
+
+        imshow_kwargs will be passed to the `plt.imshow` function call (or that of the provided axis).
+
+        May raise ValueError if any of the arguments not provided are not set on the data object.
+        """
+
+        extent = extent if extent is not None else self.data.extent
+        gridsize = gridsize if gridsize is not None else (self.data.image.shape[1], self.data.image.shape[0])
+        colourmap = colourmap if colourmap is not None else self.data.colourmap
+        min_value = min_value if min_value is not None else self.data.min_colour_value
+        max_value = max_value if max_value is not None else self.data.max_colour_value
+
+        image_data = self.calculate_image(extent, gridsize, default_bin_value, min_value, max_value)
+
+        image = (axis if axis is not None else plt).imshow(
+            image_data,
+            extent = extent.extent,
+            origin = "lower",
+            cmap = colourmap,
+            vmin = min_value,
+            vmax = max_value,
+            **imshow_kwargs
+        )
+
+        self.__cache_object = CachedPlotImage(
+            image = image_data,
+            extent = extent,
+            origin = "lower",
+            colourmap = colourmap,
+            min_colour_value = min_value,
+            max_colour_value = max_value,
+            _result = image
+        )
+
+        return image
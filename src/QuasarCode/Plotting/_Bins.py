@@ -1,14 +1,38 @@
-from typing import Any
+from typing import Any, Literal, Sequence
 
 import numpy as np
 
 from ..IO.Caching import Cacheable
 
 class Bins(Cacheable):
-    def __init__(self, bin_edges: np.ndarray[tuple[int], np.dtype[np.floating]]) -> None:
+    """
+    A set of contiguous bins defined by their edges.
+
+    Parameters:
+        np.ndarray[(N+1,), float] bin_edges:
+            The bin edges, in increasing order.
+        str|None spacing:
+            How the edges are spaced ("linear", "logarithmic" or "irregular"). Detected from the edges if not specified.
+            Bins with linear or logarithmic spacing are assigned by direct calculation in `digitize`.
+    """
+
+    def __init__(self, bin_edges: np.ndarray[tuple[int], np.dtype[np.floating]], spacing: Literal["linear", "logarithmic", "irregular"]|None = None) -> None:
         self.__bin_edges: np.ndarray[tuple[int], np.dtype[np.floating]] = bin_edges
         self.__bin_centres: np.ndarray[tuple[int], np.dtype[np.floating]] = (self.__bin_edges[:-1] + self.__bin_edges[1:]) / 2
         self.__bin_widths: np.ndarray[tuple[int], np.dtype[np.floating]] = self.__bin_edges[1:] - self.__bin_edges[:-1]
+        self.__spacing: Literal["linear", "logarithmic", "irregular"] = spacing if spacing is not None else Bins.__detect_spacing(np.asarray(bin_edges))
+
+    @staticmethod
+    def __detect_spacing(edges: np.ndarray) -> Literal["linear", "logarithmic", "irregular"]:
+        if len(edges) < 2 or not np.all(np.isfinite(edges)):
+            return "irregular"
+        if len(edges) == 2 or np.allclose(np.diff(edges), (edges[-1] - edges[0]) / (len(edges) - 1), rtol = 1e-9, atol = 0):
+            return "linear"
+        if edges[0] > 0:
+            log_edges = np.log10(edges)
+            if np.allclose(np.diff(log_edges), (log_edges[-1] - log_edges[0]) / (len(edges) - 1), rtol = 1e-9, atol = 0):
+                return "logarithmic"
+        return "irregular"
 
     def __len__(self) -> int:
         return len(self.__bin_centres)
@@ -33,6 +57,16 @@ class Bins(Cacheable):
         """
         return self.__bin_centres
     
+    @property
+    def spacing(self) -> Literal["linear", "logarithmic", "irregular"]:
+        """
+        Get how the bin edges are spaced.
+
+        Returns:
+            str -> "linear", "logarithmic" or "irregular".
+        """
+        return self.__spacing
+
     @property
     def widths(self) -> np.ndarray[tuple[int], np.dtype[np.floating]]:
         """
@@ -52,7 +86,7 @@ class Bins(Cacheable):
             dict[str, Any] data:
                 The data to load the object from.
         """
-        return Bins(data["bin_edges"])
+        return Bins(data["bin_edges"], data.get("spacing", None))
 
     def __get_cache_data__(self) -> dict[str, Any]:
         """
@@ -61,7 +95,66 @@ class Bins(Cacheable):
         Returns:
             dict[str, Any] -> The data to be cached.
         """
-        return { "bin_edges": self.__bin_edges }
+        return { "bin_edges": self.__bin_edges, "spacing": self.__spacing }
+
+    __SPACING_NAMES: tuple[Literal["linear", "logarithmic", "irregular"], ...] = ("linear", "logarithmic", "irregular")
+
+    @classmethod
+    def __from_batch_cache_data__(cls, data: dict[str, Any]) -> list["Bins"]:
+        """
+        Load several sets of bins stored together.
+        The edges, centres and widths of each set are views of arrays shared by all the sets, so keeping any one
+        set keeps the arrays of all the sets in memory. Copy the sets that are needed (for example with
+        `Bins(bins.edges.copy(), bins.spacing)`) to release the rest.
+
+        Parameters:
+            dict[str, Any] data:
+                The data to load the objects from.
+
+        Returns:
+            list[Bins] -> The loaded bins.
+        """
+        if "offsets" not in data:
+            return super().__from_batch_cache_data__(data)
+        edges = data["bin_edges"]
+        offsets = np.asarray(data["offsets"]).tolist()
+        # Centres and widths are calculated for all the sets at once (the values spanning adjacent sets are unused)
+        centres = (edges[:-1] + edges[1:]) / 2
+        widths = edges[1:] - edges[:-1]
+        loaded_bins: list[Bins] = []
+        for index, spacing_code in enumerate(np.asarray(data["spacing_codes"]).tolist()):
+            start, end = offsets[index], offsets[index + 1]
+            bins = Bins.__new__(Bins)
+            bins.__bin_edges = edges[start:end]
+            bins.__bin_centres = centres[start:max(start, end - 1)]
+            bins.__bin_widths = widths[start:max(start, end - 1)]
+            bins.__spacing = Bins.__SPACING_NAMES[spacing_code]
+            loaded_bins.append(bins)
+        return loaded_bins
+
+    @classmethod
+    def __get_batch_cache_data__(cls, items: Sequence[Cacheable]) -> dict[str, Any]:
+        """
+        Get the data to be cached for several sets of bins.
+        The edges are stored as a single array along with the offset of each set's edges.
+
+        Parameters:
+            Sequence[Bins] items:
+                The bins.
+
+        Returns:
+            dict[str, Any] -> The data to be cached.
+        """
+        all_edges = [item.edges for item in items] # type: ignore[attr-defined]
+        if cls is not Bins or any(not isinstance(edges, np.ndarray) or edges.ndim != 1 or edges.dtype != all_edges[0].dtype for edges in all_edges):
+            return super().__get_batch_cache_data__(items)
+        offsets = np.zeros(len(all_edges) + 1, dtype = np.int64)
+        np.cumsum([len(edges) for edges in all_edges], out = offsets[1:])
+        return {
+            "bin_edges": np.concatenate(all_edges),
+            "offsets": offsets,
+            "spacing_codes": np.array([Bins.__SPACING_NAMES.index(item.spacing) for item in items], dtype = np.uint8), # type: ignore[attr-defined]
+        }
     
     @staticmethod
     def make_linear_bins(min: float, max: float, number: int, centred_limits: bool = False) -> "Bins":
@@ -78,7 +171,7 @@ class Bins(Cacheable):
             Bins -> The linear bins.
         """
         bin_edges: np.ndarray[tuple[int], np.dtype[np.floating]] = np.linspace(min, max, number + 1) if not centred_limits else np.linspace(min - ((max - min) / (2 * number)), max + ((max - min) / (2 * number)), number + 1)
-        return Bins(bin_edges)
+        return Bins(bin_edges, "linear")
 
     @staticmethod
     def make_logarithmic_bins(min: float, max: float, number: int, centred_limits: bool = False) -> "Bins":
@@ -95,4 +188,65 @@ class Bins(Cacheable):
             Bins -> The logarithmic bins.
         """
         bin_edges: np.ndarray[tuple[int], np.dtype[np.floating]] = np.logspace(np.log10(min), np.log10(max), number + 1) if not centred_limits else np.logspace(np.log10(min - ((max - min) / (2 * number))), np.log10(max + ((max - min) / (2 * number))), number + 1)
-        return Bins(bin_edges)
+        return Bins(bin_edges, "logarithmic")
+
+    def digitize(self, values: np.ndarray, out_of_range: Literal["mark", "clip"] = "mark", out: np.ndarray|None = None) -> np.ndarray:
+        """
+        Get the index of the bin containing each value.
+
+        As for `np.histogram`, each bin includes its lower edge and the last bin also includes its upper edge.
+        For linear and logarithmic bins, indices are calculated directly from the values (O(1) per value)
+        rather than by searching the edges, with the result checked against the edges so that it is identical.
+
+        Parameters:
+            np.ndarray values:
+                The values to assign to bins (of any shape).
+            str out_of_range:
+                How to handle values outside the bins - "mark" sets their index to -1, "clip" assigns them to the
+                first or last bin. NaN values are always marked with -1.
+            np.ndarray|None out:
+                Integer array (with the same shape as `values`) in which to write the result.
+
+        Returns:
+            np.ndarray -> The bin indices.
+        """
+        if out_of_range not in ("mark", "clip"):
+            raise ValueError(f"Invalid out of range option \"{out_of_range}\". Valid options are: mark, clip.")
+        values = np.asarray(values)
+        if out is None:
+            out = np.empty(values.shape, dtype = np.intp)
+        elif out.shape != values.shape or not np.issubdtype(out.dtype, np.signedinteger):
+            raise ValueError("Output array must be a signed integer array with the same shape as the values.")
+        edges = self.__bin_edges
+        number_of_bins = len(edges) - 1
+        lower_edge = edges[0]
+        upper_edge = edges[-1]
+        inside = (values >= lower_edge) & (values <= upper_edge)
+
+        if self.__spacing == "irregular":
+            indices = np.searchsorted(edges, values, side = "right") - 1
+        else:
+            with np.errstate(invalid = "ignore", divide = "ignore"):
+                if self.__spacing == "linear":
+                    scaled = (values - lower_edge) * (number_of_bins / (upper_edge - lower_edge))
+                else:
+                    scaled = np.log10(values)
+                    scaled -= np.log10(lower_edge)
+                    scaled *= number_of_bins / (np.log10(upper_edge) - np.log10(lower_edge))
+            np.floor(scaled, out = scaled)
+            np.nan_to_num(scaled, copy = False, nan = 0, posinf = number_of_bins - 1, neginf = 0)
+            np.clip(scaled, 0, number_of_bins - 1, out = scaled)
+            indices = scaled.astype(np.intp)
+            # Correct values placed in a neighbouring bin by rounding errors
+            indices -= values < edges[indices]
+            indices += values >= edges[indices + 1]
+        np.clip(indices, 0, number_of_bins - 1, out = indices)
+
+        out[...] = indices
+        if out_of_range == "clip":
+            out[values > upper_edge] = number_of_bins - 1
+            out[values < lower_edge] = 0
+            out[np.isnan(values)] = -1
+        else:
+            out[~inside] = -1
+        return out
@@ -1,12 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO
 import os
-from typing import Any, Literal, Optional
+import time
+from typing import Any, Iterator, Literal, Optional, Sequence
 
+import matplotlib
 from matplotlib import pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.figure import Figure
 from matplotlib.axes import Axes
+from matplotlib.legend import Legend
 import numpy as np
 
 from ..Data._Rect import Rect
+from ..IO.Caching._hashing import hash_cache_data
 from ..Tools._ScreenResolution import ScreenResolution
 from ..Tools._Struct import CacheableStruct
 from ..Tools._autoproperty import AutoProperty, AutoProperty_NonNullable
@@ -14,6 +22,9 @@ from ._CachedPlotFontInfo import CachedPlotFontInfo
 from ._CachedPlotCustomLegend import CachedPlotCustomLegend
 from ._CachedPlotElements import CachedPlotColourbar
 from ._CachedPlot import CachedPlot
+from ._RasterisationReport import RasterisationReport
+from ._RenderHashIndex import RenderHashIndex
+from ._decimation import set_decimation_resolution
 
 class CachedFigureGrid(CacheableStruct):
     """
@@ -36,6 +47,8 @@ class CachedFigureGrid(CacheableStruct):
     custom_legends = AutoProperty_NonNullable[dict[str, CachedPlotCustomLegend]]()
     resolution = AutoProperty_NonNullable[int](default_value = 100)
     resolution_for_files = AutoProperty[int](allow_uninitialised = True)
+    rasterisation_threshold = AutoProperty[int](allow_uninitialised = True)
+    use_pyplot = AutoProperty_NonNullable[bool](default_value = True) # Set to False to create figures independently of pyplot (see `make_figure_and_axes`)
     default_font = AutoProperty_NonNullable[CachedPlotFontInfo]()
     title_font = AutoProperty_NonNullable[CachedPlotFontInfo]()
 
@@ -73,10 +86,13 @@ class CachedFigureGrid(CacheableStruct):
         self.__figure: Figure|None = None
         self.__axes: dict[str, Axes]|None = None
         self.__locked = False
+        self.__rendered_plots: dict[str, CachedPlot]|None = None
+        self.__rendered_colourbars: dict[str, CachedPlotColourbar] = {}
+        self.__rendered_legends: list[Legend] = []
         mosaic_provided = "mosaic" in kwargs
 
         super().__init__(
-            cacheable_attributes = ("title", "mosaic", "rows", "columns", "figure_size", "layout", "relative_widths", "relative_heights", "vertical_spacing", "horizontal_spacing", "plots", "resolution", "resolution_for_files"),
+            cacheable_attributes = ("title", "mosaic", "rows", "columns", "figure_size", "layout", "relative_widths", "relative_heights", "vertical_spacing", "horizontal_spacing", "plots", "resolution", "resolution_for_files", "rasterisation_threshold"),
             **kwargs
         )
 
@@ -517,6 +533,22 @@ class CachedFigureGrid(CacheableStruct):
             self.__figure = None
             self.__axes = None
             self.__locked = False
+            self.__rendered_plots = None
+            self.__rendered_colourbars = {}
+            self.__rendered_legends = []
+
+    def close_figure(self) -> None:
+        """
+        Release the figure and axes objects created by `make_figure_and_axes`.
+        Figures created using pyplot are closed (removing them from pyplot's list of open figures).
+        This will unlock the instance and allow further alteration of the layout.
+        """
+        if self.__locked:
+            if self.__figure.canvas.manager is not None:
+                plt.close(self.__figure)
+            # Break the references between the figure and its artists so that memory is released without waiting for garbage collection
+            self.__figure.clear()
+            self.clear_axes()
 
     def make_figure_and_axes(self, figure_kwargs: dict[str, Any]|None = None, mosaic_kwargs: dict[str, Any]|None = None, gridspec_kwargs: dict[str, Any]|None = None) -> tuple[Figure, dict[str, Axes]]:
         """
@@ -524,9 +556,14 @@ class CachedFigureGrid(CacheableStruct):
         Doing so will lock the object's state and prevent further alterations to the layout.
         These may be subsequently accessed through the `figure` and `axes` properties.
 
+        If `use_pyplot` is False, the figure is created directly with an Agg canvas instead of using `plt.figure`.
+        Such figures are not registered with pyplot (so can't be shown interactively), are freed once no longer
+        referenced and may be rendered and saved concurrently in separate threads (one figure per thread).
+        Use `close_figure` to release the figure once it has been saved.
+
         Parameters:
             dict[str, Any] figure_kwargs:
-                Additional keyword arguments to pass to `plt.figure`.
+                Additional keyword arguments to pass to `plt.figure` (or the `Figure` constructor).
                 `figsize`, `layout`, and `dpi` are already set and MUST not be specified here.
             dict[str, Any] mosaic_kwargs:
                 Additional keyword arguments to pass to `plt.subplot_mosaic`.
@@ -542,7 +579,11 @@ class CachedFigureGrid(CacheableStruct):
         """
         if self.__locked:
             raise RuntimeError("Figure and axes have already been created. Cannot create them again without first calling `clear_axes`.")
-        self.__figure = plt.figure(figsize = self.figure_size, layout = self.layout, **(figure_kwargs if figure_kwargs is not None else {}))
+        if self.use_pyplot:
+            self.__figure = plt.figure(figsize = self.figure_size, layout = self.layout, **(figure_kwargs if figure_kwargs is not None else {}))
+        else:
+            self.__figure = Figure(figsize = self.figure_size, layout = self.layout, **(figure_kwargs if figure_kwargs is not None else {}))
+            FigureCanvasAgg(self.__figure)
         self.__figure.dpi = self.resolution
         if self.title is not None:
             self.__figure.suptitle(self.title, **self.title_font.with_default(self.default_font).fontdict)
@@ -603,6 +644,7 @@ class CachedFigureGrid(CacheableStruct):
         """
         Automatically render any associated CachedPlot instances onto their axes.
         If `make_figure_and_axes` has not been called, this will be done automatically. If you wish to control other elements of figure and axis creation, call that method first.
+        Decimated elements are drawn at the higher of `resolution` and `resolution_for_files`, so that they are not under-sampled in saved files.
 
         Parameters:
             dict[str, dict[str, dict[str, Any]]] forward_kwargs:
@@ -616,14 +658,215 @@ class CachedFigureGrid(CacheableStruct):
             forward_kwargs = {}
         if forward_colourbar_kwargs is None:
             forward_colourbar_kwargs = {}
+        self.__set_decimation_resolution()
         for plot_tag, plot in self.plots.items():
             plot.render(self.__figure, self.__axes[plot_tag], figure_default_font = self.default_font, forward_kwargs = forward_kwargs.get(plot_tag, {}), forward_colourbar_kwargs = forward_colourbar_kwargs.get(plot_tag, {}))
         for plot_tag, colourbar in self.colourbars.items():
-            colourbar.render(self.__figure, self.__axes[plot_tag], self.plots[colourbar.target_plot].plot_elements[colourbar.target_element]._result, **forward_colourbar_kwargs.get(plot_tag, {}))
+            colourbar.render(self.__figure, self.__axes[plot_tag], self.plots[colourbar.target_plot].plot_elements[colourbar.target_element]._result, default_font = self.default_font, **forward_colourbar_kwargs.get(plot_tag, {}))
+            colourbar._mark_rendered()
+        self.__render_custom_legends()
+        self.__rendered_plots = dict(self.plots)
+        self.__rendered_colourbars = dict(self.colourbars)
+
+    def update(self, forward_kwargs: dict[str, dict[str, dict[str, Any]]]|None = None, forward_colourbar_kwargs: dict[str, dict[str, dict[str, Any]]]|None = None) -> bool:
+        """
+        Update a previously rendered figure, re-rendering only the plot elements that have changed (see `CachedPlot.update`).
+        Plots that have been removed or replaced have their artists removed, and figure colourbars and legends are
+        re-rendered when the plots they reference have changed.
+        If `render` has not yet been called, the figure is rendered in full.
+
+        Parameters:
+            dict[str, dict[str, dict[str, Any]]] forward_kwargs:
+                A dictionary of keyword arguments to pass to each plot's `update` method. Keys are the names of each axis.
+            dict[str, dict[str, dict[str, Any]]] forward_colourbar_kwargs:
+                A dictionary of keyword arguments to pass to each plot's `update` method for the colourbar. Keys are the names of each axis.
+
+        Returns:
+            bool -> Was anything re-rendered?
+        """
+        if self.__rendered_plots is None:
+            self.render(forward_kwargs, forward_colourbar_kwargs)
+            return True
+        if forward_kwargs is None:
+            forward_kwargs = {}
+        if forward_colourbar_kwargs is None:
+            forward_colourbar_kwargs = {}
+        self.__set_decimation_resolution()
+
+        # Plots with elements that have been rendered again (rather than updated in-place) have new artists
+        changed_plots = set()
+        replaced_plots = set()
+        for plot_tag, plot in self.__rendered_plots.items():
+            if self.plots.get(plot_tag) is not plot:
+                plot._remove_results()
+                changed_plots.add(plot_tag)
+                replaced_plots.add(plot_tag)
+        for plot_tag, plot in self.plots.items():
+            previous_results = { name : element._result for name, element in plot.plot_elements.items() }
+            if plot.update(self.__figure, self.__axes[plot_tag], figure_default_font = self.default_font, forward_kwargs = forward_kwargs.get(plot_tag, {}), forward_colourbar_kwargs = forward_colourbar_kwargs.get(plot_tag, {})):
+                changed_plots.add(plot_tag)
+                if previous_results != { name : element._result for name, element in plot.plot_elements.items() }:
+                    replaced_plots.add(plot_tag)
+
+        changed_colourbars = False
+        for plot_tag, colourbar in self.__rendered_colourbars.items():
+            if self.colourbars.get(plot_tag) is not colourbar:
+                colourbar._remove_result()
+                changed_colourbars = True
+        for plot_tag, colourbar in self.colourbars.items():
+            if colourbar.target_plot in replaced_plots:
+                colourbar.mark_changed()
+            if colourbar.update(self.__figure, self.__axes[plot_tag], self.plots[colourbar.target_plot].plot_elements[colourbar.target_element]._result, default_font = self.default_font, **forward_colourbar_kwargs.get(plot_tag, {})):
+                changed_colourbars = True
+
+        if len(replaced_plots) > 0 and len(self.custom_legends) > 0:
+            for legend in self.__rendered_legends:
+                legend.remove()
+            self.__render_custom_legends()
+
+        self.__rendered_plots = dict(self.plots)
+        self.__rendered_colourbars = dict(self.colourbars)
+        return len(changed_plots) > 0 or changed_colourbars
+
+    def __set_decimation_resolution(self) -> None:
+        set_decimation_resolution(self.__figure, max(self.resolution, self.resolution_for_files) if self.resolution_for_files is not None else None)
+
+    def __render_custom_legends(self) -> None:
+        number_of_existing_legends = len(self.__figure.legends)
         for legend in self.custom_legends.values():
             legend.render(self.__figure, None, default_font = self.default_font, elements_by_figure_plot = { plot_tag : plot.plot_elements for plot_tag, plot in self.plots.items() })
+        self.__rendered_legends = self.__figure.legends[number_of_existing_legends:]
+
+    SAVE_FORMATS = ("png", "jpeg", "pdf", "svg")
 
-    def save_png(self, filename: str, directory: str|None = None, **kwargs) -> None:
+    def __get_file_kwargs(self, file_format: str, kwargs: dict[str, Any]) -> dict[str, Any]:
+        kwargs = dict(kwargs)
+        if "dpi" in kwargs:
+            kwargs["dpi"] = self.resolution_for_files if self.resolution_for_files is not None else self.resolution
+        if file_format == "pdf" and self.layout == "tight":
+            kwargs["bbox_inches"] = "tight"
+        return kwargs
+
+    def get_rasterised_elements(self) -> list[tuple[str, str, int]]:
+        """
+        Get the plot elements that will be rasterised when saving vector formats (PDF and SVG).
+        Elements with `rasterise` set follow that setting, otherwise those with more than `rasterisation_threshold`
+        artists (see `CachedPlotElement.get_artist_count`) are rasterised. If no threshold is set, elements are only
+        rasterised when requested.
+
+        Returns:
+            list[tuple[str, str, int]] -> The plot name, element name and estimated artist count of each element.
+        """
+        rasterised_elements = []
+        for plot_tag, plot in self.plots.items():
+            for element_name, element in plot.plot_elements.items():
+                artist_count = element.get_artist_count()
+                if element.rasterise if element.rasterise is not None else (self.rasterisation_threshold is not None and artist_count > self.rasterisation_threshold):
+                    rasterised_elements.append((plot_tag, element_name, artist_count))
+        return rasterised_elements
+
+    @contextmanager
+    def __apply_rasterisation(self, file_format: str, file_kwargs: dict[str, Any]) -> Iterator[dict[str, Any]]:
+        if file_format not in ("pdf", "svg"):
+            yield file_kwargs
+            return
+        artists = [artist for plot_tag, element_name, _ in self.get_rasterised_elements() for artist in self.plots[plot_tag].plot_elements[element_name]._get_result_artists()]
+        if len(artists) == 0:
+            yield file_kwargs
+            return
+        previous_states = [artist.get_rasterized() for artist in artists]
+        for artist in artists:
+            artist.set_rasterized(True)
+        try:
+            # Rasterised parts of vector files are drawn at the file resolution
+            yield { "dpi" : self.resolution_for_files if self.resolution_for_files is not None else self.resolution, **file_kwargs }
+        finally:
+            for artist, previous_state in zip(artists, previous_states):
+                artist.set_rasterized(previous_state)
+
+    def get_rasterisation_report(self, file_format: Literal["pdf", "svg"] = "pdf", **kwargs) -> RasterisationReport:
+        """
+        Compare the size of a vector file, and the time taken to save it, with and without rasterising heavy elements.
+        The file is saved in memory only.
+
+        Parameters:
+            str file_format:
+                The vector format to test. Valid options are "pdf" and "svg".
+            (kwargs):
+                Keyword arguments for the save method.
+
+        Returns:
+            RasterisationReport -> The elements that are rasterised and the resulting size and time of each file.
+        """
+        if not self.__locked:
+            raise RuntimeError("Figure has not been created yet. Call `make_figure_and_axes` first.")
+        if file_format not in ("pdf", "svg"):
+            raise ValueError(f"Unsupported file format \"{file_format}\". Valid options are: pdf, svg.")
+        file_kwargs = self.__get_file_kwargs(file_format, kwargs)
+
+        start_time = time.perf_counter()
+        buffer = BytesIO()
+        self.__figure.savefig(buffer, format = file_format, **file_kwargs)
+        vector_time = time.perf_counter() - start_time
+        vector_file_size = len(buffer.getvalue())
+
+        start_time = time.perf_counter()
+        buffer = BytesIO()
+        with self.__apply_rasterisation(file_format, file_kwargs) as rasterised_file_kwargs:
+            self.__figure.savefig(buffer, format = file_format, **rasterised_file_kwargs)
+        rasterised_time = time.perf_counter() - start_time
+
+        return RasterisationReport(
+            file_format = file_format,
+            rasterised_elements = self.get_rasterised_elements(),
+            vector_file_size = vector_file_size,
+            vector_time = vector_time,
+            rasterised_file_size = len(buffer.getvalue()),
+            rasterised_time = rasterised_time
+        )
+
+    def get_content_hash(self, file_format: Literal["png", "jpeg", "pdf", "svg"], render_kwargs: dict[str, Any]|None = None, **kwargs) -> str:
+        """
+        Calculate a hash of everything that determines the content of a saved file.
+        This covers the cache data of the figure and its plots, the fonts, colourbars and legends, the file format,
+        the arguments for `render` and `savefig` and the version of matplotlib.
+
+        Parameters:
+            str file_format:
+                The format of the file.
+            dict[str, Any] render_kwargs:
+                Keyword arguments for `render`.
+            (kwargs):
+                Keyword arguments for the save method.
+
+        Returns:
+            str -> The hash as a hexadecimal string.
+        """
+        return hash_cache_data(
+            self.__get_cache_data__(), self.colourbars, self.custom_legends, self.default_font, self.title_font,
+            file_format, render_kwargs, self.__get_file_kwargs(file_format, kwargs), matplotlib.__version__
+        )
+
+    def __save_file(self, file_format: str, filename: str, directory: str|None, skip_if_unchanged: bool, render_kwargs: dict[str, Any]|None, kwargs: dict[str, Any]) -> bool:
+        filepath = f"{filename}.{file_format}"
+        if directory is not None:
+            filepath = os.path.join(directory, filepath)
+        if skip_if_unchanged:
+            index = RenderHashIndex(os.path.dirname(os.path.abspath(filepath)))
+            content_hash = self.get_content_hash(file_format, render_kwargs, **kwargs) # type: ignore[arg-type]
+            if index.is_current(os.path.basename(filepath), content_hash):
+                return False
+            if not self.__locked:
+                self.render(**(render_kwargs if render_kwargs is not None else {}))
+        if not self.__locked:
+            raise RuntimeError("Figure has not been created yet. Call `make_figure_and_axes` first.")
+        with self.__apply_rasterisation(file_format, self.__get_file_kwargs(file_format, kwargs)) as file_kwargs:
+            self.__figure.savefig(filepath, **file_kwargs)
+        if skip_if_unchanged:
+            index.record(os.path.basename(filepath), content_hash)
+        return True
+
+    def save_png(self, filename: str, directory: str|None = None, skip_if_unchanged: bool = False, render_kwargs: dict[str, Any]|None = None, **kwargs) -> bool:
         """
         Save the figure as a PNG file with the specified resolution.
         The resolution for the file may be set differently to the display resolution using `resolution_for_files`.
@@ -633,16 +876,17 @@ class CachedFigureGrid(CacheableStruct):
                 The name of the file to save the figure as (without extension).
             str|None directory:
                 The directory to save the file in. If None, the current working directory is used.
+            bool skip_if_unchanged:
+                Skip saving (and rendering) if the file was last written with identical content (see `get_content_hash`).
+                If the figure has not been rendered and needs saving, `render` is called automatically.
+            dict[str, Any] render_kwargs:
+                Keyword arguments for `render`. These are included in the content hash.
+
+        Returns:
+            bool -> Was the file written?
         """
-        filepath = f"{filename}.png"
-        if directory is not None:
-            filepath = os.path.join(directory, filepath)
-        if not self.__locked:
-            raise RuntimeError("Figure has not been created yet. Call `make_figure_and_axes` first.")
-        if "dpi" in kwargs:
-            kwargs["dpi"] = self.resolution_for_files if self.resolution_for_files is not None else self.resolution
-        self.__figure.savefig(filepath, **kwargs)
-    def save_jpeg(self, filename: str, directory: str|None = None, **kwargs) -> None:
+        return self.__save_file("png", filename, directory, skip_if_unchanged, render_kwargs, kwargs)
+    def save_jpeg(self, filename: str, directory: str|None = None, skip_if_unchanged: bool = False, render_kwargs: dict[str, Any]|None = None, **kwargs) -> bool:
         """
         Save the figure as a JPEG file with the specified resolution.
         The resolution for the file may be set differently to the display resolution using `resolution_for_files`.
@@ -652,16 +896,17 @@ class CachedFigureGrid(CacheableStruct):
                 The name of the file to save the figure as (without extension).
             str|None directory:
                 The directory to save the file in. If None, the current working directory is used.
+            bool skip_if_unchanged:
+                Skip saving (and rendering) if the file was last written with identical content (see `get_content_hash`).
+                If the figure has not been rendered and needs saving, `render` is called automatically.
+            dict[str, Any] render_kwargs:
+                Keyword arguments for `render`. These are included in the content hash.
+
+        Returns:
+            bool -> Was the file written?
         """
-        filepath = f"{filename}.jpeg"
-        if directory is not None:
-            filepath = os.path.join(directory, filepath)
-        if not self.__locked:
-            raise RuntimeError("Figure has not been created yet. Call `make_figure_and_axes` first.")
-        if "dpi" in kwargs:
-            kwargs["dpi"] = self.resolution_for_files if self.resolution_for_files is not None else self.resolution
-        self.__figure.savefig(filepath, **kwargs)
-    def save_pdf(self, filename: str, directory: str|None = None, **kwargs) -> None:
+        return self.__save_file("jpeg", filename, directory, skip_if_unchanged, render_kwargs, kwargs)
+    def save_pdf(self, filename: str, directory: str|None = None, skip_if_unchanged: bool = False, render_kwargs: dict[str, Any]|None = None, **kwargs) -> bool:
         """
         Save the figure as a PDF file with the specified resolution.
         The resolution for the file may be set differently to the display resolution using `resolution_for_files`.
@@ -671,18 +916,17 @@ class CachedFigureGrid(CacheableStruct):
                 The name of the file to save the figure as (without extension).
             str|None directory:
                 The directory to save the file in. If None, the current working directory is used.
+            bool skip_if_unchanged:
+                Skip saving (and rendering) if the file was last written with identical content (see `get_content_hash`).
+                If the figure has not been rendered and needs saving, `render` is called automatically.
+            dict[str, Any] render_kwargs:
+                Keyword arguments for `render`. These are included in the content hash.
+
+        Returns:
+            bool -> Was the file written?
         """
-        filepath = f"{filename}.pdf"
-        if directory is not None:
-            filepath = os.path.join(directory, filepath)
-        if not self.__locked:
-            raise RuntimeError("Figure has not been created yet. Call `make_figure_and_axes` first.")
-        if "dpi" in kwargs:
-            kwargs["dpi"] = self.resolution_for_files if self.resolution_for_files is not None else self.resolution
-        if self.layout == "tight":
-            kwargs["bbox_inches"] = "tight"
-        self.__figure.savefig(filepath, **kwargs)
-    def save_svg(self, filename: str, directory: str|None = None, **kwargs) -> None:
+        return self.__save_file("pdf", filename, directory, skip_if_unchanged, render_kwargs, kwargs)
+    def save_svg(self, filename: str, directory: str|None = None, skip_if_unchanged: bool = False, render_kwargs: dict[str, Any]|None = None, **kwargs) -> bool:
         """
         Save the figure as a SVG (Simple Vector Graphic) file with the specified resolution.
         The resolution for the file may be set differently to the display resolution using `resolution_for_files`.
@@ -692,12 +936,106 @@ class CachedFigureGrid(CacheableStruct):
                 The name of the file to save the figure as (without extension).
             str|None directory:
                 The directory to save the file in. If None, the current working directory is used.
+            bool skip_if_unchanged:
+                Skip saving (and rendering) if the file was last written with identical content (see `get_content_hash`).
+                If the figure has not been rendered and needs saving, `render` is called automatically.
+            dict[str, Any] render_kwargs:
+                Keyword arguments for `render`. These are included in the content hash.
+
+        Returns:
+            bool -> Was the file written?
         """
-        filepath = f"{filename}.svg"
-        if directory is not None:
-            filepath = os.path.join(directory, filepath)
+        return self.__save_file("svg", filename, directory, skip_if_unchanged, render_kwargs, kwargs)
+    def save_all(self, filename: str, formats: Sequence[Literal["png", "jpeg", "pdf", "svg"]] = ("png", "pdf", "svg"), directory: str|None = None, concurrent_writes: bool = False, skip_if_unchanged: bool = False, render_kwargs: dict[str, Any]|None = None, **kwargs) -> dict[str, float]:
+        """
+        Save the figure in several formats, laying it out only once.
+
+        The first format is saved as normal. The layout engine (and `bbox_inches="tight"` where used) is then disabled
+        and the resulting layout is reused for the remaining formats. As each backend measures text slightly
+        differently, positions may differ by a fraction of a point from files written by the individual `save_*` methods.
+        Files are rendered in memory one after another (matplotlib is not thread-safe) and may then be written to
+        disk concurrently.
+
+        Parameters:
+            str filename:
+                The name of the files to save the figure as (without extension).
+            Sequence[str] formats:
+                The formats to save. Valid options are "png", "jpeg", "pdf" and "svg".
+            str|None directory:
+                The directory to save the files in. If None, the current working directory is used.
+            bool concurrent_writes:
+                Write the files to disk using a thread per format.
+            bool skip_if_unchanged:
+                Skip any formats where the file was last written with identical content (see `get_content_hash`).
+                If the figure has not been rendered and any files need saving, `render` is called automatically.
+            dict[str, Any] render_kwargs:
+                Keyword arguments for `render`. These are included in the content hash.
+
+        Returns:
+            dict[str, float] -> The time in seconds spent drawing and writing each format that was saved. The time
+                                taken to lay out the figure is included in that of the first format.
+        """
+        for file_format in formats:
+            if file_format not in CachedFigureGrid.SAVE_FORMATS:
+                raise ValueError(f"Unsupported file format \"{file_format}\". Valid options are: {', '.join(CachedFigureGrid.SAVE_FORMATS)}.")
+
+        content_hashes: dict[str, str] = {}
+        if skip_if_unchanged:
+            index = RenderHashIndex(os.path.dirname(os.path.abspath(os.path.join(directory if directory is not None else "", filename))))
+            for file_format in formats:
+                content_hashes[file_format] = self.get_content_hash(file_format, render_kwargs, **kwargs)
+            formats = [file_format for file_format in formats if not index.is_current(f"{os.path.basename(filename)}.{file_format}", content_hashes[file_format])]
+            if len(formats) == 0:
+                return {}
+            if not self.__locked:
+                self.render(**(render_kwargs if render_kwargs is not None else {}))
         if not self.__locked:
             raise RuntimeError("Figure has not been created yet. Call `make_figure_and_axes` first.")
-        if "dpi" in kwargs:
-            kwargs["dpi"] = self.resolution_for_files if self.resolution_for_files is not None else self.resolution
-        self.__figure.savefig(filepath, **kwargs)
+
+        timings: dict[str, float] = {}
+        layout_engine = self.__figure.get_layout_engine()
+        tight_bbox = None
+        files: dict[str, tuple[str, bytes]] = {}
+        try:
+            for file_format in formats:
+                start_time = time.perf_counter()
+                file_kwargs = self.__get_file_kwargs(file_format, kwargs)
+                pad_inches = file_kwargs.get("pad_inches", matplotlib.rcParams["savefig.pad_inches"])
+                if len(files) > 0 and file_kwargs.get("bbox_inches") == "tight" and isinstance(pad_inches, (int, float)):
+                    if tight_bbox is None:
+                        tight_bbox = self.__figure.get_tightbbox()
+                    file_kwargs["bbox_inches"] = tight_bbox.padded(pad_inches)
+                    file_kwargs.pop("pad_inches", None)
+                buffer = BytesIO()
+                with self.__apply_rasterisation(file_format, file_kwargs) as file_kwargs:
+                    self.__figure.savefig(buffer, format = file_format, **file_kwargs)
+                if len(files) == 0 and layout_engine is not None:
+                    # The first draw has laid out the figure - keep that layout for the other formats
+                    self.__figure.set_layout_engine("none")
+                filepath = f"{filename}.{file_format}"
+                if directory is not None:
+                    filepath = os.path.join(directory, filepath)
+                files[file_format] = (filepath, buffer.getvalue())
+                timings[file_format] = time.perf_counter() - start_time
+        finally:
+            if layout_engine is not None:
+                self.__figure.set_layout_engine(layout_engine)
+
+        def write_file(file_format: str) -> float:
+            start_time = time.perf_counter()
+            filepath, data = files[file_format]
+            with open(filepath, "wb") as file:
+                file.write(data)
+            return time.perf_counter() - start_time
+
+        if concurrent_writes and len(files) > 1:
+            with ThreadPoolExecutor(max_workers = len(files)) as executor:
+                write_times = dict(zip(files.keys(), executor.map(write_file, files.keys())))
+        else:
+            write_times = { file_format : write_file(file_format) for file_format in files }
+        for file_format, write_time in write_times.items():
+            timings[file_format] += write_time
+            if skip_if_unchanged:
+                index.record(os.path.basename(files[file_format][0]), content_hashes[file_format])
+
+        return timings
@@ -1,6 +1,7 @@
 from ..Data._Rect import Rect
 from ._CachedFigureGrid import CachedFigureGrid
 from ..IO.Caching._CacheTarget import CacheTarget
+from ..IO.Caching._CacheDependencies import CacheDependencies
 
 class CachedFigureGridFactory(object):
     def __init__(self, cache_directory: str) -> None:
@@ -12,5 +13,8 @@ class CachedFigureGridFactory(object):
     def load(self, target: CacheTarget) -> CachedFigureGrid:
         return target.load_object(self.__cache_directory, CachedFigureGrid)
 
-    def save(self, figure_grid: CachedFigureGrid, target: CacheTarget) -> None:
-        target.save_object(self.__cache_directory, figure_grid)
+    def save(self, figure_grid: CachedFigureGrid, target: CacheTarget, dependencies: CacheDependencies|None = None) -> None:
+        target.save_object(self.__cache_directory, figure_grid, dependencies)
+
+    def check_fresh(self, target: CacheTarget, dependencies: CacheDependencies|None = None) -> bool:
+        return target.check_exists(self.__cache_directory, check_fresh = True, dependencies = dependencies)
@@ -13,8 +13,9 @@ from ..Tools._CacheableFunction import CacheableFunction
 from ._CachedPlotFontInfo import CachedPlotFontInfo
 from ._CachedPlotCustomLegend import CachedPlotCustomLegend
 from ._CachedPlotElements import CachedPlotElement, CachedPlotColourbar
+from ._ChangeTracking import ChangeTracking
 
-class CachedPlot(CacheableStruct):
+class CachedPlot(ChangeTracking, CacheableStruct):
     title = AutoProperty[str](allow_uninitialised = True)
     plot_elements = AutoProperty_NonNullable[dict[str, CachedPlotElement]]()
     colourbars = AutoProperty_NonNullable[dict[str, CachedPlotColourbar]]()
@@ -95,6 +96,10 @@ class CachedPlot(CacheableStruct):
         self.y_tick_label_font = CachedPlotFontInfo()
         self.alt_x_tick_label_font = CachedPlotFontInfo()
         self.alt_y_tick_label_font = CachedPlotFontInfo()
+        self.__rendered_axis: Axes|None = None
+        self.__rendered_fonts: tuple[CachedPlotFontInfo, CachedPlotFontInfo|None]|None = None
+        self.__rendered_elements: dict[str, CachedPlotElement] = {}
+        self.__rendered_colourbars: dict[str, CachedPlotColourbar] = {}
     
     def __check_element_name_is_new(self, name: str) -> bool:
         return name not in self.plot_elements
@@ -116,17 +121,121 @@ class CachedPlot(CacheableStruct):
             forward_kwargs = {}
         if forward_colourbar_kwargs is None:
             forward_colourbar_kwargs = {}
+        if any(getattr(element, "decimate", False) for element in self.plot_elements.values()):
+            # Decimated elements are reduced to the resolution of the final axis range
+            self.__set_axis_limits(axis)
+
         for element in self.plot_elements:
             self.plot_elements[element].render(figure, axis, default_font = self.default_font.with_default(figure_default_font), **forward_kwargs.get(element, {}))
+            self.plot_elements[element]._mark_rendered()
+
+        for name, colourbar in self.colourbars.items():
+            colourbar.render(figure, axis, self.__get_colourbar_target(name, colourbar), default_font = self.default_font.with_default(figure_default_font), **forward_colourbar_kwargs.get(name, {}))
+            colourbar._mark_rendered()
+
+        self.__render_axis_settings(figure, axis, figure_default_font)
+        self.__record_render(axis, figure_default_font)
+
+    def update(self, figure: Figure, axis: Axes, figure_default_font: Optional[CachedPlotFontInfo] = None, forward_kwargs: dict[str, dict[str, Any]]|None = None, forward_colourbar_kwargs: dict[str, dict[str, Any]]|None = None) -> bool:
+        """
+        Update a previously rendered plot, re-rendering only the elements that have changed.
+
+        Artists belonging to elements or colourbars that have been removed or replaced are removed from the axis.
+        Colourbars are re-rendered when their target element is. Changing the plot's own settings (such as labels)
+        re-applies the axis settings without re-rendering any elements, unless the default font is replaced.
+        If the plot has not yet been rendered onto this axis, it is rendered in full.
+
+        Changes made in-place (such as editing an element's data array or a font object) are not detected.
+        Call `mark_changed` on the affected objects after making them.
+
+        Arguments are the same as for `render`.
+
+        Returns:
+            bool -> Was anything re-rendered?
+        """
+        if self.__rendered_axis is not axis:
+            self.render(figure, axis, figure_default_font, forward_kwargs, forward_colourbar_kwargs)
+            return True
+        if forward_kwargs is None:
+            forward_kwargs = {}
+        if forward_colourbar_kwargs is None:
+            forward_colourbar_kwargs = {}
 
+        # Elements inherit the default font, so a new font object requires all of them to be rendered again
+        redraw_all = self.__rendered_fonts != (self.default_font, figure_default_font)
+        default_font = self.default_font.with_default(figure_default_font)
+
+        removed = False
+        for name, element in self.__rendered_elements.items():
+            if self.plot_elements.get(name) is not element:
+                element._remove_result()
+                removed = True
+        for name, colourbar in self.__rendered_colourbars.items():
+            if self.colourbars.get(name) is not colourbar:
+                colourbar._remove_result()
+                removed = True
+
+        changed_elements = set()
+        replaced_elements = set()
+        for name, element in self.plot_elements.items():
+            if redraw_all:
+                element.mark_changed()
+            previous_result = element._result
+            if element.update(figure, axis, default_font = default_font, **forward_kwargs.get(name, {})):
+                changed_elements.add(name)
+                if element._result is not previous_result:
+                    replaced_elements.add(name)
+
+        # Elements updated in-place keep their artists, so colourbars and legends referencing them remain valid
+        changed_colourbars = False
         for name, colourbar in self.colourbars.items():
-            target: object
-            if colourbar.target_element in self.plot_elements:
-                target = self.plot_elements[colourbar.target_element]._result
-            else:
-                raise RuntimeError(f"Unable to locate target for colourbar \"{name}\".")
-            colourbar.render(figure, axis, target, default_font = self.default_font.with_default(figure_default_font), **forward_colourbar_kwargs.get(name, {}))
+            if redraw_all or colourbar.target_element in replaced_elements:
+                colourbar.mark_changed()
+            if colourbar.update(figure, axis, self.__get_colourbar_target(name, colourbar), default_font = default_font, **forward_colourbar_kwargs.get(name, {})):
+                changed_colourbars = True
+
+        updated = self.changed or removed or len(changed_elements) > 0 or changed_colourbars
+        if self.changed or removed or len(replaced_elements) > 0 or changed_colourbars:
+            # Reset anything that may no longer be set before re-applying the axis settings
+            axis.set_title("")
+            axis.set_xlabel("")
+            axis.set_ylabel("")
+            if self.aspect is None:
+                axis.set_aspect("auto")
+            if axis.get_legend() is not None:
+                axis.get_legend().remove()
+            self.__render_axis_settings(figure, axis, figure_default_font)
+        self.__record_render(axis, figure_default_font)
+        return updated
+
+    def _remove_results(self) -> None:
+        """
+        Remove the artists of all elements and colourbars from the last render.
+        """
+        for element in self.__rendered_elements.values():
+            element._remove_result()
+        for colourbar in self.__rendered_colourbars.values():
+            colourbar._remove_result()
+        self.__rendered_axis = None
+
+    def __get_colourbar_target(self, name: str, colourbar: CachedPlotColourbar) -> object:
+        if colourbar.target_element in self.plot_elements:
+            return self.plot_elements[colourbar.target_element]._result
+        else:
+            raise RuntimeError(f"Unable to locate target for colourbar \"{name}\".")
+
+    def __record_render(self, axis: Axes, figure_default_font: Optional[CachedPlotFontInfo]) -> None:
+        self.__rendered_axis = axis
+        self.__rendered_fonts = (self.default_font, figure_default_font)
+        self.__rendered_elements = dict(self.plot_elements)
+        self.__rendered_colourbars = dict(self.colourbars)
+        self._mark_rendered()
 
+    def __set_axis_limits(self, axis: Axes) -> None:
+        axis.set_xlim(self.extent.extent[0:2] if not self.flip_x else self.extent.extent[1::-1])
+        axis.set_ylim(self.extent.extent[2:4] if not self.flip_y else self.extent.extent[3:1:-1])
+
+    def __render_axis_settings(self, figure: Figure, axis: Axes, figure_default_font: Optional[CachedPlotFontInfo]) -> None:
         if self.title is not None:
             axis.set_title(self.title, **self.title_font.with_default(self.default_font).with_default(figure_default_font).fontdict)
 
@@ -171,8 +280,14 @@ class CachedPlot(CacheableStruct):
             **y_tick_label_font_kwargs
         )
 
-        axis.set_xlim(self.extent.extent[0:2] if not self.flip_x else self.extent.extent[1::-1])
-        axis.set_ylim(self.extent.extent[2:4] if not self.flip_y else self.extent.extent[3:1:-1])
+        self.__set_axis_limits(axis)
+
+        if self._alt_x_axis is not None:
+            self._alt_x_axis.remove()
+            self._alt_x_axis = None
+        if self._alt_y_axis is not None:
+            self._alt_y_axis.remove()
+            self._alt_y_axis = None
 
         if self.alt_x_axis_functions is not None:
             self._alt_x_axis = axis.secondary_xaxis(
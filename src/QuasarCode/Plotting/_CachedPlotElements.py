@@ -1,6 +1,8 @@
 from typing import TYPE_CHECKING, Any, Literal, Sequence, TypeVar, Generic
 from abc import abstractmethod
 
+import matplotlib
+from matplotlib.artist import Artist
 from matplotlib.axes import Axes
 from matplotlib.cm import ScalarMappable
 from matplotlib.colorbar import Colorbar
@@ -17,6 +19,7 @@ from matplotlib.lines import Line2D
 from matplotlib.contour import QuadContourSet
 from matplotlib.image import AxesImage
 from matplotlib.text import Text
+from matplotlib.transforms import AffineDeltaTransform
 from matplotlib.patches import Wedge
 
 from ..Data._Rect import Rect
@@ -24,19 +27,109 @@ from ..Tools._Struct import CacheableStruct
 from ..Tools._autoproperty import AutoProperty, AutoProperty_NonNullable
 from ..Tools._CacheableFunction import CacheableFunction
 from ._CachedPlotFontInfo import CachedPlotFontInfo
+from ._ChangeTracking import ChangeTracking
+from ._decimation import decimate_line, decimate_scatter, get_axis_pixels, get_visible_extent
+from ._HexbinGrid import HexbinGrid
 
 T = TypeVar("T")
 
-class CachedPlotElement(CacheableStruct, Generic[T]):
+def _rescale_colours(mappable: ScalarMappable, min_value: float|None, max_value: float|None, kwargs: dict[str, Any]) -> None:
+    # Match the colour limits that a full render with new data would produce (unless they are set by the render arguments)
+    if any(key in kwargs for key in ("norm", "vmin", "vmax", "clim")):
+        return
+    previous_limits = (mappable.norm.vmin, mappable.norm.vmax)
+    with mappable.norm.callbacks.blocked():
+        mappable.norm.vmin = min_value
+        mappable.norm.vmax = max_value
+        mappable.autoscale_None()
+    if (mappable.norm.vmin, mappable.norm.vmax) != previous_limits:
+        mappable.changed() # Updates any colourbars
+
+class CachedPlotElement(ChangeTracking, CacheableStruct, Generic[T]):
+    _IN_PLACE_ATTRIBUTES: tuple[str, ...] = () # Attributes that `_update_result_data` can apply to the existing artists
     _result = AutoProperty[T](allow_uninitialised = True)
+    rasterise = AutoProperty[bool](allow_uninitialised = True) # Rasterise in vector outputs (None to use CachedFigureGrid.rasterisation_threshold)
     def __init__(self, *cacheable_attributes: str, **kwargs):
         super().__init__(
-            cacheable_attributes = cacheable_attributes,#list(cacheable_attributes) + ["_result"],
+            cacheable_attributes = (*cacheable_attributes, "rasterise"),#list(cacheable_attributes) + ["_result"],
             **kwargs
         )
     @property
     def result(self) -> T|None:
         return self._result
+    def get_artist_count(self) -> int:
+        """
+        Estimate the number of primitives (points, vertices, polygons, etc.) drawn by the element.
+        Used to decide whether the element should be rasterised in vector outputs.
+
+        Returns:
+            int -> The estimated number of primitives.
+        """
+        return 1
+    def _get_result_artists(self) -> list[Artist]:
+        """
+        Get the individual artists created by the last call to `render`.
+        """
+        artists: list[Artist] = []
+        def collect(result: Any) -> None:
+            if isinstance(result, Artist):
+                artists.append(result)
+            elif isinstance(result, (list, tuple)):
+                for item in result:
+                    collect(item)
+        collect(self._result)
+        return artists
+    def update(self, figure: Figure, axis: Axes, *args: Any, **kwargs: Any) -> bool:
+        """
+        Render the element again only if it has changed since it was last rendered.
+        Where only the element's data has changed, the existing artists are updated in-place.
+        Otherwise, any artists from the previous render are removed first.
+
+        Arguments are the same as for `render`.
+
+        Returns:
+            bool -> Was the element rendered?
+        """
+        if not self.changed and self._result is not None:
+            return False
+        changed_attributes = self.changed_attributes
+        if self._result is not None and changed_attributes is not None and changed_attributes.issubset(self._IN_PLACE_ATTRIBUTES):
+            if self._update_result_data(figure, axis, *args, **kwargs):
+                self._mark_rendered()
+                return True
+        self._remove_result()
+        self.render(figure, axis, *args, **kwargs)
+        self._mark_rendered()
+        return True
+    def _update_result_data(self, figure: Figure, axis: Axes, *args: Any, **kwargs: Any) -> bool:
+        """
+        Apply changes to the attributes listed in `_IN_PLACE_ATTRIBUTES` to the artists from the last render
+        (for example, using `set_data`) without creating new artists.
+
+        Arguments are the same as for `render`.
+
+        Returns:
+            bool -> Could the artists be updated? If False, the element is rendered again in full.
+        """
+        return False
+    def _remove_result(self) -> None:
+        """
+        Remove any artists created by the last call to `render`.
+        """
+        CachedPlotElement.__remove_artists(self._result)
+        self._result = None
+    @staticmethod
+    def __remove_artists(artists: Any) -> None:
+        if artists is None:
+            return
+        if isinstance(artists, (list, tuple)):
+            for artist in artists:
+                CachedPlotElement.__remove_artists(artist)
+        else:
+            try:
+                artists.remove()
+            except (AttributeError, ValueError, NotImplementedError):
+                pass # Not an artist or already removed
     @abstractmethod
     def render(self, figure: Figure, axis: Axes, default_font: CachedPlotFontInfo, *args: Any, **kwargs: Any) -> None:
         """
@@ -58,12 +151,33 @@ class CachedPlotLine(CachedPlotElement[Line2D]):
     linestyle = AutoProperty[str](allow_uninitialised = True)
     linewidth = AutoProperty[float](allow_uninitialised = True)
     alpha = AutoProperty_NonNullable[float](default_value = 1.0)
+    decimate = AutoProperty_NonNullable[bool](default_value = False)
+    decimation_oversampling = AutoProperty_NonNullable[float](default_value = 2.0)
+    _IN_PLACE_ATTRIBUTES = ("x", "y")
     def __init__(self, **kwargs):
-        super().__init__("x", "y", "label", "colour", "linestyle", "linewidth", "alpha", **kwargs)
+        super().__init__("x", "y", "label", "colour", "linestyle", "linewidth", "alpha", "decimate", "decimation_oversampling", **kwargs)
+    def get_artist_count(self) -> int:
+        return len(self.x)
+    def __get_plotted_data(self, axis: Axes) -> tuple[Any, Any]:
+        x = self.x
+        y = self.y
+        if self.decimate:
+            x_min, x_max, _, _ = get_visible_extent(axis, x, y)
+            indices = decimate_line(x, y, x_min, x_max, get_axis_pixels(axis, self.decimation_oversampling)[0])
+            x = np.asarray(x)[indices]
+            y = np.asarray(y)[indices]
+        return x, y
     def render(self, figure: Figure, axis: Axes, default_font: CachedPlotFontInfo, *args: Any, **kwargs: Any) -> None:
+        """
+        Render the line.
+
+        If `decimate` is set, only the points needed to draw the line at the axis' resolution (multiplied by
+        `decimation_oversampling`) are plotted (see `decimate_line`). The full data is unaffected.
+        """
+        x, y = self.__get_plotted_data(axis)
         self._result = axis.plot(
-            self.x,
-            self.y,
+            x,
+            y,
             label = self.label,
             color = self.colour,
             linestyle = self.linestyle,
@@ -71,6 +185,9 @@ class CachedPlotLine(CachedPlotElement[Line2D]):
             alpha = self.alpha,
             **kwargs
         )[0]
+    def _update_result_data(self, figure: Figure, axis: Axes, *args: Any, **kwargs: Any) -> bool:
+        self._result.set_data(*self.__get_plotted_data(axis))
+        return True
     @staticmethod
     def from_line(line: Line2D) -> "CachedPlotLine":
         coords: np.ndarray[tuple[int, int], np.dtype[np.floating]] = line.get_xydata()
@@ -94,10 +211,59 @@ class CachedPlotScatter(CachedPlotElement[PathCollection]):
     marker = AutoProperty[MarkerType](allow_uninitialised = True)
     size = AutoProperty["float|ArrayLike"](allow_uninitialised = True)
     alpha = AutoProperty["float|ArrayLike"](allow_uninitialised = True)
+    decimate = AutoProperty_NonNullable[bool](default_value = False)
+    decimation_oversampling = AutoProperty_NonNullable[float](default_value = 1.0)
+    decimation_points_per_pixel = AutoProperty_NonNullable[int](default_value = 1)
+    _IN_PLACE_ATTRIBUTES = ("x", "y", "colour", "size", "alpha")
     def __init__(self, **kwargs):
-        super().__init__("x", "y", "label", "colour", "colourmap", "marker", "size", "alpha", **kwargs)
+        super().__init__("x", "y", "label", "colour", "colourmap", "marker", "size", "alpha", "decimate", "decimation_oversampling", "decimation_points_per_pixel", **kwargs)
+    def get_artist_count(self) -> int:
+        return len(self.x)
+    def __get_plotted_data(self, axis: Axes) -> tuple[Any, Any, Any, Any, Any]:
+        x = self.x
+        y = self.y
+        colour = self.colour
+        size = self.size
+        alpha = self.alpha
+        if self.decimate:
+            indices = decimate_scatter(x, y, get_visible_extent(axis, x, y), *get_axis_pixels(axis, self.decimation_oversampling), points_per_pixel = self.decimation_points_per_pixel)
+            number_of_points = len(x)
+            def select(values: Any) -> Any:
+                # Only values given per point are reduced
+                return np.asarray(values)[indices] if not isinstance(values, str) and np.ndim(values) > 0 and len(values) == number_of_points else values
+            x = np.asarray(x)[indices]
+            y = np.asarray(y)[indices]
+            colour = select(colour)
+            size = select(size)
+            alpha = select(alpha)
+        return x, y, colour, size, alpha
     def render(self, figure: Figure, axis: Axes, default_font: CachedPlotFontInfo, *args: Any, **kwargs: Any):
-        self._result = axis.scatter(self.x, self.y, c = self.colour, cmap = self.colourmap, marker = self.marker, s = self.size, alpha = self.alpha, label = self.label, **kwargs)
+        """
+        Render the points.
+
+        If `decimate` is set, the points in each pixel of the axis (at its resolution multiplied by
+        `decimation_oversampling`) are subsampled in proportion to their number, keeping an average of
+        `decimation_points_per_pixel` points in each pixel containing points, and points well outside the visible
+        region are omitted (see `decimate_scatter`). The full data is unaffected.
+        """
+        x, y, colour, size, alpha = self.__get_plotted_data(axis)
+        self._result = axis.scatter(x, y, c = colour, cmap = self.colourmap, marker = self.marker, s = size, alpha = alpha, label = self.label, **kwargs)
+    def _update_result_data(self, figure: Figure, axis: Axes, *args: Any, **kwargs: Any) -> bool:
+        x, y, colour, size, alpha = self.__get_plotted_data(axis)
+        colour_mapped = self._result.get_array() is not None
+        if colour is not None and colour_mapped != (not isinstance(colour, str) and np.ndim(colour) == 1 and np.issubdtype(np.asarray(colour).dtype, np.number)):
+            return False # Switching between mapped and fixed colours
+        if size is None:
+            size = matplotlib.rcParams["lines.markersize"] ** 2
+        self._result.set_offsets(np.column_stack((x, y)))
+        self._result.set_sizes(np.atleast_1d(size))
+        if colour_mapped:
+            self._result.set_array(np.asarray(colour))
+            _rescale_colours(self._result, None, None, kwargs)
+        elif colour is not None:
+            self._result.set_facecolor(colour)
+        self._result.set_alpha(alpha)
+        return True
     @staticmethod
     def from_points(points: PathCollection) -> "CachedPlotScatter":
         coords: np.ndarray[tuple[int, int], np.dtype[np.floating]] = points.get_offsets()
@@ -129,6 +295,8 @@ class CachedPlotErrorbar(CachedPlotElement[ErrorbarContainer]):
     alpha = AutoProperty["float|ArrayLike"](allow_uninitialised = True)
     def __init__(self, **kwargs):
         super().__init__("x", "y", "xerr", "yerr", "colourmap", **kwargs)
+    def get_artist_count(self) -> int:
+        return len(self.x) * (1 + (self.xerr is not None) + (self.yerr is not None))
     def render(self, figure: Figure, axis: Axes, default_font: CachedPlotFontInfo, *args: Any, **kwargs: Any):
         self._result = axis.errorbar(
             x = self.x,
@@ -170,17 +338,149 @@ class CachedPlotHexbin(CachedPlotElement[PolyCollection]):
     colourmap = AutoProperty[str|Colormap](allow_uninitialised = True)
     edgecolour = AutoProperty_NonNullable[ColorType|Literal["face", "none"]](default_value = "face")
     bin_alphas = AutoProperty[np.ndarray[tuple[int], np.dtype[np.floating]]](allow_uninitialised = True)
+    compact_storage = AutoProperty_NonNullable[bool](default_value = False)
+    compact_value_bits = AutoProperty[Literal[8, 16]](allow_uninitialised = True)
+    _IN_PLACE_ATTRIBUTES = ("polygon_offsets", "bin_values", "bin_alphas", "min_value", "max_value")
     def __init__(self, **kwargs):
-        super().__init__("extent", "gridsize", "polygon_offsets", "bin_values", "min_value", "max_value", "colourmap", "edgecolour", "bin_alphas", **kwargs)
-    def render(self, figure: Figure, axis: Axes, default_font: CachedPlotFontInfo, *args: Any, **kwargs: Any):
+        super().__init__("extent", "gridsize", "polygon_offsets", "bin_values", "min_value", "max_value", "colourmap", "edgecolour", "bin_alphas", "compact_storage", "compact_value_bits", **kwargs)
+    def __get_cache_data__(self) -> dict[str, Any]:
+        """
+        Get the data to be cached.
+
+        When `compact_storage` is set, the cell positions are stored as cell indices (int32, or the steps
+        between them where the cells are in index order) and rebuilt from the extent and gridsize on load.
+        Values are stored as float32 (or quantised to `compact_value_bits` bits, with non-finite values kept
+        separately) and per-bin alphas and edge colours as uint8.
+
+        Returns:
+            dict[str, Any] -> The data to be cached.
+        """
+        data = super().__get_cache_data__()
+        if not self.compact_storage:
+            return data
+        data.pop("polygon_offsets")
+        values = np.asarray(data.pop("bin_values"))
+        alphas = data.pop("bin_alphas")
+        cell_indices = HexbinGrid(self.extent, self.gridsize).get_cell_indices_from_offsets(self.polygon_offsets).astype(np.int32)
+        steps = np.diff(cell_indices, prepend = 0)
+        if len(steps) > 0 and steps.min() >= 0 and steps.max() <= np.iinfo(np.uint16).max:
+            # Cells are normally in index order, so the gaps between them fit in a smaller type
+            data["packed_cell_index_steps"] = steps.astype(np.uint8 if steps.max() <= np.iinfo(np.uint8).max else np.uint16)
+        else:
+            data["packed_cell_indices"] = cell_indices
+        if self.compact_value_bits is None:
+            data["packed_values"] = values.astype(np.float32)
+        else:
+            if self.compact_value_bits not in (8, 16):
+                raise ValueError(f"Unsupported number of bits ({self.compact_value_bits}) for compact value storage. Valid options are 8 or 16.")
+            code_type = np.uint8 if self.compact_value_bits == 8 else np.uint16
+            non_finite_code = np.iinfo(code_type).max
+            finite = np.isfinite(values)
+            value_min = float(values[finite].min()) if finite.any() else 0.0
+            value_max = float(values[finite].max()) if finite.any() else 0.0
+            step = (value_max - value_min) / (non_finite_code - 1) if value_max > value_min else 1.0
+            codes = np.full(values.shape, non_finite_code, dtype = code_type)
+            codes[finite] = np.rint((values[finite] - value_min) / step).astype(code_type)
+            data["packed_values"] = codes
+            data["packed_value_range"] = (value_min, step)
+            data["packed_non_finite_values"] = values[~finite].astype(np.float32)
+        data["packed_alphas"] = (np.rint(np.asarray(alphas) * 255).astype(np.uint8)) if isinstance(alphas, np.ndarray) else alphas
+        if isinstance(self.edgecolour, np.ndarray) and self.edgecolour.ndim == 2:
+            data["edgecolour"] = np.rint(self.edgecolour * 255).astype(np.uint8)
+        return data
+    @classmethod
+    def __from_cache_data__(cls, data: dict[str, Any]) -> "CachedPlotHexbin":
+        """
+        Load the object from a cache target.
+
+        Parameters:
+            dict[str, Any] data:
+                The data to load the object from.
+        """
+        if "packed_cell_indices" not in data and "packed_cell_index_steps" not in data:
+            return super().__from_cache_data__(data)
+        data = dict(data)
+        if "packed_cell_index_steps" in data:
+            cell_indices = np.cumsum(data.pop("packed_cell_index_steps"), dtype = np.int64)
+        else:
+            cell_indices = data.pop("packed_cell_indices")
+        values = data.pop("packed_values")
+        value_range = data.pop("packed_value_range", None)
+        non_finite_values = data.pop("packed_non_finite_values", None)
+        alphas = data.pop("packed_alphas")
+        instance = super().__from_cache_data__(data)
+        instance.polygon_offsets = HexbinGrid(instance.extent, instance.gridsize).get_offsets(cell_indices)
+        if value_range is None:
+            instance.bin_values = values.astype(float)
+        else:
+            non_finite = values == np.iinfo(values.dtype).max
+            bin_values = value_range[0] + values.astype(float) * value_range[1]
+            bin_values[non_finite] = non_finite_values
+            instance.bin_values = bin_values
+        instance.bin_alphas = alphas.astype(float) / 255 if isinstance(alphas, np.ndarray) else alphas
+        if isinstance(instance.edgecolour, np.ndarray) and instance.edgecolour.dtype == np.uint8:
+            instance.edgecolour = instance.edgecolour.astype(float) / 255
+        return instance
+    def get_artist_count(self) -> int:
+        return len(self.bin_values)
+    HEXBIN_ONLY_KWARGS = ("xscale", "yscale", "bins", "mincnt", "marginals", "reduce_C_function", "C", "colorizer")
+    def render(self, figure: Figure, axis: Axes, default_font: CachedPlotFontInfo, *args: Any, rebin: bool = False, **kwargs: Any):
+        """
+        Render the cached hexagons.
+
+        By default, the collection is built directly from the cached cell positions and values.
+        Set `rebin` to replay the data through `axis.hexbin` instead (this is also done when any
+        arguments only supported by `axis.hexbin` are provided, such as a log scale).
+        The `cmap`, `vmin` and `vmax` arguments take priority over the cached colour map and limits.
+        """
+        if rebin or any(key in kwargs for key in CachedPlotHexbin.HEXBIN_ONLY_KWARGS):
+            self.__render_with_hexbin(axis, **kwargs)
+            return
+        colourmap = kwargs.pop("cmap", self.colourmap)
+        min_value = kwargs.pop("vmin", self.min_value)
+        max_value = kwargs.pop("vmax", self.max_value)
+        norm = kwargs.pop("norm", None)
+        linewidths = kwargs.pop("linewidths", None)
+        grid = HexbinGrid(self.extent, self.gridsize)
+        collection = PolyCollection(
+            [grid.polygon],
+            edgecolors = self.edgecolour,
+            linewidths = linewidths if linewidths is not None else [matplotlib.rcParams["patch.linewidth"]],
+            offsets = self.polygon_offsets,
+            offset_transform = AffineDeltaTransform(axis.transData)
+        )
+        collection.set_cmap(colourmap)
+        collection.set_norm(norm)
+        collection.set_array(self.bin_values)
+        collection.set_alpha(self.bin_alphas) # type: ignore[arg-type]
+        collection.update(kwargs)
+        if min_value is not None or max_value is not None:
+            collection.set_clim(min_value, max_value)
+        if norm is not None and collection.norm.vmin is None and collection.norm.vmax is None:
+            collection.norm.autoscale(self.bin_values)
+        x_min, x_max, y_min, y_max = self.extent.extent
+        padding = 1.e-9 * (x_max - x_min) # Matches axis.hexbin
+        axis.update_datalim(((x_min - padding, y_min), (x_max + padding, y_max)))
+        axis.add_collection(collection, autolim = False)
+        axis.autoscale_view(tight = True)
+        self._result = collection
+    def _update_result_data(self, figure: Figure, axis: Axes, *args: Any, rebin: bool = False, **kwargs: Any) -> bool:
+        if rebin or any(key in kwargs for key in CachedPlotHexbin.HEXBIN_ONLY_KWARGS):
+            return False
+        self._result.set_offsets(self.polygon_offsets)
+        self._result.set_array(self.bin_values)
+        self._result.set_alpha(self.bin_alphas) # type: ignore[arg-type]
+        _rescale_colours(self._result, self.min_value, self.max_value, kwargs)
+        return True
+    def __render_with_hexbin(self, axis: Axes, **kwargs: Any) -> None:
         self._result = axis.hexbin(
             x = self.polygon_offsets[:, 0],
             y = self.polygon_offsets[:, 1],
             C = self.bin_values,
             gridsize = self.gridsize,
-            cmap = self.colourmap,
-            vmin = self.min_value,
-            vmax = self.max_value,
+            cmap = kwargs.pop("cmap", self.colourmap),
+            vmin = kwargs.pop("vmin", self.min_value),
+            vmax = kwargs.pop("vmax", self.max_value),
             edgecolor = self.edgecolour,
             extent = self.extent.extent,
             **kwargs
@@ -220,7 +520,9 @@ class CachedPlotColourbar(CachedPlotElement[Colorbar]):
     tick_label_font = AutoProperty_NonNullable[CachedPlotFontInfo]()
     def __init__(self, **kwargs):
         super().__init__("target_element", "target_plot", "label", "add_to_axis", "location", "orientation", "extend", "label_font", "tick_label_font", **kwargs)
+        self.default_font = CachedPlotFontInfo()
         self.label_font = CachedPlotFontInfo()
+        self.tick_label_font = CachedPlotFontInfo()
     def render(self, figure: Figure, axis: Axes, target: ScalarMappable|ColorizingArtist, default_font: CachedPlotFontInfo, *args: Any, **kwargs: Any) -> None:
         """
         Render the element on the given figure and axis, using the target element.
@@ -246,11 +548,14 @@ class CachedPlotColourbar(CachedPlotElement[Colorbar]):
         self._result.ax.xaxis.label.set_fontproperties(self.label_font.with_default(self.default_font).with_default(default_font).fontproperties)
         self._result.ax.yaxis.label.set_fontproperties(self.label_font.with_default(self.default_font).with_default(default_font).fontproperties)
         tick_label_font = self.tick_label_font.with_default(self.default_font).with_default(default_font)
-        self._result.ax.tick_params(
-            labelsize       = tick_label_font.size,
-            labelcolor      = tick_label_font.color,
-            labelfontfamily = tick_label_font.family,
-        )
+        tick_label_font_kwargs = {}
+        if tick_label_font.size is not None:
+            tick_label_font_kwargs["labelsize"] = tick_label_font.size
+        if tick_label_font.colour is not None:
+            tick_label_font_kwargs["labelcolor"] = tick_label_font.colour
+        if tick_label_font.family is not None:
+            tick_label_font_kwargs["labelfontfamily"] = tick_label_font.family
+        self._result.ax.tick_params(**tick_label_font_kwargs)
 
 class CachedPlotContour(CachedPlotElement[QuadContourSet]):
     x                     = AutoProperty            [np.ndarray[tuple[int], np.dtype[np.floating]]]()
@@ -269,6 +574,8 @@ class CachedPlotContour(CachedPlotElement[QuadContourSet]):
     def __init__(self, **kwargs):
         self.font = CachedPlotFontInfo()
         super().__init__("x", "y", "extent", "z", "levels", "linewidths", "linestyles", "alpha_values", "colours", "labeled_level_indexes", "label_positions", "label_format", "font", **kwargs)
+    def get_artist_count(self) -> int:
+        return self.z.size
     def render(self, figure: Figure, axis: Axes, default_font: CachedPlotFontInfo, *args: Any, **kwargs: Any) -> None:
         if sum([self.x is not None, self.y is not None]) == 1:
             raise ValueError("Both x and y must be provided together or not at all.")
@@ -318,8 +625,9 @@ class CachedPlotImage(CachedPlotElement[AxesImage]):
     min_colour_value = AutoProperty[float](allow_uninitialised = True)
     max_colour_value = AutoProperty[float](allow_uninitialised = True)
     alpha = AutoProperty[np.ndarray[tuple[int, int], np.dtype[np.floating]]](allow_uninitialised = True)
+    _IN_PLACE_ATTRIBUTES = ("image", "extent", "min_colour_value", "max_colour_value", "alpha")
     def __init__(self, **kwargs):
-        super().__init__("image", "extent", "origin", "colourmap", "alpha", **kwargs)
+        super().__init__("image", "extent", "origin", "colourmap", "min_colour_value", "max_colour_value", "alpha", **kwargs)
     def render(self, figure: Figure, axis: Axes, default_font: CachedPlotFontInfo, *args: Any, **kwargs: Any):
         self._result = axis.imshow(
             self.image,
@@ -331,6 +639,12 @@ class CachedPlotImage(CachedPlotElement[AxesImage]):
             alpha = self.alpha,
             **kwargs
         )
+    def _update_result_data(self, figure: Figure, axis: Axes, *args: Any, **kwargs: Any) -> bool:
+        self._result.set_data(self.image)
+        self._result.set_extent(self.extent.extent)
+        self._result.set_alpha(self.alpha)
+        _rescale_colours(self._result, self.min_colour_value, self.max_colour_value, kwargs)
+        return True
     @staticmethod
     def from_image(image: AxesImage) -> "CachedPlotImage":
         return CachedPlotImage(
@@ -1,6 +1,7 @@
 from ..Data._Rect import Rect
 from ._CachedPlot import CachedPlot
 from ..IO.Caching._CacheTarget import CacheTarget
+from ..IO.Caching._CacheDependencies import CacheDependencies
 
 class CachedPlotFactory(object):
     def __init__(self, cache_directory: str) -> None:
@@ -12,5 +13,8 @@ class CachedPlotFactory(object):
     def load(self, target: CacheTarget) -> CachedPlot:
         return target.load_object(self.__cache_directory, CachedPlot)
 
-    def save(self, plot: CachedPlot, target: CacheTarget) -> None:
-        target.save_object(self.__cache_directory, plot)
+    def save(self, plot: CachedPlot, target: CacheTarget, dependencies: CacheDependencies|None = None) -> None:
+        target.save_object(self.__cache_directory, plot, dependencies)
+
+    def check_fresh(self, target: CacheTarget, dependencies: CacheDependencies|None = None) -> bool:
+        return target.check_exists(self.__cache_directory, check_fresh = True, dependencies = dependencies)
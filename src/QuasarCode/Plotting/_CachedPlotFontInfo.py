@@ -1,12 +1,74 @@
-from typing import Sequence, Literal
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable, Sequence, Literal
 
 from matplotlib.font_manager import FontProperties
 from matplotlib.typing import ColorType
+import numpy as np
 
 from ..Tools._Struct import CacheableStruct
 from ..Tools._autoproperty import AutoProperty
 
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(_freeze(item) for item in value)
+    hash(value)
+    return value
+
+class _FontInterning(object):
+    """
+    Bounded least-recently-used tables of font objects shared between all CachedPlotFontInfo instances, keyed by value.
+    """
+    def __init__(self, maximum_size: int) -> None:
+        self.maximum_size = maximum_size
+        self.__lock = Lock()
+        self.__merged: OrderedDict[tuple[Hashable, Hashable], "CachedPlotFontInfo"] = OrderedDict()
+        self.__fontproperties: OrderedDict[Hashable, FontProperties] = OrderedDict()
+        self.__fontdicts: OrderedDict[Hashable, dict[str, object]] = OrderedDict()
+    def __get(self, table: OrderedDict, key: Hashable) -> Any:
+        with self.__lock:
+            value = table.get(key, None)
+            if value is not None:
+                table.move_to_end(key)
+            return value
+    def __set(self, table: OrderedDict, key: Hashable, value: Any) -> None:
+        with self.__lock:
+            table[key] = value
+            while len(table) > self.maximum_size:
+                table.popitem(last = False)
+    def get_merged(self, key: tuple[Hashable, Hashable]) -> "CachedPlotFontInfo|None":
+        return self.__get(self.__merged, key)
+    def set_merged(self, key: tuple[Hashable, Hashable], font: "CachedPlotFontInfo") -> None:
+        self.__set(self.__merged, key, font)
+    def discard_merged(self, font: "CachedPlotFontInfo") -> None:
+        with self.__lock:
+            for key in [key for key, value in self.__merged.items() if value is font]:
+                del self.__merged[key]
+    def get_fontproperties(self, key: Hashable) -> FontProperties|None:
+        return self.__get(self.__fontproperties, key)
+    def set_fontproperties(self, key: Hashable, font_properties: FontProperties) -> None:
+        self.__set(self.__fontproperties, key, font_properties)
+    def get_fontdict(self, key: Hashable) -> dict[str, object]|None:
+        return self.__get(self.__fontdicts, key)
+    def set_fontdict(self, key: Hashable, fontdict: dict[str, object]) -> None:
+        self.__set(self.__fontdicts, key, fontdict)
+    def clear(self) -> None:
+        with self.__lock:
+            self.__merged.clear()
+            self.__fontproperties.clear()
+            self.__fontdicts.clear()
+
 class CachedPlotFontInfo(CacheableStruct):
+    """
+    Font settings for plot text. Unset values are inherited from a default font (see `with_default`).
+
+    Merged fonts (from `with_default`) and the `fontproperties` and `fontdict` for each unique set of values are
+    shared between all instances, so font resolution happens once per unique font across any number of figures.
+    Fonts returned by `with_default` may therefore be shared - modifying one removes it from the shared tables.
+    """
+    _interning = _FontInterning(maximum_size = 1024)
+    _SETATTR_ONLY_TRACKS_CHANGES = True # New fonts are not yet interned, so loading can assign attributes directly (see CacheableStruct)
+
     size    = AutoProperty[float|Literal["xx-small","x-small","small","medium","large","x-large","xx-large"]](allow_uninitialised = True) # Matplotlib default is 10.0
     family  = AutoProperty[Sequence[str]](allow_uninitialised = True)
     style   = AutoProperty[str          ](allow_uninitialised = True)
@@ -20,6 +82,43 @@ class CachedPlotFontInfo(CacheableStruct):
             **kwargs
         )
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            self.__invalidate()
+
+    def __delattr__(self, name: str) -> None:
+        super().__delattr__(name)
+        if not name.startswith("_"):
+            self.__invalidate()
+
+    def __invalidate(self) -> None:
+        if self.__dict__.get("_CachedPlotFontInfo__value_key", None) is not None:
+            self.__value_key = None
+        if self.__dict__.get("_CachedPlotFontInfo__interned", False):
+            self.__interned = False
+            CachedPlotFontInfo._interning.discard_merged(self)
+
+    def _get_value_key(self) -> Hashable|None:
+        """
+        Get a hashable representation of the font's values (None if any value is unhashable).
+        """
+        key = self.__dict__.get("_CachedPlotFontInfo__value_key", None)
+        if key is None:
+            try:
+                key = _freeze((self.size, self.family, self.style, self.variant, self.weight, self.stretch, self.colour))
+            except TypeError:
+                return None
+            self.__value_key = key
+        return key
+
+    @staticmethod
+    def clear_interned() -> None:
+        """
+        Clear the shared tables of merged fonts and font properties.
+        """
+        CachedPlotFontInfo._interning.clear()
+
     @staticmethod
     def from_font_properties(font_properties: FontProperties) -> "CachedPlotFontInfo":
         instance = CachedPlotFontInfo()
@@ -33,6 +132,16 @@ class CachedPlotFontInfo(CacheableStruct):
 
     @property
     def fontdict(self) -> dict[str, object]:
+        key = self._get_value_key()
+        if key is not None:
+            fontdict = CachedPlotFontInfo._interning.get_fontdict(key)
+            if fontdict is None:
+                fontdict = self.__create_fontdict()
+                CachedPlotFontInfo._interning.set_fontdict(key, fontdict)
+            return dict(fontdict)
+        return self.__create_fontdict()
+
+    def __create_fontdict(self) -> dict[str, object]:
         fontdict = {}
         if self.size is not None:
             fontdict["fontsize"] = self.size
@@ -50,6 +159,17 @@ class CachedPlotFontInfo(CacheableStruct):
 
     @property
     def fontproperties(self) -> FontProperties:
+        key = self._get_value_key()
+        if key is not None:
+            font_properties = CachedPlotFontInfo._interning.get_fontproperties(key)
+            if font_properties is None:
+                font_properties = self.__create_fontproperties()
+                CachedPlotFontInfo._interning.set_fontproperties(key, font_properties)
+            # Copied as matplotlib objects may modify the properties they are given
+            return font_properties.copy()
+        return self.__create_fontproperties()
+
+    def __create_fontproperties(self) -> FontProperties:
         kwargs = {}
         if self.size is not None:
             kwargs["size"] = self.size
@@ -86,8 +206,21 @@ class CachedPlotFontInfo(CacheableStruct):
     
     def with_default(self, default: "CachedPlotFontInfo|None") -> "CachedPlotFontInfo":
         """
-        Return a new instance using the default values specified (where there are any).
+        Return an instance using the default values specified (where there are any).
+        The result is shared with other calls for fonts with the same values.
         """
+        key = self._get_value_key()
+        default_key = default._get_value_key() if default is not None else None
+        if key is None or (default is not None and default_key is None):
+            return self.__merge(default)
+        instance = CachedPlotFontInfo._interning.get_merged((key, default_key))
+        if instance is None:
+            instance = self.__merge(default)
+            instance.__interned = True
+            CachedPlotFontInfo._interning.set_merged((key, default_key), instance)
+        return instance
+
+    def __merge(self, default: "CachedPlotFontInfo|None") -> "CachedPlotFontInfo":
         if default is None:
             return self.copy()
         instance = default.copy()
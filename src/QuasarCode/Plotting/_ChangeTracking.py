@@ -0,0 +1,50 @@
+from typing import Any
+
+class ChangeTracking(object):
+    """
+    Records when a public attribute is assigned so that rendered output can be updated incrementally.
+
+    Changes made in-place (such as to the contents of an array or to a font object) are not detected.
+    Call `mark_changed` after making them.
+    """
+
+    _SETATTR_ONLY_TRACKS_CHANGES = True # Loading from a cache can assign attributes directly (see CacheableStruct)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            changed_attributes = self.__dict__.get("_ChangeTracking__changed_attributes", None)
+            if not self.__dict__.get("_ChangeTracking__changed", True):
+                self.__changed_attributes = { name }
+            elif changed_attributes is not None:
+                changed_attributes.add(name)
+            self.__changed = True
+
+    @property
+    def changed(self) -> bool:
+        """
+        bool -> Has a public attribute been assigned since the object was last rendered?
+        """
+        return self.__dict__.get("_ChangeTracking__changed", True)
+
+    @property
+    def changed_attributes(self) -> frozenset[str]|None:
+        """
+        frozenset[str]|None -> The names of the attributes assigned since the object was last rendered.
+                               None if this is unknown (the object has not been rendered or `mark_changed` was called).
+        """
+        if not self.changed:
+            return frozenset()
+        changed_attributes = self.__dict__.get("_ChangeTracking__changed_attributes", None)
+        return frozenset(changed_attributes) if changed_attributes is not None else None
+
+    def mark_changed(self) -> None:
+        """
+        Flag the object as needing to be rendered again.
+        """
+        self.__changed = True
+        self.__changed_attributes = None
+
+    def _mark_rendered(self) -> None:
+        self.__changed = False
+        self.__changed_attributes = set()
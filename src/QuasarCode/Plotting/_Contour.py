@@ -1,3 +1,4 @@
+import math
 from typing import TYPE_CHECKING, Literal
 
 from matplotlib.axes import Axes
@@ -7,9 +8,11 @@ from matplotlib.typing import ColorType
 import numpy as np
 from matplotlib import pyplot as plt
 from matplotlib.contour import QuadContourSet
+from scipy.signal import fftconvolve
 
 from ..Data._Rect import Rect
 from ._CachedPlotElements import CachedPlotContour
+from ._HistogramAccumulator import HistogramAccumulator2D
 
 class Contour(object):
 
@@ -138,7 +141,151 @@ class Contour(object):
             raise ValueError(f"Contour level {level} not found.")
         self.__cache_object.alpha_values = self.contour_alphas
 
-    def generate(self, gridsize = int|tuple[int,int], extent: Rect|None = None, **kwargs) -> None:
+    @staticmethod
+    def mass_fraction_for_sigma(sigma: float, two_dimensional: bool = True) -> float:
+        """
+        Get the fraction of the mass of a Gaussian distribution enclosed within a number of standard deviations.
+
+        Parameters:
+            float sigma:
+                The number of standard deviations.
+            bool two_dimensional:
+                Use the fraction enclosed by the contour of a 2D Gaussian (e.g. 39.3% for 1 sigma).
+                If False, the 1D fraction is used instead (e.g. 68.3% for 1 sigma).
+
+        Returns:
+            float -> The enclosed fraction.
+        """
+        return 1 - math.exp(-sigma**2 / 2) if two_dimensional else math.erf(sigma / math.sqrt(2))
+
+    @staticmethod
+    def levels_enclosing_mass(grid: np.ndarray, *fractions: float) -> tuple[float, ...]:
+        """
+        Calculate the levels of contours enclosing given fractions of the total of a grid of (non-negative) values.
+
+        The grid is sorted by value and accumulated from the highest value down, so the cost depends only on the
+        size of the grid (O(G log G)) and not on the number of data points binned to produce it.
+
+        Parameters:
+            np.ndarray grid:
+                The binned values (e.g. the `levels` of a Contour).
+            (args) float fractions:
+                The fractions of the total to enclose (between 0 and 1).
+
+        Returns:
+            tuple[float, ...] -> The level for each fraction, in the order given.
+        """
+        values = np.sort(np.asarray(grid, dtype = np.float64).ravel())[::-1]
+        values = values[np.isfinite(values)]
+        cumulative = np.cumsum(values)
+        if len(cumulative) == 0 or cumulative[-1] <= 0:
+            raise ValueError("Unable to calculate levels for a grid with no positive values.")
+        cumulative /= cumulative[-1]
+        levels = []
+        for fraction in fractions:
+            if not 0 < fraction <= 1:
+                raise ValueError(f"Enclosed fraction {fraction} is not in the range (0, 1].")
+            levels.append(float(values[min(int(np.searchsorted(cumulative, fraction)), len(values) - 1)]))
+        return tuple(levels)
+
+    def get_levels_enclosing_mass(self, *fractions: float) -> tuple[float, ...]:
+        """
+        Calculate the levels of contours enclosing given fractions of the total of the generated grid.
+        See `levels_enclosing_mass`.
+        """
+        if not self.__can_plot:
+            raise RuntimeError("Cannot calculate levels before calling \"generate\".")
+        return Contour.levels_enclosing_mass(self.__levels, *fractions)
+
+    def add_contours_enclosing_mass(self, *fractions: float) -> tuple[float, ...]:
+        """
+        Add contours enclosing given fractions of the total of the generated grid (see `levels_enclosing_mass`).
+        Use `mass_fraction_for_sigma` to get the fractions for a number of standard deviations.
+
+        Returns:
+            tuple[float, ...] -> The levels added, in the order given.
+        """
+        levels = self.get_levels_enclosing_mass(*fractions)
+        self.add_contours(*levels)
+        return levels
+
+    @staticmethod
+    def __gaussian_kernel(sigma_x: float, sigma_y: float, truncate: float = 4.0) -> np.ndarray[tuple[int, int], np.dtype[np.float64]]:
+        # Separable Gaussian kernel (in units of bins), indexed as [y, x]
+        def kernel_1d(sigma: float) -> np.ndarray:
+            if sigma <= 0:
+                return np.ones(1)
+            radius = max(1, int(math.ceil(truncate * sigma)))
+            offsets = np.arange(-radius, radius + 1)
+            kernel = np.exp(-0.5 * (offsets / sigma)**2)
+            return kernel / kernel.sum()
+        return np.outer(kernel_1d(sigma_y), kernel_1d(sigma_x))
+
+    @staticmethod
+    def smooth(grid: np.ndarray[tuple[int, int], np.dtype[np.floating]], bandwidth: tuple[float, float], adaptive: bool = False, bandwidth_classes: int = 8) -> np.ndarray[tuple[int, int], np.dtype[np.float64]]:
+        """
+        Smooth a grid of binned values with a Gaussian kernel using FFT convolution.
+
+        With `adaptive` set, the bandwidth varies across the grid (Abramson's method): a pilot estimate is made using
+        the fixed bandwidth, then the value in each bin is spread with a bandwidth scaled by the inverse square root of
+        the pilot density relative to its geometric mean (clipped to between 1/4 and 4 times the fixed bandwidth).
+        This keeps dense peaks sharp while smoothing sparse outskirts more heavily. The bins are grouped into
+        `bandwidth_classes` logarithmically spaced bandwidths, with one convolution for each.
+
+        Parameters:
+            np.ndarray[(Ny, Nx), float] grid:
+                The binned values, indexed as [y, x].
+            tuple[float, float] bandwidth:
+                The standard deviation of the kernel along x and y, in units of bins.
+            bool adaptive:
+                Vary the bandwidth with the local density.
+            int bandwidth_classes:
+                The number of distinct bandwidths used when `adaptive` is set.
+
+        Returns:
+            np.ndarray[(Ny, Nx), float] -> The smoothed values.
+        """
+        grid = np.asarray(grid, dtype = np.float64)
+        pilot = np.maximum(fftconvolve(grid, Contour.__gaussian_kernel(*bandwidth), mode = "same"), 0)
+        if not adaptive:
+            return pilot
+        occupied = (grid != 0) & (pilot > 0)
+        if not np.any(occupied):
+            return pilot
+        log_pilot = np.log(pilot[occupied])
+        scale = np.clip(np.exp(-0.5 * (log_pilot - log_pilot.mean())), 0.25, 4.0)
+        class_scales = np.geomspace(scale.min(), scale.max(), bandwidth_classes) if scale.max() > scale.min() else scale[:1]
+        classes = np.abs(np.log(scale)[:, None] - np.log(class_scales)[None, :]).argmin(axis = 1)
+        occupied_values = grid[occupied]
+        smoothed = np.zeros_like(grid)
+        for class_index, class_scale in enumerate(class_scales):
+            selected = classes == class_index
+            if not np.any(selected):
+                continue
+            class_grid = np.zeros_like(grid)
+            class_grid[occupied] = np.where(selected, occupied_values, 0)
+            smoothed += fftconvolve(class_grid, Contour.__gaussian_kernel(bandwidth[0] * class_scale, bandwidth[1] * class_scale), mode = "same")
+        return np.maximum(smoothed, 0)
+
+    def generate(self, gridsize: int|tuple[int, int], extent: Rect|None = None, smoothing: float|tuple[float, float]|Literal["scott"]|None = None, adaptive: bool = False, density: bool = False, **kwargs) -> None:
+        """
+        Bin the data and calculate the grid of values to contour.
+
+        Parameters:
+            int|tuple[int, int] gridsize:
+                The number of bins (along each axis).
+            Rect|None extent:
+                The region to bin. Defaults to the range of the data.
+            float|tuple[float, float]|str|None smoothing:
+                Smooth the binned values with a Gaussian kernel (see `smooth`), with this standard deviation in data
+                units (for each axis). Use "scott" to estimate the bandwidth from the (unweighted) data using Scott's rule
+                (which is the same as Silverman's rule in two dimensions).
+                Smoothing allows a coarse grid to be used without producing noisy contours.
+            bool adaptive:
+                Vary the smoothing bandwidth with the local density.
+            bool density:
+                Normalise the grid to a probability density (integrating to 1 over the grid).
+        """
         if not self.__can_compute:
             raise RuntimeError("Cannot compute contours after resources have been released.")
 
@@ -149,11 +296,72 @@ class Contour(object):
             bins = gridsize,
             range = extent.range if extent is not None else None
         )
+        if isinstance(smoothing, str):
+            if smoothing != "scott":
+                raise ValueError(f"Unknown bandwidth rule \"{smoothing}\". Valid options are: scott.")
+            factor = len(self.__x_data) ** (-1 / 6)
+            smoothing = (factor * float(np.std(self.__x_data)), factor * float(np.std(self.__y_data)))
+        self.__set_grid(hist.T, bin_x, bin_y, bin_x[:-1] + (bin_x[1] - bin_x[0]) / 2, bin_y[:-1] + (bin_y[1] - bin_y[0]) / 2, smoothing, adaptive, density)
+
+    @staticmethod
+    def from_accumulator(accumulator: HistogramAccumulator2D, smoothing: float|tuple[float, float]|Literal["scott"]|None = None, adaptive: bool = False, density: bool = False) -> "Contour":
+        """
+        Create contours from a histogram accumulated incrementally (for data too large to hold in memory).
+        The grid is created immediately, so `generate` need not (and can not) be called.
+
+        Parameters:
+            HistogramAccumulator2D accumulator:
+                The accumulated histogram.
+            float|tuple[float, float]|str|None smoothing:
+                The standard deviation of the smoothing kernel in data units (see `generate`).
+                Bins are assumed to be evenly spaced. For "scott", the spread of the data is estimated from the histogram.
+            bool adaptive:
+                Vary the smoothing bandwidth with the local density.
+            bool density:
+                Normalise the grid to a probability density.
+
+        Returns:
+            Contour -> The contours (with no contour levels set).
+        """
+        instance = Contour(np.empty(0), np.empty(0))
+        instance.release_resources()
+        hist = accumulator.values
+        if isinstance(smoothing, str):
+            if smoothing != "scott":
+                raise ValueError(f"Unknown bandwidth rule \"{smoothing}\". Valid options are: scott.")
+            total = hist.sum()
+            if total <= 0:
+                raise ValueError("Unable to estimate a bandwidth for an empty histogram.")
+            x_weights = hist.sum(axis = 0) / total
+            y_weights = hist.sum(axis = 1) / total
+            x_centres = accumulator.x_bins.centres
+            y_centres = accumulator.y_bins.centres
+            factor = (accumulator.number_of_points - accumulator.number_outside) ** (-1 / 6)
+            smoothing = (
+                factor * math.sqrt(float(np.sum(x_weights * (x_centres - np.sum(x_weights * x_centres))**2))),
+                factor * math.sqrt(float(np.sum(y_weights * (y_centres - np.sum(y_weights * y_centres))**2)))
+            )
+        instance.__set_grid(hist.copy(), accumulator.x_bins.edges, accumulator.y_bins.edges, accumulator.x_bins.centres, accumulator.y_bins.centres, smoothing, adaptive, density)
+        return instance
+
+    def __set_grid(self, hist: np.ndarray, bin_x: np.ndarray, bin_y: np.ndarray, x_bin_locations: np.ndarray, y_bin_locations: np.ndarray, smoothing: float|tuple[float, float]|None, adaptive: bool, density: bool) -> None:
+        bin_width = (bin_x[-1] - bin_x[0]) / (len(bin_x) - 1)
+        bin_height = (bin_y[-1] - bin_y[0]) / (len(bin_y) - 1)
+
+        if smoothing is not None:
+            if not isinstance(smoothing, tuple):
+                smoothing = (smoothing, smoothing)
+            hist = Contour.smooth(hist, (smoothing[0] / bin_width, smoothing[1] / bin_height), adaptive = adaptive)
+
+        if density:
+            total = hist.sum()
+            if total > 0:
+                hist = hist / (total * np.outer(np.diff(bin_y), np.diff(bin_x)))
 
-        self.__levels = hist.T
+        self.__levels = hist
 
-        self.__x_bin_locations = bin_x[:-1] + (bin_x[1] - bin_x[0]) / 2
-        self.__y_bin_locations = bin_y[:-1] + (bin_y[1] - bin_y[0]) / 2
+        self.__x_bin_locations = x_bin_locations
+        self.__y_bin_locations = y_bin_locations
 
         self.__can_plot = True
 
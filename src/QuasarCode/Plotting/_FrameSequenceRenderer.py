@@ -0,0 +1,255 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+import os
+import shutil
+import subprocess
+from typing import Any, Iterable, Mapping
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import numpy as np
+from PIL import Image
+
+from ..IO.Caching._hashing import hash_cache_data
+from ..Tools._Struct import CacheableStruct
+from ._CachedFigureGrid import CachedFigureGrid
+from ._CachedPlot import CachedPlot
+
+class FrameSequenceRenderer(object):
+    """
+    Render a sequence of frames (such as for an animation) that share the layout of a template figure.
+
+    The template figure is rendered once. For each frame, attributes that differ from those of the template are
+    copied to the template's plots and elements, and the figure is updated (see `CachedFigureGrid.update`).
+    Where only the data of an element has changed, its existing artists are updated in-place, so the axes, ticks,
+    colourbars and legends are not re-created. The layout is computed for the first frame only.
+
+    Colour scales are recalculated for each frame unless limits are set on the elements (e.g. `min_value`).
+
+    Parameters:
+        CachedFigureGrid figure_grid:
+            The template figure. It should be headless (`use_pyplot` set to False) or use a backend based on Agg.
+        dict[str, Any]|None render_kwargs:
+            Keyword arguments to pass to `CachedFigureGrid.update` (`forward_kwargs` and `forward_colourbar_kwargs`).
+        float|None dpi:
+            The resolution of the frames. Defaults to the figure's `resolution_for_files` (or `resolution` if unset).
+    """
+
+    def __init__(self, figure_grid: CachedFigureGrid, render_kwargs: dict[str, Any]|None = None, dpi: float|None = None) -> None:
+        self.__figure_grid: CachedFigureGrid = figure_grid
+        self.__render_kwargs: dict[str, Any] = render_kwargs if render_kwargs is not None else {}
+        self.__dpi: float = dpi if dpi is not None else figure_grid.resolution_for_files if figure_grid.resolution_for_files is not None else figure_grid.resolution
+        self.__canvas: FigureCanvasAgg|None = None
+        self.__layout_engine: Any = None
+        self.__number_of_frames: int = 0
+
+    @property
+    def figure_grid(self) -> CachedFigureGrid:
+        """
+        CachedFigureGrid -> The template figure.
+        """
+        return self.__figure_grid
+
+    @property
+    def number_of_frames(self) -> int:
+        """
+        int -> The number of frames rendered so far.
+        """
+        return self.__number_of_frames
+
+    def render_frame(self, frame: CachedFigureGrid|Mapping[str, CachedPlot]|None = None) -> np.ndarray[tuple[int, int, int], np.dtype[np.uint8]]:
+        """
+        Render a frame.
+
+        Parameters:
+            CachedFigureGrid|Mapping[str, CachedPlot]|None frame:
+                The frame's plots (keyed by plot tag) or a figure containing them (only the figure's plots, colourbars
+                and custom legends are used - the layout is that of the template). If None, the template figure is
+                rendered as it is (e.g. after being modified directly).
+
+        Returns:
+            np.ndarray[(height, width, 4), uint8] -> The RGBA pixels of the frame.
+            This is a view of the figure's buffer, so is only valid until the next frame is rendered.
+        """
+        if frame is not None:
+            if isinstance(frame, CachedFigureGrid):
+                FrameSequenceRenderer.__sync_dict(self.__figure_grid, "plots", frame.plots)
+                FrameSequenceRenderer.__sync_dict(self.__figure_grid, "colourbars", frame.colourbars)
+                FrameSequenceRenderer.__sync_dict(self.__figure_grid, "custom_legends", frame.custom_legends)
+            else:
+                FrameSequenceRenderer.__sync_dict(self.__figure_grid, "plots", dict(frame))
+        if self.__canvas is None:
+            self.__canvas = self.__get_canvas()
+        self.__figure_grid.update(**self.__render_kwargs)
+        self.__canvas.draw()
+        if self.__number_of_frames == 0:
+            # Keep the layout of the first frame
+            self.__layout_engine = self.__figure_grid.figure.get_layout_engine()
+            if self.__layout_engine is not None:
+                self.__figure_grid.figure.set_layout_engine("none")
+        self.__number_of_frames += 1
+        return np.asarray(self.__canvas.buffer_rgba())
+
+    def close(self) -> None:
+        """
+        Restore the figure's layout engine. Called automatically at the end of `write_video` and `write_png_sequence`.
+        """
+        if self.__layout_engine is not None:
+            self.__figure_grid.figure.set_layout_engine(self.__layout_engine)
+            self.__layout_engine = None
+
+    def write_video(self, frames: Iterable[CachedFigureGrid|Mapping[str, CachedPlot]|None], filepath: str, fps: float = 30, codec: str = "libx264", pixel_format: str = "yuv420p", ffmpeg_path: str = "ffmpeg", ffmpeg_args: Iterable[str] = ()) -> int:
+        """
+        Render a sequence of frames, piping the pixels directly to ffmpeg.
+
+        Parameters:
+            Iterable[CachedFigureGrid|Mapping[str, CachedPlot]|None] frames:
+                The frames to render (see `render_frame`). These may be loaded lazily, for example using a generator.
+            str filepath:
+                The video file to create.
+            float fps:
+                The number of frames per second.
+            str codec:
+                The video codec used by ffmpeg.
+            str pixel_format:
+                The pixel format of the video. Frames are padded to an even size for YUV formats.
+            str ffmpeg_path:
+                The ffmpeg executable.
+            Iterable[str] ffmpeg_args:
+                Additional arguments for ffmpeg (placed before the output file).
+
+        Returns:
+            int -> The number of frames written.
+        """
+        if shutil.which(ffmpeg_path) is None:
+            raise FileNotFoundError(f"Unable to locate the ffmpeg executable \"{ffmpeg_path}\".")
+        process: subprocess.Popen|None = None
+        number_of_frames = 0
+        try:
+            for frame in frames:
+                pixels = self.render_frame(frame)
+                if process is None:
+                    height, width = pixels.shape[:2]
+                    process = subprocess.Popen(
+                        [
+                            ffmpeg_path, "-y", "-loglevel", "error",
+                            "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+                            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-c:v", codec, "-pix_fmt", pixel_format,
+                            *ffmpeg_args, filepath
+                        ],
+                        stdin = subprocess.PIPE
+                    )
+                elif pixels.shape[:2] != (height, width):
+                    raise ValueError(f"Frame {number_of_frames} has a different size to the first frame.")
+                process.stdin.write(pixels.data) # type: ignore[union-attr]
+                number_of_frames += 1
+        finally:
+            self.close()
+            if process is not None:
+                process.stdin.close() # type: ignore[union-attr]
+                return_code = process.wait()
+        if process is not None and return_code != 0:
+            raise RuntimeError(f"ffmpeg exited with code {return_code}.")
+        return number_of_frames
+
+    def write_png_sequence(self, frames: Iterable[CachedFigureGrid|Mapping[str, CachedPlot]|None], filename_template: str = "frame_{:05d}.png", directory: str|None = None, max_workers: int|None = None, compress_level: int = 6) -> list[str]:
+        """
+        Render a sequence of frames to PNG files.
+        The files are encoded and written by a pool of threads while the following frames are rendered.
+
+        Parameters:
+            Iterable[CachedFigureGrid|Mapping[str, CachedPlot]|None] frames:
+                The frames to render (see `render_frame`). These may be loaded lazily, for example using a generator.
+            str filename_template:
+                Template for the name of each file, formatted with the frame number (starting from 0).
+            str|None directory:
+                The directory in which to create the files.
+            int|None max_workers:
+                The number of threads used to write files. Defaults to the number of CPUs (at most 8).
+            int compress_level:
+                The zlib compression level of the files (0-9). Lower levels are faster to write.
+
+        Returns:
+            list[str] -> The paths of the files written.
+        """
+        if max_workers is None:
+            max_workers = min(8, os.cpu_count() or 1)
+        def write(pixels: np.ndarray, filepath: str) -> None:
+            Image.fromarray(pixels).save(filepath, format = "png", compress_level = compress_level)
+        filepaths: list[str] = []
+        pending: deque[Future] = deque()
+        try:
+            with ThreadPoolExecutor(max_workers = max_workers) as executor:
+                for frame_number, frame in enumerate(frames):
+                    filepath = filename_template.format(frame_number)
+                    if directory is not None:
+                        filepath = os.path.join(directory, filepath)
+                    # The buffer is reused by the next frame, so a copy is passed to the writer
+                    pending.append(executor.submit(write, self.render_frame(frame).copy(), filepath))
+                    filepaths.append(filepath)
+                    # Limit the number of frames held in memory
+                    while len(pending) > 2 * max_workers:
+                        pending.popleft().result()
+                while len(pending) > 0:
+                    pending.popleft().result()
+        finally:
+            self.close()
+        return filepaths
+
+    def __get_canvas(self) -> FigureCanvasAgg:
+        try:
+            figure = self.__figure_grid.figure
+        except RuntimeError:
+            figure, _ = self.__figure_grid.make_figure_and_axes()
+        if not isinstance(figure.canvas, FigureCanvasAgg):
+            raise TypeError("Frames can only be rendered for figures using an Agg based canvas. Set `use_pyplot` to False on the figure to create one.")
+        figure.dpi = self.__dpi
+        return figure.canvas
+
+    @staticmethod
+    def __sync_dict(owner: CacheableStruct, attribute_name: str, new_values: dict[str, Any]) -> None:
+        current_values = getattr(owner, attribute_name)
+        if current_values.keys() != new_values.keys():
+            setattr(owner, attribute_name, dict(new_values))
+            return
+        for key, value in new_values.items():
+            if type(value) is not type(current_values[key]) or not isinstance(value, CacheableStruct):
+                setattr(owner, attribute_name, dict(new_values))
+                return
+        for key, value in new_values.items():
+            FrameSequenceRenderer.__sync(current_values[key], value)
+
+    @staticmethod
+    def __sync(template: CacheableStruct, frame: CacheableStruct) -> None:
+        # Copy only the attributes that differ, so that unchanged parts of the figure are not rendered again
+        for attribute_name in template.cacheable_attributes:
+            try:
+                frame_value = getattr(frame, attribute_name)
+            except ValueError:
+                continue # Uninitialised
+            try:
+                template_value = getattr(template, attribute_name)
+            except ValueError:
+                setattr(template, attribute_name, frame_value)
+                continue
+            if isinstance(template_value, dict) and isinstance(frame_value, dict) and any(isinstance(value, CacheableStruct) for value in frame_value.values()):
+                FrameSequenceRenderer.__sync_dict(template, attribute_name, frame_value)
+            elif not FrameSequenceRenderer.__values_equal(template_value, frame_value):
+                setattr(template, attribute_name, frame_value)
+
+    @staticmethod
+    def __values_equal(a: Any, b: Any) -> bool:
+        if a is b:
+            return True
+        if type(a) is not type(b):
+            return False
+        if isinstance(a, np.ndarray):
+            return a.shape == b.shape and a.dtype == b.dtype and bool(np.array_equal(a, b, equal_nan = a.dtype.kind in "fc"))
+        if type(a).__eq__ is not object.__eq__:
+            # Prefer the type's own comparison (e.g. colour maps, whose pickled form changes once they are used)
+            try:
+                result = a == b
+            except (TypeError, ValueError):
+                result = NotImplemented # Ambiguous, such as sequences containing arrays
+            if isinstance(result, (bool, np.bool_)):
+                return bool(result)
+        return hash_cache_data(a) == hash_cache_data(b)
@@ -13,10 +13,12 @@ from ..Data._Rect import Rect
 from ._CachedPlotElements import CachedPlotHexbin
 
 COLOUR_FUNCTION_TYPE: TypeAlias = Callable[[float|None, float|None, float|None], Callable[[np.ndarray[tuple[int], np.dtype[np.integer]]], float]]
+VECTORISED_STATISTIC_TYPE: TypeAlias = Callable[[np.ndarray[tuple[int], np.dtype[np.integer]], np.ndarray[tuple[int], np.dtype[np.integer]], int], np.ndarray[tuple[int], np.dtype[np.floating]]]
 
 class Hexbin(object):
 
     COLOUR_FUNCTION_TYPE = COLOUR_FUNCTION_TYPE
+    VECTORISED_STATISTIC_TYPE = VECTORISED_STATISTIC_TYPE
     
     def __init__(
         self,
@@ -128,11 +130,55 @@ class Hexbin(object):
 
 
 
+    @staticmethod
+    def with_vectorised_statistic(vectorised_statistic: VECTORISED_STATISTIC_TYPE):
+        """
+        Attach an equivalent statistic that operates on all bins at once to a colour function.
+
+        The vectorised statistic takes the indices of the data elements, the index of the bin containing each
+        of these elements and the total number of bins, and returns the statistic for every bin (the values for
+        empty bins are ignored). Rectangular grid builders (such as `BinnedImage`) use this in place of calling
+        the colour function separately for each bin.
+
+        Apply this above `create_hexbin_colour_function` when decorating a statistic.
+        """
+        def attach_vectorised_statistic(colour_function: COLOUR_FUNCTION_TYPE) -> COLOUR_FUNCTION_TYPE:
+            colour_function.vectorised_statistic = vectorised_statistic # type: ignore[attr-defined]
+            return colour_function
+        return attach_vectorised_statistic
+
+
+
+    @staticmethod
+    def _binned_sum(data: np.ndarray|None, indices: np.ndarray, bin_indices: np.ndarray, number_of_bins: int) -> np.ndarray:
+        return np.bincount(bin_indices, weights = data[indices] if data is not None else None, minlength = number_of_bins)
+
+    @staticmethod
+    def _binned_percentile(data: np.ndarray, percentile: float, indices: np.ndarray, bin_indices: np.ndarray, number_of_bins: int) -> np.ndarray:
+        # Sort by bin then value and interpolate between the ranks either side of the percentile (matches np.percentile)
+        values = data[indices]
+        order = np.lexsort((values, bin_indices))
+        sorted_values = values[order]
+        counts = np.bincount(bin_indices, minlength = number_of_bins)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        result = np.full(number_of_bins, np.nan)
+        occupied = counts > 0
+        positions = (percentile / 100) * (counts[occupied] - 1)
+        lower = np.floor(positions).astype(np.int64)
+        upper = np.minimum(lower + 1, counts[occupied] - 1)
+        lower_values = sorted_values[starts[occupied] + lower]
+        upper_values = sorted_values[starts[occupied] + upper]
+        result[occupied] = lower_values + (positions - lower) * (upper_values - lower_values)
+        return result
+
+
+
     @staticmethod
     def create_hexbin_count():
         """
         Assign hexbin cell colour to the number of elements that fall within the bin.
         """
+        @Hexbin.with_vectorised_statistic(lambda indices, bin_indices, number_of_bins: Hexbin._binned_sum(None, indices, bin_indices, number_of_bins))
         @Hexbin.create_hexbin_colour_function
         def calculate_statistic_count(indices: np.ndarray, /) -> float:
             return len(indices)
@@ -145,6 +191,7 @@ class Hexbin(object):
         """
         Assign hexbin cell colour to the log_10 of the number of elements that fall within the bin.
         """
+        @Hexbin.with_vectorised_statistic(lambda indices, bin_indices, number_of_bins: np.log10(Hexbin._binned_sum(None, indices, bin_indices, number_of_bins)))
         @Hexbin.create_hexbin_colour_function
         def calculate_statistic_log10_count(indices: np.ndarray, /) -> float:
             return np.log10(len(indices))
@@ -157,6 +204,7 @@ class Hexbin(object):
         """
         Assign hexbin cell colour to the fraction of of elements that fall within the bin.
         """
+        @Hexbin.with_vectorised_statistic(lambda indices, bin_indices, number_of_bins: Hexbin._binned_sum(mask, indices, bin_indices, number_of_bins) / Hexbin._binned_sum(None, indices, bin_indices, number_of_bins))
         @Hexbin.create_hexbin_colour_function
         def calculate_statistic_fraction(indices: np.ndarray, /) -> float:
             return mask[indices].sum() / len(indices)
@@ -169,6 +217,7 @@ class Hexbin(object):
         """
         Assign hexbin cell colour to the fraction of of elements that fall within the bin.
         """
+        @Hexbin.with_vectorised_statistic(lambda indices, bin_indices, number_of_bins: Hexbin._binned_sum(np.where(mask, data, 0), indices, bin_indices, number_of_bins) / Hexbin._binned_sum(data, indices, bin_indices, number_of_bins))
         @Hexbin.create_hexbin_colour_function
         def calculate_statistic_quantity_fraction(indices: np.ndarray, /) -> float:
             subset = data[indices]
@@ -182,6 +231,7 @@ class Hexbin(object):
         """
         Assign hexbin cell colour to the sum of the elements from this dataset that fall within the bin.
         """
+        @Hexbin.with_vectorised_statistic(lambda indices, bin_indices, number_of_bins: Hexbin._binned_sum(data, indices, bin_indices, number_of_bins))
         @Hexbin.create_hexbin_colour_function
         def calculate_statistic_sum(indices: np.ndarray, /) -> float:
             return data[indices].sum()
@@ -194,6 +244,7 @@ class Hexbin(object):
         """
         Assign hexbin cell colour to the log_10 of the sum of the elements from this dataset that fall within the bin.
         """
+        @Hexbin.with_vectorised_statistic(lambda indices, bin_indices, number_of_bins: np.log10(Hexbin._binned_sum(data, indices, bin_indices, number_of_bins)))
         @Hexbin.create_hexbin_colour_function
         def calculate_statistic_log10_sum(indices: np.ndarray, /) -> float:
             return np.log10(data[indices].sum())
@@ -208,6 +259,7 @@ class Hexbin(object):
 
         Note, it is advised you use `create_hexbin_sum` and pass the `np.log10(data)` to it instead of using this function, unless retaining a second copy of the data array is problematic.
         """
+        @Hexbin.with_vectorised_statistic(lambda indices, bin_indices, number_of_bins: np.bincount(bin_indices, weights = np.log10(data[indices]), minlength = number_of_bins))
         @Hexbin.create_hexbin_colour_function
         def calculate_statistic_sum_log10(indices: np.ndarray, /) -> float:
             return np.log10(data[indices]).sum()
@@ -220,6 +272,7 @@ class Hexbin(object):
         """
         Assign hexbin cell colour to the mean of elements from this dataset that fall within the bin.
         """
+        @Hexbin.with_vectorised_statistic(lambda indices, bin_indices, number_of_bins: Hexbin._binned_sum(data, indices, bin_indices, number_of_bins) / Hexbin._binned_sum(None, indices, bin_indices, number_of_bins) + offset)
         @Hexbin.create_hexbin_colour_function
         def calculate_statistic_mean(indices: np.ndarray, /) -> float:
             return np.mean(data[indices]) + offset
@@ -232,6 +285,7 @@ class Hexbin(object):
         """
         Assign hexbin cell colour to the mean of elements from this dataset that fall within the bin.
         """
+        @Hexbin.with_vectorised_statistic(lambda indices, bin_indices, number_of_bins: np.log10(Hexbin._binned_sum(data, indices, bin_indices, number_of_bins) / Hexbin._binned_sum(None, indices, bin_indices, number_of_bins)) + offset)
         @Hexbin.create_hexbin_colour_function
         def calculate_statistic_log10_mean(indices: np.ndarray, /) -> float:
             return np.log10(np.mean(data[indices])) + offset
@@ -246,6 +300,7 @@ class Hexbin(object):
 
         Use the weights from an array of equal length.
         """
+        @Hexbin.with_vectorised_statistic(lambda indices, bin_indices, number_of_bins: Hexbin._binned_sum(data * weights, indices, bin_indices, number_of_bins) / Hexbin._binned_sum(weights, indices, bin_indices, number_of_bins) + offset)
         @Hexbin.create_hexbin_colour_function
         def calculate_statistic_weighted_mean(indices: np.ndarray, /) -> float:
             return np.average(data[indices], weights = weights[indices]) + offset
@@ -260,6 +315,7 @@ class Hexbin(object):
 
         Use the weights from an array of equal length.
         """
+        @Hexbin.with_vectorised_statistic(lambda indices, bin_indices, number_of_bins: np.log10(Hexbin._binned_sum(data * weights, indices, bin_indices, number_of_bins) / Hexbin._binned_sum(weights, indices, bin_indices, number_of_bins)) + offset)
         @Hexbin.create_hexbin_colour_function
         def calculate_statistic_log10_weighted_mean(indices: np.ndarray, /) -> float:
             return np.log10(np.average(data[indices], weights = weights[indices])) + offset
@@ -272,6 +328,7 @@ class Hexbin(object):
         """
         Assign hexbin cell colour to the median of elements from this dataset that fall within the bin.
         """
+        @Hexbin.with_vectorised_statistic(lambda indices, bin_indices, number_of_bins: Hexbin._binned_percentile(data, 50, indices, bin_indices, number_of_bins))
         @Hexbin.create_hexbin_colour_function
         def calculate_statistic_median(indices: np.ndarray, /) -> float:
             return np.median(data[indices])
@@ -284,6 +341,7 @@ class Hexbin(object):
         """
         Assign hexbin cell colour to the specified percentile of elements from this dataset that fall within the bin.
         """
+        @Hexbin.with_vectorised_statistic(lambda indices, bin_indices, number_of_bins: Hexbin._binned_percentile(data, percentile, indices, bin_indices, number_of_bins))
         @Hexbin.create_hexbin_colour_function
         def calculate_statistic_percentile(indices: np.ndarray, /) -> float:
             return np.percentile(data[indices], percentile)
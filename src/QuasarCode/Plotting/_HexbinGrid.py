@@ -0,0 +1,173 @@
+import math
+
+import numpy as np
+
+from ..Data._Rect import Rect
+
+class HexbinGrid(object):
+    """
+    The hexagonal lattice used by matplotlib's `hexbin` for a given extent and gridsize.
+
+    Cells are indexed in the same order as matplotlib uses internally: first the (nx + 1) x (ny + 1)
+    lattice of cells centred on integer grid coordinates, then the nx x ny lattice of cells offset by
+    half a cell in each direction.
+
+    Parameters:
+        Rect extent:
+            The region covered by the grid.
+        int|tuple[int, int] gridsize:
+            The number of hexagons in the x-direction, or a tuple of the number in the x and y directions.
+    """
+
+    def __init__(self, extent: Rect, gridsize: int|tuple[int, int]) -> None:
+        self.__extent: Rect = extent
+        self.__gridsize: int|tuple[int, int] = gridsize
+        if np.iterable(gridsize):
+            self.__nx, self.__ny = (int(v) for v in gridsize) # type: ignore[union-attr]
+        else:
+            self.__nx = int(gridsize) # type: ignore[arg-type]
+            self.__ny = int(self.__nx / math.sqrt(3))
+        x_min, x_max, y_min, y_max = extent.extent
+        # Replicate the padding used by matplotlib so that cell positions match exactly
+        padding = 1.e-9 * (x_max - x_min)
+        self.__x_min: float = x_min - padding
+        self.__y_min: float = y_min
+        self.__cell_width: float = ((x_max + padding) - self.__x_min) / self.__nx
+        self.__cell_height: float = (y_max - y_min) / self.__ny
+
+    @property
+    def extent(self) -> Rect:
+        """
+        Rect -> The region covered by the grid.
+        """
+        return self.__extent
+
+    @property
+    def gridsize(self) -> int|tuple[int, int]:
+        """
+        int|tuple[int, int] -> The gridsize used to create the grid.
+        """
+        return self.__gridsize
+
+    @property
+    def nx(self) -> int:
+        """
+        int -> Number of hexagons in the x-direction.
+        """
+        return self.__nx
+
+    @property
+    def ny(self) -> int:
+        """
+        int -> Number of hexagons in the y-direction.
+        """
+        return self.__ny
+
+    @property
+    def number_of_cells(self) -> int:
+        """
+        int -> Total number of cells in both lattices.
+        """
+        return (self.__nx + 1) * (self.__ny + 1) + self.__nx * self.__ny
+
+    @property
+    def cell_width(self) -> float:
+        """
+        float -> Horizontal distance between the centres of adjacent cells in the same lattice.
+        """
+        return self.__cell_width
+
+    @property
+    def cell_height(self) -> float:
+        """
+        float -> Vertical distance between the centres of adjacent cells in the same lattice.
+        """
+        return self.__cell_height
+
+    @property
+    def polygon(self) -> np.ndarray[tuple[int, int], np.dtype[np.floating]]:
+        """
+        np.ndarray[(6, 2), float] -> Vertices of a single hexagon centred on the origin.
+        """
+        return [self.__cell_width, self.__cell_height / 3] * np.array([[.5, -.5], [.5, .5], [0., 1.], [-.5, .5], [-.5, -.5], [0., -1.]])
+
+    def get_offsets(self, cell_indices: np.ndarray[tuple[int], np.dtype[np.integer]]|None = None) -> np.ndarray[tuple[int, int], np.dtype[np.floating]]:
+        """
+        Get the centres of cells.
+
+        Parameters:
+            np.ndarray[(N,), int] cell_indices:
+                Indices of the cells to return. Defaults to all cells in index order.
+
+        Returns:
+            np.ndarray[(N, 2), float] -> The x and y coordinates of each cell centre.
+        """
+        if cell_indices is None:
+            cell_indices = np.arange(self.number_of_cells)
+        cell_indices = np.asarray(cell_indices, dtype = np.int64)
+        nx1 = self.__nx + 1
+        ny1 = self.__ny + 1
+        n1 = nx1 * ny1
+        second_lattice = cell_indices >= n1
+        local_indices = np.where(second_lattice, cell_indices - n1, cell_indices)
+        column_length = np.where(second_lattice, self.__ny, ny1)
+        offsets = np.empty((len(cell_indices), 2), dtype = float)
+        offsets[:, 0] = local_indices // column_length
+        offsets[:, 1] = local_indices % column_length
+        offsets[second_lattice] += 0.5
+        # Same operation order as matplotlib so the values are identical
+        offsets[:, 0] *= self.__cell_width
+        offsets[:, 1] *= self.__cell_height
+        offsets[:, 0] += self.__x_min
+        offsets[:, 1] += self.__y_min
+        return offsets
+
+    def get_cell_indices_from_offsets(self, offsets: np.ndarray[tuple[int, int], np.dtype[np.floating]]) -> np.ndarray[tuple[int], np.dtype[np.int64]]:
+        """
+        Recover the cell indices of cell centres (such as those of an existing hexbin `PolyCollection`).
+
+        Parameters:
+            np.ndarray[(N, 2), float] offsets:
+                Cell centre coordinates.
+
+        Returns:
+            np.ndarray[(N,), int] -> The index of each cell.
+        """
+        offsets = np.asarray(offsets)
+        half_steps_x = np.rint(2 * (offsets[:, 0] - self.__x_min) / self.__cell_width).astype(np.int64)
+        half_steps_y = np.rint(2 * (offsets[:, 1] - self.__y_min) / self.__cell_height).astype(np.int64)
+        second_lattice = (half_steps_x % 2) == 1
+        ix = half_steps_x // 2
+        iy = half_steps_y // 2
+        return np.where(
+            second_lattice,
+            (self.__nx + 1) * (self.__ny + 1) + ix * self.__ny + iy,
+            ix * (self.__ny + 1) + iy
+        )
+
+    def assign(self, x: np.ndarray[tuple[int], np.dtype[np.floating]], y: np.ndarray[tuple[int], np.dtype[np.floating]]) -> np.ndarray[tuple[int], np.dtype[np.int64]]:
+        """
+        Find the cell containing each point.
+
+        Parameters:
+            np.ndarray[(N,), float] x:
+                The x coordinates of the points.
+            np.ndarray[(N,), float] y:
+                The y coordinates of the points.
+
+        Returns:
+            np.ndarray[(N,), int] -> The index of the cell containing each point, or -1 for points outside the grid.
+        """
+        nx1 = self.__nx + 1
+        ny1 = self.__ny + 1
+        ix = (np.asarray(x) - self.__x_min) / self.__cell_width
+        iy = (np.asarray(y) - self.__y_min) / self.__cell_height
+        ix1 = np.round(ix).astype(np.int64)
+        iy1 = np.round(iy).astype(np.int64)
+        ix2 = np.floor(ix).astype(np.int64)
+        iy2 = np.floor(iy).astype(np.int64)
+        i1 = np.where((0 <= ix1) & (ix1 < nx1) & (0 <= iy1) & (iy1 < ny1), ix1 * ny1 + iy1, -1)
+        i2 = np.where((0 <= ix2) & (ix2 < self.__nx) & (0 <= iy2) & (iy2 < self.__ny), nx1 * ny1 + ix2 * self.__ny + iy2, -1)
+        d1 = (ix - ix1) ** 2 + 3.0 * (iy - iy1) ** 2
+        d2 = (ix - ix2 - 0.5) ** 2 + 3.0 * (iy - iy2 - 0.5) ** 2
+        return np.where(d1 < d2, i1, i2)
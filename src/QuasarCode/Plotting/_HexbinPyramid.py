@@ -0,0 +1,247 @@
+from typing import Literal
+
+from matplotlib.axes import Axes
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import Colormap
+from matplotlib.typing import ColorType
+import numpy as np
+
+from ..Data._Rect import Rect
+from ..Tools._Struct import CacheableStruct
+from ..Tools._autoproperty import AutoProperty, AutoProperty_NonNullable
+from ._CachedPlotElements import CachedPlotHexbin
+from ._HexbinGrid import HexbinGrid
+
+class HexbinPyramidLevel(CacheableStruct):
+    """
+    Aggregated values for the occupied cells of a single hexbin grid.
+    """
+    gridsize     = AutoProperty_NonNullable[int]()
+    cell_indices = AutoProperty_NonNullable[np.ndarray[tuple[int], np.dtype[np.int64]]]()
+    counts       = AutoProperty_NonNullable[np.ndarray[tuple[int], np.dtype[np.floating]]]()
+    value_sums   = AutoProperty[np.ndarray[tuple[int], np.dtype[np.floating]]](allow_uninitialised = True)
+    weight_sums  = AutoProperty[np.ndarray[tuple[int], np.dtype[np.floating]]](allow_uninitialised = True)
+    def __init__(self, **kwargs):
+        super().__init__(
+            cacheable_attributes = ("gridsize", "cell_indices", "counts", "value_sums", "weight_sums"),
+            **kwargs
+        )
+
+class HexbinPyramid(CacheableStruct):
+    """
+    Multi-resolution hexbin aggregates for fast redrawing of large datasets at different zoom levels.
+
+    Each level stores the number of points (and optionally the weighted sum of a value and the sum of
+    the weights) for every occupied cell of a hexbin grid over the base extent. Each successive level
+    halves the gridsize of the previous one.
+
+    A query for a region and gridsize re-aggregates only the visible cells of the nearest suitable
+    level, treating each cell as a weighted point at its centre. This is exact when the query matches
+    a level's grid and approximates the full calculation otherwise.
+
+    Only statistics that can be built from these aggregates are supported (see `STATISTICS`).
+    """
+
+    STATISTICS = ("count", "log10_count", "sum", "log10_sum", "mean", "log10_mean")
+
+    extent = AutoProperty_NonNullable[Rect]()
+    levels = AutoProperty_NonNullable[dict[int, HexbinPyramidLevel]]()
+
+    def __init__(self, **kwargs):
+        super().__init__(
+            cacheable_attributes = ("extent", "levels"),
+            **kwargs
+        )
+        if "levels" not in kwargs:
+            self.levels = {}
+
+    @property
+    def gridsizes(self) -> tuple[int, ...]:
+        """
+        tuple[int, ...] -> The gridsize of each level, from finest to coarsest.
+        """
+        return tuple(sorted(self.levels.keys(), reverse = True))
+
+    @staticmethod
+    def build(
+        x_data: np.ndarray[tuple[int], np.dtype[np.floating]],
+        y_data: np.ndarray[tuple[int], np.dtype[np.floating]],
+        extent: Rect|None = None,
+        base_gridsize: int = 1024,
+        number_of_levels: int|None = None,
+        minimum_gridsize: int = 8,
+        values: np.ndarray[tuple[int], np.dtype[np.floating]]|None = None,
+        weights: np.ndarray[tuple[int], np.dtype[np.floating]]|None = None
+    ) -> "HexbinPyramid":
+        """
+        Aggregate a dataset at successively coarser gridsizes.
+
+        Parameters:
+            np.ndarray x_data:
+                The x coordinates of the points.
+            np.ndarray y_data:
+                The y coordinates of the points.
+            Rect extent:
+                The base extent. Defaults to the extent of the data.
+            int base_gridsize:
+                The gridsize of the finest level.
+            int|None number_of_levels:
+                The number of levels to create. Defaults to halving the gridsize until `minimum_gridsize` is reached.
+            int minimum_gridsize:
+                The smallest gridsize to create when `number_of_levels` is not specified.
+            np.ndarray values:
+                Optional values to sum in each cell. Required for the "sum" and "mean" statistics.
+            np.ndarray weights:
+                Optional weights for each point. Used when calculating the "sum" and "mean" statistics.
+
+        Returns:
+            HexbinPyramid -> The aggregated pyramid.
+        """
+        if extent is None:
+            extent = Rect.create_from_data(x_data, y_data)
+        pyramid = HexbinPyramid(extent = extent)
+        weighted_values = None
+        if values is not None:
+            weighted_values = values if weights is None else values * weights
+        gridsize = base_gridsize
+        level_number = 0
+        while (level_number < number_of_levels) if number_of_levels is not None else (gridsize >= minimum_gridsize):
+            grid = HexbinGrid(extent, gridsize)
+            cell_indices = grid.assign(x_data, y_data)
+            in_grid = cell_indices >= 0
+            cell_indices = cell_indices[in_grid]
+            counts = np.bincount(cell_indices, minlength = grid.number_of_cells)
+            occupied = np.nonzero(counts)[0]
+            level = HexbinPyramidLevel(gridsize = gridsize, cell_indices = occupied, counts = counts[occupied].astype(float))
+            if weighted_values is not None:
+                level.value_sums = np.bincount(cell_indices, weights = weighted_values[in_grid], minlength = grid.number_of_cells)[occupied]
+            if weights is not None:
+                level.weight_sums = np.bincount(cell_indices, weights = weights[in_grid], minlength = grid.number_of_cells)[occupied]
+            pyramid.levels[gridsize] = level
+            level_number += 1
+            gridsize //= 2
+            if gridsize < 1:
+                break
+        return pyramid
+
+    def nearest_level(self, extent: Rect, gridsize: int|tuple[int, int], oversampling: float = 2.0) -> HexbinPyramidLevel:
+        """
+        Find the coarsest level with cells at least `oversampling` times smaller than those of the requested grid.
+        If no level is fine enough, the finest level is returned.
+
+        Parameters:
+            Rect extent:
+                The region to be displayed.
+            int|tuple[int, int] gridsize:
+                The gridsize to be displayed.
+            float oversampling:
+                Minimum number of level cells per requested cell width.
+
+        Returns:
+            HexbinPyramidLevel -> The selected level.
+        """
+        if len(self.levels) == 0:
+            raise ValueError("Pyramid contains no levels.")
+        target_cell_width = HexbinGrid(extent, gridsize).cell_width
+        selected = self.levels[self.gridsizes[0]]
+        for level_gridsize in self.gridsizes:
+            if HexbinGrid(self.extent, level_gridsize).cell_width * oversampling <= target_cell_width:
+                selected = self.levels[level_gridsize]
+            else:
+                break
+        return selected
+
+    def query(
+        self,
+        extent: Rect|None = None,
+        gridsize: int|tuple[int, int] = 100,
+        statistic: Literal["count", "log10_count", "sum", "log10_sum", "mean", "log10_mean"] = "count",
+        min_value: float|None = None,
+        max_value: float|None = None,
+        colourmap: str|Colormap|None = None,
+        edge_colour: ColorType|Literal["face", "none"] = "face",
+        oversampling: float = 2.0
+    ) -> CachedPlotHexbin:
+        """
+        Create hexbin data for a region from the nearest pyramid level.
+
+        Parameters:
+            Rect extent:
+                The region to display. Defaults to the base extent.
+            int|tuple[int, int] gridsize:
+                The gridsize to display.
+            str statistic:
+                The statistic used for the value of each cell. One of `HexbinPyramid.STATISTICS`.
+            float min_value:
+                Values below this are clipped to this value.
+            float max_value:
+                Values above this are clipped to this value.
+            str|Colormap colourmap:
+                The colourmap to store with the result.
+            ColorType edge_colour:
+                The edge colour to store with the result.
+            float oversampling:
+                See `nearest_level`.
+
+        Returns:
+            CachedPlotHexbin -> The hexbin data. Call `render` to draw it.
+        """
+        if statistic not in HexbinPyramid.STATISTICS:
+            raise ValueError(f"Unsupported statistic \"{statistic}\". Valid options are: {', '.join(HexbinPyramid.STATISTICS)}.")
+        if extent is None:
+            extent = self.extent
+        level = self.nearest_level(extent, gridsize, oversampling)
+        if statistic not in ("count", "log10_count") and level.value_sums is None:
+            raise ValueError(f"Statistic \"{statistic}\" requires the pyramid to be built with values.")
+
+        level_grid = HexbinGrid(self.extent, level.gridsize)
+        target_grid = HexbinGrid(extent, gridsize)
+
+        # Only consider level cells that could fall within the target grid
+        centres = level_grid.get_offsets(level.cell_indices)
+        x_min, x_max, y_min, y_max = extent.extent
+        visible = (centres[:, 0] >= x_min - target_grid.cell_width) & (centres[:, 0] <= x_max + target_grid.cell_width) & (centres[:, 1] >= y_min - target_grid.cell_height) & (centres[:, 1] <= y_max + target_grid.cell_height)
+        target_indices = target_grid.assign(centres[visible, 0], centres[visible, 1])
+        in_grid = target_indices >= 0
+        target_indices = target_indices[in_grid]
+
+        def aggregate(level_values: np.ndarray) -> np.ndarray:
+            return np.bincount(target_indices, weights = level_values[visible][in_grid], minlength = target_grid.number_of_cells)
+
+        counts = aggregate(level.counts)
+        occupied = np.nonzero(counts)[0]
+        counts = counts[occupied]
+
+        with np.errstate(divide = "ignore", invalid = "ignore"):
+            if statistic in ("count", "log10_count"):
+                bin_values = counts
+            else:
+                bin_values = aggregate(level.value_sums)[occupied]
+                if statistic in ("mean", "log10_mean"):
+                    bin_values = bin_values / (aggregate(level.weight_sums)[occupied] if level.weight_sums is not None else counts)
+            if statistic.startswith("log10_"):
+                bin_values = np.log10(bin_values)
+
+        if min_value is not None or max_value is not None:
+            bin_values = np.clip(bin_values, min_value, max_value)
+
+        return CachedPlotHexbin(
+            extent = extent,
+            gridsize = gridsize,
+            polygon_offsets = target_grid.get_offsets(occupied),
+            bin_values = bin_values,
+            min_value = min_value,
+            max_value = max_value,
+            colourmap = colourmap,
+            edgecolour = edge_colour
+        )
+
+    def plot(self, axis: Axes, extent: Rect|None = None, gridsize: int|tuple[int, int] = 100, statistic: Literal["count", "log10_count", "sum", "log10_sum", "mean", "log10_mean"] = "count", **query_kwargs) -> PolyCollection:
+        """
+        Query the pyramid and render the result on an axis.
+
+        query_kwargs will be passed to `query`.
+        """
+        hexes = self.query(extent, gridsize, statistic, **query_kwargs)
+        hexes.render(axis.figure, axis, None)
+        return hexes.result
@@ -0,0 +1,289 @@
+from typing import Any, Iterable
+
+import numpy as np
+
+from ..IO.Caching import Cacheable
+from ._Bins import Bins
+
+DEFAULT_CHUNK_SIZE = 2**20
+
+def _get_bin_indices(bins: Bins, values: np.ndarray) -> np.ndarray[tuple[int], np.dtype[np.intp]]:
+    # Index of the bin containing each value (-1 if outside the bins), with the last bin including its upper edge (as np.histogram)
+    return bins.digitize(values, out_of_range = "mark")
+
+class HistogramAccumulator(Cacheable):
+    """
+    Accumulate a 1D histogram incrementally, so that data larger than the available memory can be binned.
+
+    Data may be added in chunks (for example from a generator or a memory-mapped file). Values outside the
+    bins (and NaNs) are counted separately and excluded from the histogram.
+
+    Parameters:
+        Bins bins:
+            The bins to accumulate.
+    """
+
+    def __init__(self, bins: Bins) -> None:
+        self.__bins: Bins = bins
+        self.__values: np.ndarray[tuple[int], np.dtype[np.float64]] = np.zeros(len(bins), dtype = np.float64)
+        self.__number_of_points: int = 0
+        self.__number_outside: int = 0
+
+    @property
+    def bins(self) -> Bins:
+        """
+        Bins -> The bins being accumulated.
+        """
+        return self.__bins
+
+    @property
+    def values(self) -> np.ndarray[tuple[int], np.dtype[np.float64]]:
+        """
+        np.ndarray[(N,), float] -> The (weighted) count in each bin.
+        """
+        return self.__values
+
+    @property
+    def number_of_points(self) -> int:
+        """
+        int -> The total number of values added (including those outside the bins).
+        """
+        return self.__number_of_points
+
+    @property
+    def number_outside(self) -> int:
+        """
+        int -> The number of values added that were outside the bins (or NaN).
+        """
+        return self.__number_outside
+
+    def add(self, values: np.ndarray[tuple[int], np.dtype[np.floating]], weights: np.ndarray[tuple[int], np.dtype[np.floating]]|None = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        """
+        Add data to the histogram.
+
+        Parameters:
+            np.ndarray[(N,), float] values:
+                The values to bin. Memory-mapped arrays are read `chunk_size` elements at a time.
+            np.ndarray[(N,), float]|None weights:
+                The weight of each value.
+            int chunk_size:
+                The maximum number of values to bin at once.
+        """
+        if weights is not None and len(weights) != len(values):
+            raise ValueError("Number of weights does not match the number of values.")
+        for start in range(0, len(values), chunk_size):
+            indices = _get_bin_indices(self.__bins, np.asarray(values[start : start + chunk_size]))
+            inside = indices >= 0
+            self.__values += np.bincount(indices[inside], weights = np.asarray(weights[start : start + chunk_size])[inside] if weights is not None else None, minlength = len(self.__values))
+            self.__number_of_points += len(indices)
+            self.__number_outside += len(indices) - int(np.count_nonzero(inside))
+
+    def add_chunks(self, chunks: Iterable[np.ndarray|tuple[np.ndarray, np.ndarray|None]]) -> None:
+        """
+        Add each chunk of data from an iterable (such as a generator).
+
+        Parameters:
+            Iterable[np.ndarray|tuple[np.ndarray, np.ndarray|None]] chunks:
+                Arrays of values or tuples of values and weights.
+        """
+        for chunk in chunks:
+            if isinstance(chunk, tuple):
+                self.add(*chunk)
+            else:
+                self.add(chunk)
+
+    def merge(self, other: "HistogramAccumulator") -> None:
+        """
+        Add the contents of another accumulator with the same bins (for example, one filled by another process).
+        """
+        if not np.array_equal(self.__bins.edges, other.bins.edges):
+            raise ValueError("Unable to merge histograms with different bins.")
+        self.__values += other.values
+        self.__number_of_points += other.number_of_points
+        self.__number_outside += other.number_outside
+
+    def reset(self) -> None:
+        """
+        Remove all accumulated data.
+        """
+        self.__values[:] = 0
+        self.__number_of_points = 0
+        self.__number_outside = 0
+
+    def get_density(self) -> np.ndarray[tuple[int], np.dtype[np.float64]]:
+        """
+        Get the histogram normalised to a probability density (integrating to 1 over the bins).
+
+        Returns:
+            np.ndarray[(N,), float] -> The density in each bin.
+        """
+        total = self.__values.sum()
+        return self.__values / (total * self.__bins.widths) if total > 0 else np.zeros_like(self.__values)
+
+    @classmethod
+    def __from_cache_data__(cls, data: dict[str, Any]) -> "HistogramAccumulator":
+        """
+        Load the object from a cache target.
+
+        Parameters:
+            dict[str, Any] data:
+                The data to load the object from.
+        """
+        # Data cached before the bins themselves were stored has only their edges
+        instance = HistogramAccumulator(data["bins"] if "bins" in data else Bins(data["bin_edges"]))
+        instance.__values = data["values"]
+        instance.__number_of_points = data["number_of_points"]
+        instance.__number_outside = data["number_outside"]
+        return instance
+
+    def __get_cache_data__(self) -> dict[str, Any]:
+        """
+        Get the data to be cached.
+
+        Returns:
+            dict[str, Any] -> The data to be cached.
+        """
+        return { "bins": self.__bins, "values": self.__values, "number_of_points": self.__number_of_points, "number_outside": self.__number_outside }
+
+class HistogramAccumulator2D(Cacheable):
+    """
+    Accumulate a 2D histogram incrementally, so that data larger than the available memory can be binned.
+
+    Data may be added in chunks (for example from a generator or memory-mapped files). Points outside the
+    bins (and NaNs) are counted separately and excluded from the histogram.
+    Use `Contour.from_accumulator` to create contours from the result.
+
+    Parameters:
+        Bins x_bins:
+            The bins along the x axis.
+        Bins y_bins:
+            The bins along the y axis.
+    """
+
+    def __init__(self, x_bins: Bins, y_bins: Bins) -> None:
+        self.__x_bins: Bins = x_bins
+        self.__y_bins: Bins = y_bins
+        self.__values: np.ndarray[tuple[int, int], np.dtype[np.float64]] = np.zeros((len(y_bins), len(x_bins)), dtype = np.float64)
+        self.__number_of_points: int = 0
+        self.__number_outside: int = 0
+
+    @property
+    def x_bins(self) -> Bins:
+        """
+        Bins -> The bins along the x axis.
+        """
+        return self.__x_bins
+
+    @property
+    def y_bins(self) -> Bins:
+        """
+        Bins -> The bins along the y axis.
+        """
+        return self.__y_bins
+
+    @property
+    def values(self) -> np.ndarray[tuple[int, int], np.dtype[np.float64]]:
+        """
+        np.ndarray[(Ny, Nx), float] -> The (weighted) count in each bin, indexed as [y, x].
+        """
+        return self.__values
+
+    @property
+    def number_of_points(self) -> int:
+        """
+        int -> The total number of points added (including those outside the bins).
+        """
+        return self.__number_of_points
+
+    @property
+    def number_outside(self) -> int:
+        """
+        int -> The number of points added that were outside the bins (or NaN).
+        """
+        return self.__number_outside
+
+    def add(self, x: np.ndarray[tuple[int], np.dtype[np.floating]], y: np.ndarray[tuple[int], np.dtype[np.floating]], weights: np.ndarray[tuple[int], np.dtype[np.floating]]|None = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        """
+        Add data to the histogram.
+
+        Parameters:
+            np.ndarray[(N,), float] x:
+                The x coordinates of the points. Memory-mapped arrays are read `chunk_size` elements at a time.
+            np.ndarray[(N,), float] y:
+                The y coordinates of the points.
+            np.ndarray[(N,), float]|None weights:
+                The weight of each point.
+            int chunk_size:
+                The maximum number of points to bin at once.
+        """
+        if len(x) != len(y) or (weights is not None and len(weights) != len(x)):
+            raise ValueError("Number of x values, y values and weights do not match.")
+        number_of_x_bins = len(self.__x_bins)
+        for start in range(0, len(x), chunk_size):
+            x_indices = _get_bin_indices(self.__x_bins, np.asarray(x[start : start + chunk_size]))
+            y_indices = _get_bin_indices(self.__y_bins, np.asarray(y[start : start + chunk_size]))
+            inside = (x_indices >= 0) & (y_indices >= 0)
+            self.__values += np.bincount(
+                y_indices[inside] * number_of_x_bins + x_indices[inside],
+                weights = np.asarray(weights[start : start + chunk_size])[inside] if weights is not None else None,
+                minlength = self.__values.size
+            ).reshape(self.__values.shape)
+            self.__number_of_points += len(x_indices)
+            self.__number_outside += len(x_indices) - int(np.count_nonzero(inside))
+
+    def add_chunks(self, chunks: Iterable[tuple[np.ndarray, np.ndarray]|tuple[np.ndarray, np.ndarray, np.ndarray|None]]) -> None:
+        """
+        Add each chunk of data from an iterable (such as a generator).
+
+        Parameters:
+            Iterable[tuple[np.ndarray, np.ndarray]|tuple[np.ndarray, np.ndarray, np.ndarray|None]] chunks:
+                Tuples of x and y coordinates, and optionally weights.
+        """
+        for chunk in chunks:
+            self.add(*chunk)
+
+    def merge(self, other: "HistogramAccumulator2D") -> None:
+        """
+        Add the contents of another accumulator with the same bins (for example, one filled by another process).
+        """
+        if not np.array_equal(self.__x_bins.edges, other.x_bins.edges) or not np.array_equal(self.__y_bins.edges, other.y_bins.edges):
+            raise ValueError("Unable to merge histograms with different bins.")
+        self.__values += other.values
+        self.__number_of_points += other.number_of_points
+        self.__number_outside += other.number_outside
+
+    def reset(self) -> None:
+        """
+        Remove all accumulated data.
+        """
+        self.__values[:] = 0
+        self.__number_of_points = 0
+        self.__number_outside = 0
+
+    @classmethod
+    def __from_cache_data__(cls, data: dict[str, Any]) -> "HistogramAccumulator2D":
+        """
+        Load the object from a cache target.
+
+        Parameters:
+            dict[str, Any] data:
+                The data to load the object from.
+        """
+        # Data cached before the bins themselves were stored has only their edges
+        if "x_bins" in data:
+            instance = HistogramAccumulator2D(data["x_bins"], data["y_bins"])
+        else:
+            instance = HistogramAccumulator2D(Bins(data["x_bin_edges"]), Bins(data["y_bin_edges"]))
+        instance.__values = data["values"]
+        instance.__number_of_points = data["number_of_points"]
+        instance.__number_outside = data["number_outside"]
+        return instance
+
+    def __get_cache_data__(self) -> dict[str, Any]:
+        """
+        Get the data to be cached.
+
+        Returns:
+            dict[str, Any] -> The data to be cached.
+        """
+        return { "x_bins": self.__x_bins, "y_bins": self.__y_bins, "values": self.__values, "number_of_points": self.__number_of_points, "number_outside": self.__number_outside }
@@ -0,0 +1,38 @@
+from ..Tools._Struct import Struct
+from ..Tools._autoproperty import AutoProperty_NonNullable
+
+class RasterisationReport(Struct):
+    """
+    Comparison of a vector file saved with and without rasterising heavy plot elements.
+    See `CachedFigureGrid.get_rasterisation_report`.
+    """
+    file_format           = AutoProperty_NonNullable[str]()
+    rasterised_elements   = AutoProperty_NonNullable[list[tuple[str, str, int]]]()
+    vector_file_size      = AutoProperty_NonNullable[int]()
+    vector_time           = AutoProperty_NonNullable[float]()
+    rasterised_file_size  = AutoProperty_NonNullable[int]()
+    rasterised_time       = AutoProperty_NonNullable[float]()
+
+    @property
+    def size_saving(self) -> float:
+        """
+        float -> Fraction of the vector file size saved by rasterising.
+        """
+        return 1 - (self.rasterised_file_size / self.vector_file_size) if self.vector_file_size > 0 else 0.0
+
+    @property
+    def time_saving(self) -> float:
+        """
+        float -> Fraction of the vector save time saved by rasterising.
+        """
+        return 1 - (self.rasterised_time / self.vector_time) if self.vector_time > 0 else 0.0
+
+    def __str__(self) -> str:
+        lines = [f"Rasterised elements ({self.file_format}):"]
+        if len(self.rasterised_elements) == 0:
+            lines.append("    (none)")
+        for plot_tag, element_name, artist_count in self.rasterised_elements:
+            lines.append(f"    {plot_tag}/{element_name}: ~{artist_count} artists")
+        lines.append(f"Size: {self.vector_file_size} -> {self.rasterised_file_size} bytes ({self.size_saving:.1%} saved)")
+        lines.append(f"Time: {self.vector_time:.3f} -> {self.rasterised_time:.3f} s ({self.time_saving:.1%} saved)")
+        return "\n".join(lines)
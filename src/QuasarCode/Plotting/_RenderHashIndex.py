@@ -0,0 +1,110 @@
+from contextlib import closing
+import os
+import sqlite3
+
+class RenderHashIndex(object):
+    """
+    Records the content hash of files written to a directory, so that unchanged outputs need not be rendered again.
+
+    The index is kept in a single SQLite database file in the directory (see `DATABASE_FILENAME`).
+    The size and modification time of each file are recorded alongside its hash so that files
+    altered or replaced by other means are not treated as current.
+
+    Parameters:
+        str directory:
+            The directory containing the indexed files.
+    """
+
+    DATABASE_FILENAME = ".render_hashes.sqlite"
+
+    def __init__(self, directory: str) -> None:
+        self.__directory: str = os.path.abspath(directory)
+
+    @property
+    def directory(self) -> str:
+        """
+        str -> The directory containing the indexed files.
+        """
+        return self.__directory
+
+    @property
+    def database_filepath(self) -> str:
+        """
+        str -> The location of the index database.
+        """
+        return os.path.join(self.__directory, RenderHashIndex.DATABASE_FILENAME)
+
+    def __connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.database_filepath, timeout = 30)
+        connection.execute("CREATE TABLE IF NOT EXISTS outputs (filename TEXT PRIMARY KEY, hash TEXT NOT NULL, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL)")
+        return connection
+
+    def get_hash(self, filename: str) -> str|None:
+        """
+        Get the hash recorded for a file.
+
+        Parameters:
+            str filename:
+                The name of the file within the directory.
+
+        Returns:
+            str|None -> The recorded hash, or None if the file has not been recorded.
+        """
+        if not os.path.exists(self.database_filepath):
+            return None
+        with closing(self.__connect()) as connection:
+            row = connection.execute("SELECT hash FROM outputs WHERE filename = ?", (filename,)).fetchone()
+        return row[0] if row is not None else None
+
+    def is_current(self, filename: str, content_hash: str) -> bool:
+        """
+        Check whether a file exists and was last written with the specified content hash.
+
+        Parameters:
+            str filename:
+                The name of the file within the directory.
+            str content_hash:
+                The hash of the content the file should have.
+
+        Returns:
+            bool -> True if the file is unchanged, otherwise False.
+        """
+        filepath = os.path.join(self.__directory, filename)
+        if not os.path.exists(filepath) or not os.path.exists(self.database_filepath):
+            return False
+        with closing(self.__connect()) as connection:
+            row = connection.execute("SELECT hash, size, mtime_ns FROM outputs WHERE filename = ?", (filename,)).fetchone()
+        if row is None:
+            return False
+        file_stats = os.stat(filepath)
+        return row[0] == content_hash and row[1] == file_stats.st_size and row[2] == file_stats.st_mtime_ns
+
+    def record(self, filename: str, content_hash: str) -> None:
+        """
+        Record the content hash of a file that has just been written.
+
+        Parameters:
+            str filename:
+                The name of the file within the directory.
+            str content_hash:
+                The hash of the file's content.
+        """
+        file_stats = os.stat(os.path.join(self.__directory, filename))
+        with closing(self.__connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO outputs (filename, hash, size, mtime_ns) VALUES (?, ?, ?, ?)",
+                (filename, content_hash, file_stats.st_size, file_stats.st_mtime_ns)
+            )
+
+    def remove(self, filename: str) -> None:
+        """
+        Remove the record for a file.
+
+        Parameters:
+            str filename:
+                The name of the file within the directory.
+        """
+        if not os.path.exists(self.database_filepath):
+            return
+        with closing(self.__connect()) as connection, connection:
+            connection.execute("DELETE FROM outputs WHERE filename = ?", (filename,))
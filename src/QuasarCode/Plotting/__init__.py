@@ -17,4 +17,11 @@ from ._CachedFigureGrid import CachedFigureGrid
 from ._CachedPlotFactory import CachedPlotFactory
 from ._CachedFigureGridFactory import CachedFigureGridFactory
 from ._Hexbin import Hexbin
+from ._HexbinGrid import HexbinGrid
+from ._HexbinPyramid import HexbinPyramid, HexbinPyramidLevel
+from ._BinnedImage import BinnedImage
 from ._Contour import Contour
+from ._HistogramAccumulator import HistogramAccumulator, HistogramAccumulator2D
+from ._FrameSequenceRenderer import FrameSequenceRenderer
+from ._RasterisationReport import RasterisationReport
+from ._RenderHashIndex import RenderHashIndex
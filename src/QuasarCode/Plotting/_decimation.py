@@ -0,0 +1,186 @@
+import math
+from weakref import WeakKeyDictionary
+
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+import numpy as np
+
+_decimation_resolutions: "WeakKeyDictionary[Figure, float]" = WeakKeyDictionary()
+
+def set_decimation_resolution(figure: Figure, resolution: float|None) -> None:
+    """
+    Set the resolution (in dots per inch) used to decimate data drawn on a figure, for when the figure will be
+    saved at a higher resolution than it is drawn at.
+
+    Parameters:
+        Figure figure:
+            The figure.
+        float|None resolution:
+            The resolution, or None to use the figure's resolution.
+    """
+    if resolution is None:
+        _decimation_resolutions.pop(figure, None)
+    else:
+        _decimation_resolutions[figure] = resolution
+
+def get_axis_pixels(axis: Axes, oversampling: float = 1.0) -> tuple[int, int]:
+    """
+    Get the size of an axis in pixels at the figure's resolution (or that set using `set_decimation_resolution`).
+
+    Parameters:
+        Axes axis:
+            The axis.
+        float oversampling:
+            Factor by which to multiply the number of pixels.
+
+    Returns:
+        tuple[int, int] -> The number of pixel columns and rows.
+    """
+    figure = axis.figure
+    if figure in _decimation_resolutions:
+        oversampling *= _decimation_resolutions[figure] / figure.dpi
+    return max(1, math.ceil(axis.bbox.width * oversampling)), max(1, math.ceil(axis.bbox.height * oversampling))
+
+def get_visible_extent(axis: Axes, x: np.ndarray[tuple[int], np.dtype[np.floating]], y: np.ndarray[tuple[int], np.dtype[np.floating]]) -> tuple[float, float, float, float]:
+    """
+    Get the region of the data that will be visible on an axis.
+    The axis limits are used where they have been fixed, otherwise the range of the (finite) data is used.
+
+    Returns:
+        tuple[float, float, float, float] -> The visible region as (x_min, x_max, y_min, y_max).
+    """
+    def data_range(values: np.ndarray) -> tuple[float, float]:
+        finite_values = values[np.isfinite(values)]
+        return (float(finite_values.min()), float(finite_values.max())) if len(finite_values) > 0 else (0.0, 1.0)
+    x_min, x_max = sorted(axis.get_xlim()) if not axis.get_autoscalex_on() else data_range(np.asarray(x))
+    y_min, y_max = sorted(axis.get_ylim()) if not axis.get_autoscaley_on() else data_range(np.asarray(y))
+    return x_min, x_max, y_min, y_max
+
+def decimate_line(
+    x: np.ndarray[tuple[int], np.dtype[np.floating]],
+    y: np.ndarray[tuple[int], np.dtype[np.floating]],
+    x_min: float,
+    x_max: float,
+    number_of_columns: int
+) -> np.ndarray[tuple[int], np.dtype[np.int64]]:
+    """
+    Select the points of a line needed to draw it at a given horizontal resolution (the M4 algorithm).
+
+    The first, last, minimum and maximum points in each pixel column are kept, which reproduces the rasterised
+    line up to differences in anti-aliasing. Non-finite points (gaps in the line) are always kept. Points outside the range are grouped into
+    a single column on either side so that lines leaving the plot are still drawn correctly.
+    Lines with x values that are not in increasing order cannot be decimated, in which case all points are kept.
+
+    Parameters:
+        np.ndarray[(N,), float] x:
+            The x coordinates of the line.
+        np.ndarray[(N,), float] y:
+            The y coordinates of the line.
+        float x_min:
+            The lower limit of the visible range.
+        float x_max:
+            The upper limit of the visible range.
+        int number_of_columns:
+            The number of pixel columns spanning the visible range.
+
+    Returns:
+        np.ndarray[(M,), int] -> The indices of the points to keep, in order.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(x) <= 4 * (number_of_columns + 2) or x_max <= x_min:
+        return np.arange(len(x))
+    finite = np.isfinite(x) & np.isfinite(y)
+    finite_indices = np.nonzero(finite)[0]
+    finite_x = x[finite_indices]
+    if len(finite_x) == 0 or np.any(finite_x[1:] < finite_x[:-1]):
+        return np.arange(len(x))
+
+    columns = np.clip(np.floor((finite_x - x_min) * (number_of_columns / (x_max - x_min))), -1, number_of_columns).astype(np.int64)
+    starts = np.nonzero(np.diff(columns, prepend = columns[0] - 1))[0]
+    counts = np.diff(starts, append = len(columns))
+
+    finite_y = y[finite_indices]
+    column_numbers = np.repeat(np.arange(len(starts)), counts)
+    # First point in each column matching the column's extreme value
+    def first_matching(extreme_values: np.ndarray) -> np.ndarray:
+        matches = np.nonzero(finite_y == np.repeat(extreme_values, counts))[0]
+        return matches[np.unique(column_numbers[matches], return_index = True)[1]]
+
+    kept = np.concatenate((
+        starts,
+        starts + counts - 1,
+        first_matching(np.minimum.reduceat(finite_y, starts)),
+        first_matching(np.maximum.reduceat(finite_y, starts))
+    ))
+    return np.union1d(finite_indices[kept], np.nonzero(~finite)[0])
+
+def decimate_scatter(
+    x: np.ndarray[tuple[int], np.dtype[np.floating]],
+    y: np.ndarray[tuple[int], np.dtype[np.floating]],
+    extent: tuple[float, float, float, float],
+    number_of_columns: int,
+    number_of_rows: int,
+    points_per_pixel: int = 1,
+    margin_pixels: int = 8,
+    seed: int = 0
+) -> np.ndarray[tuple[int], np.dtype[np.int64]]:
+    """
+    Select a subsample of scatter points that covers the same pixels as the full dataset, preserving the
+    relative density of points.
+
+    The same fraction of points is randomly selected in each pixel, chosen so that on average `points_per_pixel`
+    points are kept in each pixel containing points. At least one point is kept in every such pixel, so sparse
+    regions are unchanged while dense regions (where markers overlap completely) are thinned in proportion to
+    their number of points. Points further than `margin_pixels` outside the extent are discarded.
+    The selection is deterministic for a given seed.
+
+    Parameters:
+        np.ndarray[(N,), float] x:
+            The x coordinates of the points.
+        np.ndarray[(N,), float] y:
+            The y coordinates of the points.
+        tuple[float, float, float, float] extent:
+            The visible region as (x_min, x_max, y_min, y_max).
+        int number_of_columns:
+            The number of pixel columns spanning the extent.
+        int number_of_rows:
+            The number of pixel rows spanning the extent.
+        int points_per_pixel:
+            The average number of points to keep in each pixel containing points.
+        int margin_pixels:
+            The number of pixels outside the extent in which points are kept (so that markers overlapping the edge are drawn).
+        int seed:
+            Seed for the random selection of points.
+
+    Returns:
+        np.ndarray[(M,), int] -> The indices of the points to keep, in their original order.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    x_min, x_max, y_min, y_max = extent
+    if x_max <= x_min or y_max <= y_min:
+        return np.arange(len(x))
+    with np.errstate(invalid = "ignore"):
+        columns = np.floor((x - x_min) * (number_of_columns / (x_max - x_min))) + margin_pixels
+        rows = np.floor((y - y_min) * (number_of_rows / (y_max - y_min))) + margin_pixels
+    # Include the upper edge in the last pixel
+    columns[x == x_max] -= 1
+    rows[y == y_max] -= 1
+    number_of_columns += 2 * margin_pixels
+    number_of_rows += 2 * margin_pixels
+    visible = np.nonzero((columns >= 0) & (columns < number_of_columns) & (rows >= 0) & (rows < number_of_rows))[0]
+    pixels = rows[visible].astype(np.int64) * number_of_columns + columns[visible].astype(np.int64)
+
+    # Shuffle, then keep the first points to appear in each pixel
+    order = np.random.default_rng(seed).permutation(len(visible))
+    order = order[np.argsort(pixels[order], kind = "stable")]
+    sorted_pixels = pixels[order]
+    starts = np.nonzero(np.diff(sorted_pixels, prepend = -1))[0]
+    counts = np.diff(starts, append = len(sorted_pixels))
+    keep_fraction = points_per_pixel * len(starts) / max(1, len(sorted_pixels))
+    if keep_fraction >= 1:
+        return visible
+    number_kept = np.clip(np.rint(counts * keep_fraction), 1, counts).astype(np.int64)
+    rank = np.arange(len(sorted_pixels)) - np.repeat(starts, counts)
+    return np.sort(visible[order[rank < np.repeat(number_kept, counts)]])
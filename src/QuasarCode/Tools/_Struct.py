@@ -1,7 +1,8 @@
 from abc import abstractmethod
-from typing import Union, Collection, TypeVar, Type, Any
+from typing import Union, Collection, TypeVar, Type, Any, Callable, ClassVar
 
 from ..IO.Caching._Cacheable import Cacheable
+from ._autoproperty import AutoProperty, AutoProperty_NonNullable
 
 class Struct(object):
     """
@@ -32,6 +33,125 @@ class Struct(object):
 
 
 
+_STORE_AS_IS = 0
+_STORE_CACHEABLE = 1
+_STORE_DICT = 2
+
+_value_kinds: dict[type, int] = {}
+
+def _get_value_kind(value_type: type) -> int:
+    # How values of a type are cached (the same for every value of the type, so only checked once)
+    kind = _value_kinds.get(value_type)
+    if kind is None:
+        kind = _STORE_CACHEABLE if issubclass(value_type, Cacheable) else _STORE_DICT if issubclass(value_type, dict) else _STORE_AS_IS
+        _value_kinds[value_type] = kind
+    return kind
+
+def _encode_value(value: Any) -> Any:
+    kind = _get_value_kind(type(value))
+    if kind == _STORE_AS_IS:
+        return value
+    if kind == _STORE_CACHEABLE:
+        return { "datatype" : type(value), "data" : value.__get_cache_data__() }
+    data_to_save: dict[Any, Any] = {}
+    contains_cacheable = False
+    for key, item in value.items():
+        key_is_cacheable = _get_value_kind(type(key)) == _STORE_CACHEABLE
+        item_is_cacheable = _get_value_kind(type(item)) == _STORE_CACHEABLE
+        if key_is_cacheable or item_is_cacheable:
+            contains_cacheable = True
+            if key_is_cacheable:
+                key = { "datatype": type(key), "data": key.__get_cache_data__() }
+            data_to_save[key] = { "datatype": type(item), "data": item.__get_cache_data__() if item_is_cacheable else item, "__key_needs_loading": key_is_cacheable }
+        else:
+            data_to_save[key] = item
+    if contains_cacheable:
+        data_to_save["__has_cacheables"] = True
+    return data_to_save
+
+def _decode_value(data: Any) -> Any:
+    if not isinstance(data, dict):
+        return data
+    if "datatype" in data:
+        data = data["datatype"].__from_cache_data__(data["data"])
+        if not isinstance(data, dict):
+            return data
+    if "__has_cacheables" not in data:
+        return data
+    value = {}
+    for key, item in data.items():
+        if key == "__has_cacheables":
+            continue
+        value[key] = item["datatype"].__from_cache_data__(item["data"]) if isinstance(item, dict) and "datatype" in item else item
+    return value
+
+def _find_class_attribute(owner: type, name: str) -> Any:
+    for base in owner.__mro__:
+        if name in base.__dict__:
+            return base.__dict__[name]
+    return None
+
+class _CacheSchema(object):
+    """
+    Functions for reading and assigning the cached attributes of a CacheableStruct type, compiled once per type.
+
+    AutoProperty values are read from and written to their storage attributes directly. Other attributes
+    (and AutoProperty types that customise getting or setting, such as those with type casts) use getattr and setattr.
+    """
+
+    def __init__(self, struct_type: type) -> None:
+        self.__struct_type = struct_type
+        # Loading bypasses __setattr__, so any overrides must only record changes (newly created objects are already marked as changed)
+        self.__allow_direct_assignment = all(base.__dict__.get("_SETATTR_ONLY_TRACKS_CHANGES", False) for base in struct_type.__mro__[:-1] if "__setattr__" in base.__dict__)
+        self.__readers: dict[tuple[str, ...], tuple[tuple[str, Callable[[Any, dict[str, Any]], Any]], ...]] = {}
+        self.__writers: dict[str, Callable[[Any, dict[str, Any], Any], None]] = {}
+
+    def get_readers(self, attribute_names: tuple[str, ...]) -> tuple[tuple[str, Callable[[Any, dict[str, Any]], Any]], ...]:
+        readers = self.__readers.get(attribute_names)
+        if readers is None:
+            readers = self.__readers[attribute_names] = tuple((name, self.__make_reader(name)) for name in attribute_names)
+        return readers
+
+    def get_writer(self, attribute_name: str) -> Callable[[Any, dict[str, Any], Any], None]:
+        writer = self.__writers.get(attribute_name)
+        if writer is None:
+            writer = self.__writers[attribute_name] = self.__make_writer(attribute_name)
+        return writer
+
+    def __make_reader(self, name: str) -> Callable[[Any, dict[str, Any]], Any]:
+        descriptor = _find_class_attribute(self.__struct_type, name)
+        if not isinstance(descriptor, AutoProperty) or type(descriptor).__get__ not in (AutoProperty.__get__, AutoProperty_NonNullable.__get__):
+            return lambda instance, instance_dict: getattr(instance, name)
+        storage_name = descriptor._storage_attribute_name
+        if descriptor._requires_initialisation:
+            initialised_name = storage_name + "__isinit"
+            def read_initialised(instance: Any, instance_dict: dict[str, Any]) -> Any:
+                if instance_dict.get(initialised_name, False):
+                    return instance_dict[storage_name]
+                return getattr(instance, name) # Raises the uninitialised value error
+            return read_initialised
+        def read(instance: Any, instance_dict: dict[str, Any]) -> Any:
+            try:
+                return instance_dict[storage_name]
+            except KeyError:
+                return getattr(instance, name) # Assigns the default value
+        return read
+
+    def __make_writer(self, name: str) -> Callable[[Any, dict[str, Any], Any], None]:
+        descriptor = _find_class_attribute(self.__struct_type, name)
+        if not self.__allow_direct_assignment or not isinstance(descriptor, AutoProperty) or type(descriptor).__set__ is not AutoProperty.__set__:
+            return lambda instance, instance_dict, value: setattr(instance, name, value)
+        storage_name = descriptor._storage_attribute_name
+        if descriptor._requires_initialisation:
+            initialised_name = storage_name + "__isinit"
+            def write_initialised(instance: Any, instance_dict: dict[str, Any], value: Any) -> None:
+                instance_dict[storage_name] = value
+                instance_dict[initialised_name] = True
+            return write_initialised
+        def write(instance: Any, instance_dict: dict[str, Any], value: Any) -> None:
+            instance_dict[storage_name] = value
+        return write
+
 T = TypeVar("T", bound = "CacheableStruct")
 
 class CacheableStruct(Struct, Cacheable):
@@ -46,67 +166,60 @@ class CacheableStruct(Struct, Cacheable):
 
     To specify a human readable type name for errors, overload: _get_typename(self) -> Union[str, None]
     To specify type casts for attributes, set fields to an instance of TypeCastAutoProperty
+
+    Cached AutoProperty attributes are read and assigned directly, using functions compiled once per type.
+    Types that override `__setattr__` only to record changes should set `_SETATTR_ONLY_TRACKS_CHANGES = True`
+    (in the class defining the override) to allow this when loading. Set `_USE_CACHE_SCHEMA = False` to always
+    use getattr and setattr.
     """
-    
+
+    _USE_CACHE_SCHEMA: bool = True
+    __schemas: ClassVar[dict[type, _CacheSchema]] = {}
+
     def __init__(self, cacheable_attributes: Collection[str], **kwargs):
         self.__cacheable_attributes: tuple[str, ...] = tuple(cacheable_attributes)
         super().__init__(**kwargs)
 
+    @property
+    def cacheable_attributes(self) -> tuple[str, ...]:
+        """
+        tuple[str, ...] -> The names of the attributes that are cached.
+        """
+        return self.__cacheable_attributes
+
+    @classmethod
+    def _get_cache_schema(cls) -> _CacheSchema:
+        schema = CacheableStruct.__schemas.get(cls)
+        if schema is None:
+            schema = CacheableStruct.__schemas[cls] = _CacheSchema(cls)
+        return schema
+
     @classmethod
     def __from_cache_data__(cls: Type[T], data: dict[str, Any]) -> T:
         instance = cls()
-        for attribute_name in data:
+        if not cls._USE_CACHE_SCHEMA:
+            for attribute_name, attribute_data in data.items():
+                if attribute_name != "__has_cacheables":
+                    setattr(instance, attribute_name, _decode_value(attribute_data))
+            return instance
+        schema = cls._get_cache_schema()
+        instance_dict = instance.__dict__
+        for attribute_name, attribute_data in data.items():
             if attribute_name == "__has_cacheables":
                 continue
-            attribute_data = data[attribute_name] if not isinstance(data[attribute_name], dict) or "datatype" not in data[attribute_name] else data[attribute_name]["datatype"].__from_cache_data__(data[attribute_name]["data"])
-            if isinstance(attribute_data, dict) and "__has_cacheables" in attribute_data:
-                loaded_attribute_data = attribute_data
-                attribute_data = {}
-                for sub_key in loaded_attribute_data:
-                    if sub_key == "__has_cacheables":
-                        continue#TODO: why is this needed again???
-                    actual_subkey = sub_key if not isinstance(sub_key, dict) or "__key_needs_loading" not in loaded_attribute_data[sub_key] else sub_key["datatype"].__from_cache_data__(sub_key["data"])
-                    actual_value: Any
-                    if isinstance(loaded_attribute_data[sub_key], dict) and "datatype" in loaded_attribute_data[sub_key]:
-                        actual_value = loaded_attribute_data[sub_key]["datatype"].__from_cache_data__(loaded_attribute_data[sub_key]["data"])
-                    else:
-                        actual_value = loaded_attribute_data[sub_key]
-                    attribute_data[actual_subkey] = actual_value
-                #attribute_data.pop("__has_cacheables")
-            setattr(instance, attribute_name, attribute_data)
+            if isinstance(attribute_data, dict):
+                attribute_data = _decode_value(attribute_data)
+            schema.get_writer(attribute_name)(instance, instance_dict, attribute_data)
         return instance
 
     def __get_cache_data__(self) -> dict[str, Any]:
         data = {}
-        for attribute_name in self.__cacheable_attributes:
-
-            attribute_data = getattr(self, attribute_name)
-
-            if isinstance(attribute_data, Cacheable):
-                data[attribute_name] = { "datatype" : type(attribute_data), "data" : attribute_data.__get_cache_data__() }
-
-            elif isinstance(attribute_data, dict):
-                data_to_save: dict[Any, Any] = {}
-
-                contains_cacheable = False
-
-                for attr_data_key in attribute_data:
-                    if isinstance(attr_data_key, Cacheable) or isinstance(attribute_data[attr_data_key], Cacheable):
-                        contains_cacheable = True
-                        key_is_cacheable = isinstance(attr_data_key, Cacheable)
-                        key = attr_data_key if not key_is_cacheable else { "datatype": type(attr_data_key), "data": attr_data_key.__get_cache_data__() }
-                        value = attribute_data[attr_data_key] if not isinstance(attribute_data[attr_data_key], Cacheable) else attribute_data[attr_data_key].__get_cache_data__()
-                        data_to_save[key] = { "datatype": type(attribute_data[attr_data_key]), "data": value }
-                        data_to_save[key]["__key_needs_loading"] = key_is_cacheable
-                    else:
-                        data_to_save[attr_data_key] = attribute_data[attr_data_key]
-
-                if contains_cacheable:
-                    data_to_save["__has_cacheables"] = True
-
-                data[attribute_name] = data_to_save
-
-            else:
-                data[attribute_name] = attribute_data
-
+        if not self._USE_CACHE_SCHEMA:
+            for attribute_name in self.__cacheable_attributes:
+                data[attribute_name] = _encode_value(getattr(self, attribute_name))
+            return data
+        instance_dict = self.__dict__
+        for attribute_name, read in type(self)._get_cache_schema().get_readers(self.__cacheable_attributes):
+            value = read(self, instance_dict)
+            data[attribute_name] = value if _value_kinds.get(type(value)) == _STORE_AS_IS else _encode_value(value)
         return data
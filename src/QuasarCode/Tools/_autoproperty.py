@@ -32,6 +32,14 @@ class AutoProperty(property, Generic[T]):
     @property
     def _name(self) -> Union[str, None]:
         return self.__name
+
+    @property
+    def _storage_attribute_name(self) -> str:
+        return self.__get_storage_attribute_name()
+
+    @property
+    def _requires_initialisation(self) -> bool:
+        return self.__check_uninitialised
     
     def is_initialised(self, instance: Any) -> Union[bool, None]:
         if self.__check_uninitialised:
@@ -1,14 +1,23 @@
 from typing import Union, List, Tuple, Dict, cast
+from concurrent.futures import ThreadPoolExecutor
+import io
+import os
+import pickle
+import shutil
 
 from matplotlib.collections import PathCollection, PolyCollection
 from matplotlib.contour import QuadContourSet
+from matplotlib.image import AxesImage
+from matplotlib.layout_engine import ConstrainedLayoutEngine
 from matplotlib.lines import Line2D
 import numpy as np
 import matplotlib.pyplot as plt
 
 from QuasarCode.Data import Rect
-from QuasarCode.Plotting import CachedPlotFactory, CachedPlot, CachedPlotLine, CachedPlotScatter, CachedPlotErrorbar, CachedPlotHexbin, CachedPlotContour, Hexbin, Contour
-from QuasarCode.IO.Caching import CacheTargetFactory, CacheTarget
+from QuasarCode.Plotting import CachedFigureGrid, CachedPlotFactory, CachedPlot, CachedPlotFontInfo, CachedPlotLine, CachedPlotScatter, CachedPlotErrorbar, CachedPlotHexbin, CachedPlotContour, CachedPlotColourbar, Hexbin, Contour, HexbinPyramid, BinnedImage, FrameSequenceRenderer, Bins, HistogramAccumulator, HistogramAccumulator2D
+from QuasarCode.Plotting._decimation import decimate_scatter
+from QuasarCode.Tools import CacheableStruct
+from QuasarCode.IO.Caching import CacheTargetFactory, CacheTarget, hash_cache_data
 
 class Test_CachedPlot(object):
 
@@ -136,6 +145,16 @@ class Test_CachedPlot(object):
         assert np.all(loaded_re_rendered_test_hexbin.get_array() == mplt_hex_object.get_array())
         assert np.all(loaded_re_rendered_test_hexbin.get_alpha() == mplt_hex_object.get_alpha())
 
+        # Colour limits and map given when rendering take priority over the cached ones
+        hexbin_element = loaded_plot_data.plot_elements["hexbin"]
+        hexbin_element.min_value = 1
+        for rebin in (False, True):
+            hexbin_element.render(fig, ax, CachedPlotFontInfo(), rebin = rebin, vmin = 0, vmax = 5, cmap = "magma")
+            assert hexbin_element.result.get_clim() == (0, 5) and hexbin_element.result.get_cmap().name == "magma"
+            hexbin_element._remove_result()
+        hexbin_element.render(fig, ax, CachedPlotFontInfo(), vmax = 5)
+        assert hexbin_element.result.get_clim() == (1, 5)
+
     def test_Hexbin(self):
 
         plot_factory = CachedPlotFactory(".")
@@ -257,3 +276,478 @@ class Test_CachedPlot(object):
         assert np.all(loaded_re_rendered_test_contour.linestyles == mplt_hex_object.linestyles)
         assert np.all(loaded_re_rendered_test_contour.get_linewidth() == mplt_hex_object.get_linewidth())
 
+    def test_Contour_smoothing(self):
+
+        rng = np.random.default_rng(0)
+        contour_object = Contour(rng.normal(size = 100000), rng.normal(size = 100000))
+
+        contour_object.generate(gridsize = 64, extent = Rect.create_from_limits(-6, 6, -6, 6), smoothing = 0.2, density = True)
+        assert np.isclose(contour_object.levels.sum() * (12 / 64)**2, 1.0)
+        assert contour_object.levels.min() >= 0
+
+        # Levels enclosing the 1 and 2 sigma masses of a 2D Gaussian match the analytic values
+        fractions = (Contour.mass_fraction_for_sigma(1), Contour.mass_fraction_for_sigma(2))
+        levels = contour_object.add_contours_enclosing_mass(*fractions)
+        smoothed_peak = 1 / (2 * np.pi * (1 + 0.2**2))
+        assert np.allclose(levels, [smoothed_peak * np.exp(-1 / 2), smoothed_peak * np.exp(-2)], rtol = 0.1)
+        assert contour_object.contour_levels == set(levels)
+        assert Contour.levels_enclosing_mass(np.array([[4.0, 3.0], [2.0, 1.0]]), 0.4, 0.7, 1.0) == (4.0, 3.0, 1.0)
+
+        contour_object.generate(gridsize = 64, extent = Rect.create_from_limits(-6, 6, -6, 6), smoothing = "scott", adaptive = True)
+        assert np.isclose(contour_object.levels.sum(), 100000, rtol = 1e-3)
+
+    def test_HexbinPyramid(self):
+
+        extent = Rect.create_from_limits(0, 10, 0, 10)
+
+        coords = np.random.rand(10000, 2) * 10
+
+        pyramid = HexbinPyramid.build(coords[:, 0], coords[:, 1], extent, base_gridsize = 64)
+        assert pyramid.gridsizes == (64, 32, 16, 8)
+
+        cache = CacheTargetFactory("test_cache/Test_CachedPlot/test_hex/{file}.pickle", "file").new(file = "test_hex_pyramid")
+        cache.save_object(".", pyramid)
+        loaded_pyramid: HexbinPyramid = cache.load_object(".", HexbinPyramid)
+        assert loaded_pyramid.gridsizes == pyramid.gridsizes
+
+        fig = plt.figure()
+        ax = fig.gca()
+        mplt_hex_object = ax.hexbin(coords[:, 0], coords[:, 1], gridsize = 32, extent = extent.extent, mincnt = 1)
+
+        # Querying a grid that matches a level exactly reproduces the full calculation
+        hexes = loaded_pyramid.query(extent, 32, oversampling = 1)
+        assert np.all(hexes.polygon_offsets == mplt_hex_object.get_offsets())
+        assert np.all(hexes.bin_values == mplt_hex_object.get_array())
+
+    def test_compact_hexbin(self):
+
+        extent = Rect.create_from_limits(0, 10, 0, 10)
+
+        coords = np.random.rand(10000, 2) * 10
+
+        fig = plt.figure()
+        ax = fig.gca()
+        mplt_hex_object = ax.hexbin(coords[:, 0], coords[:, 1], gridsize = 32, extent = extent.extent, mincnt = 1)
+
+        hexes = CachedPlotHexbin.from_hexes(mplt_hex_object, extent, 32)
+        hexes.compact_storage = True
+
+        cache = CacheTargetFactory("test_cache/Test_CachedPlot/test_hex/{file}.pickle", "file").new(file = "test_compact_hex")
+        cache.save_object(".", hexes)
+        loaded_hexes: CachedPlotHexbin = cache.load_object(".", CachedPlotHexbin)
+        assert loaded_hexes.compact_storage
+        assert np.all(loaded_hexes.polygon_offsets == mplt_hex_object.get_offsets())
+        assert np.all(loaded_hexes.bin_values == mplt_hex_object.get_array())
+
+        hexes.compact_value_bits = 8
+        cache.save_object(".", hexes)
+        loaded_hexes = cache.load_object(".", CachedPlotHexbin)
+        assert np.all(loaded_hexes.polygon_offsets == mplt_hex_object.get_offsets())
+        assert np.allclose(loaded_hexes.bin_values, mplt_hex_object.get_array(), atol = np.ptp(mplt_hex_object.get_array()) / 254)
+
+        # Rendering builds the collection directly from the cached cells
+        fig = plt.figure()
+        ax = fig.gca()
+        hexes.render(fig, ax, None)
+        assert isinstance(hexes.result, PolyCollection)
+        assert np.all(hexes.result.get_offsets() == mplt_hex_object.get_offsets())
+        assert np.all(hexes.result.get_array() == mplt_hex_object.get_array())
+        assert np.all(hexes.result.get_paths()[0].vertices == mplt_hex_object.get_paths()[0].vertices)
+
+    def test_BinnedImage(self):
+
+        plot_factory = CachedPlotFactory(".")
+
+        plot_data = plot_factory.new(Rect.create_from_limits(0, 10, 0, 10))
+
+        cache_factory = CacheTargetFactory("test_cache/Test_CachedPlot/test_image/{file}.pickle", "file")
+
+        cache = cache_factory.new(file = "test_image_from_BinnedImage")
+
+        coords = np.random.rand(1000, 2) * 10
+
+        image_object = BinnedImage(coords[:, 0], coords[:, 1], Hexbin.create_hexbin_count())
+        image_data = image_object.calculate_image(plot_data.extent, (20, 10), default_bin_value = 0)
+        expected_counts, _, _ = np.histogram2d(coords[:, 0], coords[:, 1], bins = (20, 10), range = plot_data.extent.range)
+        assert np.all(image_data == expected_counts.T)
+
+        fig = plt.figure()
+        ax = fig.gca()
+
+        mplt_image_object = image_object.plot_image(extent = plot_data.extent, gridsize = (20, 10), colourmap = "viridis", axis = ax)
+        assert isinstance(mplt_image_object, AxesImage)
+
+        plot_data.add_element("image", image_object.data)
+        plot_factory.save(plot_data, cache)
+
+        loaded_plot_data: CachedPlot = plot_factory.load(cache)
+        loaded_plot_data.render(fig, ax)
+        loaded_re_rendered_test_image: AxesImage = loaded_plot_data.plot_elements["image"].result
+        assert isinstance(loaded_re_rendered_test_image, AxesImage)
+        assert np.all(np.isnan(loaded_re_rendered_test_image.get_array()) == np.isnan(mplt_image_object.get_array()))
+        assert np.nansum(loaded_re_rendered_test_image.get_array()) == np.nansum(mplt_image_object.get_array())
+
+    def test_save_all(self):
+
+        grid = CachedFigureGrid(mosaic = [["a", "b"]], layout = "constrained")
+        for name in ("a", "b"):
+            plot = CachedPlot(extent = Rect.create_from_limits(0, 1, 0, 1))
+            plot.add_element("line", CachedPlotLine(x = np.linspace(0, 1, 10), y = np.linspace(0, 1, 10)))
+            grid.set_plot(name, plot)
+        grid.render()
+
+        directory = "test_cache/Test_CachedPlot/test_save_all"
+        os.makedirs(directory, exist_ok = True)
+        timings = grid.save_all("figure", ("png", "pdf", "svg"), directory, concurrent_writes = True)
+        assert tuple(timings.keys()) == ("png", "pdf", "svg")
+        for file_format in ("png", "pdf", "svg"):
+            assert os.path.getsize(os.path.join(directory, f"figure.{file_format}")) > 0
+
+        # The layout engine is restored afterwards
+        assert isinstance(grid.figure.get_layout_engine(), ConstrainedLayoutEngine)
+
+    def test_update(self):
+
+        grid = CachedFigureGrid(mosaic = [["a"]])
+        plot = CachedPlot(extent = Rect.create_from_limits(0, 1, 0, 1))
+        plot.add_element("line", CachedPlotLine(x = np.linspace(0, 1, 10), y = np.linspace(0, 1, 10)))
+        plot.add_element("scatter", CachedPlotScatter(x = np.random.rand(10), y = np.random.rand(10)))
+        grid.set_plot("a", plot)
+        grid.render()
+
+        line = plot.plot_elements["line"].result
+        scatter = plot.plot_elements["scatter"].result
+        assert not grid.update()
+
+        # Only the changed element is re-rendered
+        plot.plot_elements["line"].colour = "red"
+        plot.x_axis_label = "x"
+        assert grid.update()
+        assert plot.plot_elements["line"].result is not line
+        assert plot.plot_elements["scatter"].result is scatter
+        assert grid.axes["a"].get_xlabel() == "x"
+        assert len(grid.axes["a"].lines) == 1
+
+        # Removed elements have their artists removed
+        del plot.plot_elements["scatter"]
+        assert grid.update()
+        assert len(grid.axes["a"].collections) == 0
+
+    def test_skip_if_unchanged(self):
+
+        def make_grid(colour: str) -> CachedFigureGrid:
+            grid = CachedFigureGrid(mosaic = [["a"]])
+            plot = CachedPlot(extent = Rect.create_from_limits(0, 1, 0, 1))
+            plot.add_element("line", CachedPlotLine(x = np.linspace(0, 1, 10), y = np.linspace(0, 1, 10), colour = colour))
+            grid.set_plot("a", plot)
+            return grid
+
+        directory = "test_cache/Test_CachedPlot/test_skip_if_unchanged"
+        shutil.rmtree(directory, ignore_errors = True)
+        os.makedirs(directory, exist_ok = True)
+
+        assert make_grid("red").get_content_hash("png") == make_grid("red").get_content_hash("png")
+        assert make_grid("red").get_content_hash("png") != make_grid("blue").get_content_hash("png")
+
+        assert make_grid("red").save_png("figure", directory, skip_if_unchanged = True)
+        unchanged_grid = make_grid("red")
+        assert not unchanged_grid.save_png("figure", directory, skip_if_unchanged = True)
+        try:
+            unchanged_grid.figure
+            assert False, "Figure should not have been rendered."
+        except RuntimeError:
+            pass
+        assert make_grid("blue").save_png("figure", directory, skip_if_unchanged = True)
+        assert tuple(make_grid("blue").save_all("figure", ("png", "pdf"), directory, skip_if_unchanged = True).keys()) == ("pdf",)
+
+        # Colour maps are hashed by their colours, so rendering with one doesn't make the figure look changed
+        colourmap_grid = make_grid("red")
+        colourmap_grid.plots["a"].add_element("scatter", CachedPlotScatter(x = np.linspace(0, 1, 10), y = np.linspace(0, 1, 10), colour = np.linspace(0, 1, 10), colourmap = plt.get_cmap("viridis").copy()))
+        content_hash = colourmap_grid.get_content_hash("png")
+        assert colourmap_grid.save_png("figure", directory, skip_if_unchanged = True)
+        assert colourmap_grid.get_content_hash("png") == content_hash
+        assert not colourmap_grid.save_png("figure", directory, skip_if_unchanged = True)
+        assert hash_cache_data(plt.get_cmap("viridis")) != hash_cache_data(plt.get_cmap("magma"))
+
+    def test_decimation(self):
+
+        x = np.linspace(0, 1, 100000)
+        y = np.random.rand(100000)
+        y[500] = np.nan
+
+        fig = plt.figure()
+        ax = fig.gca()
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+
+        line = CachedPlotLine(x = x, y = y, decimate = True, decimation_oversampling = 1)
+        line.render(fig, ax, None)
+        columns = int(np.ceil(ax.bbox.width))
+        decimated_x = line.result.get_xdata()
+        assert len(decimated_x) <= 4 * (columns + 2) + 1
+        assert np.isnan(line.result.get_ydata()).sum() == 1
+        assert np.nanmax(line.result.get_ydata()) == np.nanmax(y)
+        assert np.nanmin(line.result.get_ydata()) == np.nanmin(y)
+
+        scatter = CachedPlotScatter(x = x, y = y, size = np.ones_like(x), decimate = True)
+        scatter.render(fig, ax, None)
+        assert len(scatter.result.get_offsets()) < len(x)
+        assert len(scatter.result.get_sizes()) == len(scatter.result.get_offsets())
+
+        # The cached data is unchanged
+        assert len(line.x) == len(x) and len(scatter.x) == len(x)
+
+        # Points are thinned in proportion to the density, so dense regions remain denser than sparse ones
+        rng = np.random.default_rng(0)
+        dense_x, sparse_x = rng.uniform(0, 0.5, 20000), rng.uniform(0.5, 1, 2000)
+        kept = decimate_scatter(np.concatenate((dense_x, sparse_x)), rng.uniform(0, 1, 22000), (0, 1, 0, 1), 10, 10, points_per_pixel = 10, margin_pixels = 0)
+        number_dense, number_sparse = np.count_nonzero(kept < 20000), np.count_nonzero(kept >= 20000)
+        assert number_dense + number_sparse < 22000 and 5 < number_dense / number_sparse < 15
+
+        # Files saved at a higher resolution are decimated at that resolution
+        def count_plotted_points(resolution_for_files: int|None) -> int:
+            grid = CachedFigureGrid(mosaic = [["a"]], resolution = 50, resolution_for_files = resolution_for_files, use_pyplot = False)
+            plot = CachedPlot(extent = Rect.create_from_limits(0, 1, 0, 1))
+            plot.add_element("line", CachedPlotLine(x = x, y = y, decimate = True))
+            grid.set_plot("a", plot)
+            grid.render()
+            number_of_points = len(plot.plot_elements["line"].result.get_xdata())
+            grid.close_figure()
+            return number_of_points
+        assert count_plotted_points(200) > 2 * count_plotted_points(None)
+
+    def test_rasterisation(self):
+
+        grid = CachedFigureGrid(mosaic = [["a"]], rasterisation_threshold = 1000)
+        plot = CachedPlot(extent = Rect.create_from_limits(0, 1, 0, 1))
+        plot.add_element("line", CachedPlotLine(x = np.linspace(0, 1, 10), y = np.linspace(0, 1, 10)))
+        plot.add_element("scatter", CachedPlotScatter(x = np.random.rand(5000), y = np.random.rand(5000)))
+        grid.set_plot("a", plot)
+        grid.render()
+
+        assert grid.get_rasterised_elements() == [("a", "scatter", 5000)]
+        plot.plot_elements["line"].rasterise = True
+        assert [element_name for _, element_name, _ in grid.get_rasterised_elements()] == ["line", "scatter"]
+        plot.plot_elements["line"].rasterise = None
+
+        report = grid.get_rasterisation_report("pdf")
+        assert report.rasterised_file_size < report.vector_file_size
+        assert not plot.plot_elements["scatter"].result.get_rasterized()
+
+    def test_out_of_line_arrays(self):
+
+        plot_factory = CachedPlotFactory(".")
+        cache_factory = CacheTargetFactory("test_cache/Test_CachedPlot/test_out_of_line_arrays/{file}.pickle", "file", out_of_line_arrays = True, out_of_line_threshold = 1024)
+        cache = cache_factory.new(file = "test_out_of_line_arrays")
+
+        x = np.linspace(0, 1, 10000)
+        y = np.random.rand(10000)
+        plot_data = plot_factory.new(Rect.create_from_limits(0, 1, 0, 1))
+        plot_data.add_element("line", CachedPlotLine(x = x, y = y))
+        plot_data.add_element("small", CachedPlotLine(x = np.arange(10), y = np.arange(10)))
+        plot_factory.save(plot_data, cache)
+        assert os.path.isdir(cache.get_sidecar_directory("."))
+
+        loaded_plot_data: CachedPlot = plot_factory.load(cache)
+        assert isinstance(loaded_plot_data.plot_elements["line"].y, np.memmap)
+        assert np.all(loaded_plot_data.plot_elements["line"].y == y)
+        assert not isinstance(loaded_plot_data.plot_elements["small"].y, np.memmap)
+
+        # Re-saving over the files that the loaded arrays are mapped from
+        plot_factory.save(loaded_plot_data, cache)
+        assert np.all(plot_factory.load(cache).plot_elements["line"].y == y)
+        assert len(os.listdir(cache.get_sidecar_directory("."))) == 1
+
+        # An interrupted save leaves the previous file and its arrays intact
+        class Unpicklable(object):
+            def __reduce__(self):
+                raise RuntimeError("Unable to pickle.")
+        try:
+            cache.save_data(".", { "y" : np.zeros(10000), "unpicklable" : Unpicklable() })
+            assert False
+        except RuntimeError:
+            pass
+        assert np.all(plot_factory.load(cache).plot_elements["line"].y == y)
+        assert len(os.listdir(cache.get_sidecar_directory("."))) == 1
+
+        CacheTarget(cache.relative_filepath).save_object(".", loaded_plot_data)
+        assert not os.path.exists(cache.get_sidecar_directory("."))
+        assert np.all(plot_factory.load(cache).plot_elements["line"].y == y)
+
+    def test_cache_schema(self):
+        plot = CachedPlot(extent = Rect.create_from_limits(0, 1, 0, 1), title = "Schema")
+        plot.add_element("line", CachedPlotLine(x = np.arange(10.0), y = np.arange(10.0), label = "Line"))
+        plot.add_element("scatter", CachedPlotScatter(x = np.arange(5.0), y = np.arange(5.0), colour = "red"))
+        plot.add_colourbar("colourbar", CachedPlotColourbar(target_element = "scatter"))
+
+        # The compiled schemas produce exactly the same data as assigning and reading each attribute
+        data = plot.__get_cache_data__()
+        # Disabled for every struct type, so that the elements and fonts also use getattr and setattr
+        CacheableStruct._USE_CACHE_SCHEMA = False
+        try:
+            assert pickle.dumps(plot.__get_cache_data__()) == pickle.dumps(data)
+            loaded_without_schema = CachedPlot.__from_cache_data__(data)
+        finally:
+            CacheableStruct._USE_CACHE_SCHEMA = True
+        loaded = CachedPlot.__from_cache_data__(data)
+        assert pickle.dumps(loaded.__get_cache_data__()) == pickle.dumps(loaded_without_schema.__get_cache_data__()) == pickle.dumps(data)
+        assert loaded.title == "Schema" and loaded.plot_elements["line"].label == "Line" and np.all(loaded.plot_elements["scatter"].x == np.arange(5.0))
+        assert loaded.changed and loaded.plot_elements["line"].changed
+
+        # Uninitialised attributes are still rejected
+        line = CachedPlotLine(y = np.arange(3.0))
+        try:
+            line.__get_cache_data__()
+            assert False, "Expected an error for an uninitialised attribute."
+        except ValueError:
+            pass
+
+    def test_font_interning(self):
+
+        font = CachedPlotFontInfo(size = 12)
+        default_font = CachedPlotFontInfo(family = ["serif"], weight = "bold")
+
+        merged = font.with_default(default_font)
+        assert merged is CachedPlotFontInfo(size = 12).with_default(CachedPlotFontInfo(family = ["serif"], weight = "bold"))
+        assert merged.size == 12 and merged.weight == "bold"
+        assert merged.fontdict == { "fontsize" : 12, "fontfamily" : ["serif"], "fontweight" : "bold" }
+        assert merged.fontproperties == merged.fontproperties and merged.fontproperties is not merged.fontproperties
+
+        # Modifying a font invalidates results derived from it
+        font.size = 14
+        assert font.with_default(default_font).size == 14
+        assert merged.size == 12
+
+        # Modifying a shared result removes it from the shared tables
+        merged.size = 8
+        assert CachedPlotFontInfo(size = 12).with_default(default_font).size == 12
+        assert merged.fontdict["fontsize"] == 8
+
+    def test_headless_figure(self):
+
+        def render(seed: int) -> bytes:
+            grid = CachedFigureGrid(mosaic = [["a"]], figure_size = (3, 3), use_pyplot = False)
+            plot = CachedPlot(extent = Rect.create_from_limits(0, 1, 0, 1))
+            plot.add_element("scatter", CachedPlotScatter(x = np.random.default_rng(seed).random(100), y = np.random.default_rng(seed + 1).random(100)))
+            grid.set_plot("a", plot)
+            grid.render()
+            assert grid.figure.canvas.manager is None
+            buffer = io.BytesIO()
+            grid.figure.savefig(buffer, format = "png")
+            grid.close_figure()
+            return buffer.getvalue()
+
+        open_figures = plt.get_fignums()
+        sequential = [render(seed) for seed in range(8)]
+        with ThreadPoolExecutor(max_workers = 4) as executor:
+            concurrent = list(executor.map(render, range(8)))
+        assert concurrent == sequential
+        assert plt.get_fignums() == open_figures
+
+        grid = CachedFigureGrid(mosaic = [["a"]])
+        grid.make_figure_and_axes()
+        assert grid.figure.number in plt.get_fignums()
+        grid.close_figure()
+        assert plt.get_fignums() == open_figures
+        grid.make_figure_and_axes()
+        grid.close_figure()
+
+    def test_frame_sequence(self):
+
+        def make_plot(frame: int) -> CachedPlot:
+            rng = np.random.default_rng(frame)
+            plot = CachedPlot(extent = Rect.create_from_limits(0, 1, 0, 1), title = "Frames")
+            plot.add_element("line", CachedPlotLine(x = np.linspace(0, 1, 50), y = 0.5 + 0.4 * np.sin(np.linspace(0, 6, 50) + frame)))
+            plot.add_element("scatter", CachedPlotScatter(x = rng.random(200), y = rng.random(200), colour = rng.random(200)))
+            plot.add_colourbar("colourbar", CachedPlotColourbar(target_element = "scatter"))
+            hexbin_centres = np.stack(np.meshgrid(np.linspace(0, 1, 11), np.linspace(0, 1, 6)), axis = -1).reshape(-1, 2)
+            # Each frame has its own copy of the colour map (as when created by Hexbin.plot_hexbin)
+            plot.add_element("hexbin", CachedPlotHexbin(extent = plot.extent, gridsize = 10, polygon_offsets = hexbin_centres, bin_values = rng.random(len(hexbin_centres)), colourmap = plt.get_cmap("viridis")))
+            plot.add_colourbar("hexbin_colourbar", CachedPlotColourbar(target_element = "hexbin"))
+            return plot
+
+        def make_grid(plot: CachedPlot) -> CachedFigureGrid:
+            grid = CachedFigureGrid(mosaic = [["a"]], figure_size = (4, 3), use_pyplot = False)
+            grid.set_plot("a", plot)
+            return grid
+
+        template = make_grid(make_plot(0))
+        renderer = FrameSequenceRenderer(template)
+        renderer.render_frame()
+        scatter = template.plots["a"].plot_elements["scatter"].result
+        colourbar = template.plots["a"].colourbars["colourbar"].result
+        hexbin = template.plots["a"].plot_elements["hexbin"].result
+        hexbin_colourbar = template.plots["a"].colourbars["hexbin_colourbar"].result
+
+        pixels = renderer.render_frame({ "a" : make_plot(1) }).copy()
+        # Only the data has changed, so the artists are updated in-place
+        assert template.plots["a"].plot_elements["scatter"].result is scatter
+        assert template.plots["a"].colourbars["colourbar"].result is colourbar
+        assert template.plots["a"].plot_elements["hexbin"].result is hexbin
+        assert template.plots["a"].colourbars["hexbin_colourbar"].result is hexbin_colourbar
+
+        reference = make_grid(make_plot(1))
+        reference.render()
+        reference.figure.canvas.draw()
+        assert np.array_equal(pixels, np.asarray(reference.figure.canvas.buffer_rgba()))
+        reference.close_figure()
+
+        os.makedirs("test_cache/Test_CachedPlot/test_frame_sequence", exist_ok = True)
+        filepaths = renderer.write_png_sequence(({ "a" : make_plot(frame) } if frame % 2 == 0 else make_grid(make_plot(frame)) for frame in range(4)), directory = "test_cache/Test_CachedPlot/test_frame_sequence")
+        assert len(filepaths) == 4 and all(os.path.exists(filepath) for filepath in filepaths)
+        assert renderer.number_of_frames == 6
+
+class Test_Bins(object):
+
+    def test_HistogramAccumulator(self):
+
+        rng = np.random.default_rng(0)
+        values = np.concatenate((rng.normal(size = 10000), [np.nan, -10, 10, 3.0]))
+        weights = rng.random(len(values))
+        bins = Bins.make_linear_bins(-3, 3, 30)
+
+        accumulator = HistogramAccumulator(bins)
+        accumulator.add_chunks((values[start : start + 999], weights[start : start + 999]) for start in range(0, len(values), 999))
+        assert np.allclose(accumulator.values, np.histogram(values, bins = bins.edges, weights = weights)[0])
+        assert accumulator.number_of_points == len(values)
+        assert accumulator.number_outside == np.count_nonzero(~((values >= -3) & (values <= 3)))
+
+        # The bins are cached with their declared spacing
+        declared_bins = Bins(np.array([0.0, 1.0, 2.0, 3.0]), spacing = "irregular")
+        loaded = HistogramAccumulator.__from_cache_data__(pickle.loads(pickle.dumps(HistogramAccumulator(declared_bins).__get_cache_data__())))
+        assert loaded.bins.spacing == "irregular" and np.array_equal(loaded.bins.edges, declared_bins.edges)
+        loaded_2d = HistogramAccumulator2D.__from_cache_data__(pickle.loads(pickle.dumps(HistogramAccumulator2D(declared_bins, Bins.make_logarithmic_bins(1, 100, 4)).__get_cache_data__())))
+        assert loaded_2d.x_bins.spacing == "irregular" and loaded_2d.y_bins.spacing == "logarithmic"
+
+        os.makedirs("test_cache/Test_Bins/test_HistogramAccumulator", exist_ok = True)
+        coords = np.lib.format.open_memmap("test_cache/Test_Bins/test_HistogramAccumulator/coords.npy", mode = "w+", dtype = np.float64, shape = (2, 50000))
+        coords[:] = rng.normal(size = (2, 50000))
+        accumulator_2d = HistogramAccumulator2D(Bins.make_linear_bins(-4, 4, 40), Bins.make_linear_bins(-4, 4, 20))
+        accumulator_2d.add(coords[0], coords[1], chunk_size = 4096)
+        hist = np.histogram2d(coords[0], coords[1], bins = (accumulator_2d.x_bins.edges, accumulator_2d.y_bins.edges))[0].T
+        assert np.array_equal(accumulator_2d.values, hist)
+
+        contour_object = Contour(np.array(coords[0]), np.array(coords[1]))
+        contour_object.generate(gridsize = (40, 20), extent = Rect.create_from_limits(-4, 4, -4, 4), smoothing = 0.5, density = True)
+        accumulated_contour = Contour.from_accumulator(accumulator_2d, smoothing = 0.5, density = True)
+        assert np.allclose(accumulated_contour.levels, contour_object.levels)
+        assert np.allclose(accumulated_contour.get_levels_enclosing_mass(0.5), contour_object.get_levels_enclosing_mass(0.5))
+
+    def test_Bins_digitize(self):
+
+        rng = np.random.default_rng(0)
+        for bins, spacing in ((Bins.make_linear_bins(-3, 3, 30), "linear"), (Bins.make_logarithmic_bins(0.01, 100, 25), "logarithmic"), (Bins(np.array([0.0, 0.1, 0.5, 2.0])), "irregular")):
+            assert bins.spacing == spacing
+            edges = bins.edges
+            values = np.concatenate((rng.uniform(edges[0] - 1, edges[-1] + 1, 10000), edges, np.nextafter(edges, np.inf), np.nextafter(edges, -np.inf), [np.nan, np.inf, -np.inf]))
+            expected = np.searchsorted(edges, values, side = "right") - 1
+            expected[values == edges[-1]] = len(bins) - 1
+            expected[(expected < 0) | (expected >= len(bins)) | np.isnan(values)] = -1
+            out = np.empty(len(values), dtype = np.intp)
+            assert bins.digitize(values, out = out) is out
+            assert np.array_equal(out, expected)
+            clipped = bins.digitize(values, out_of_range = "clip")
+            assert np.all(clipped[values < edges[0]] == 0) and np.all(clipped[values > edges[-1]] == len(bins) - 1) and np.all(clipped[np.isnan(values)] == -1)
+
+        assert Bins(np.linspace(0, 1, 11)).spacing == "linear"
+        assert Bins.__from_cache_data__(Bins.make_logarithmic_bins(1, 10, 5).__get_cache_data__()).spacing == "logarithmic"
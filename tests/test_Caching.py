@@ -0,0 +1,307 @@
+from typing import cast
+import os
+import pickle
+import shutil
+import stat
+
+import numpy as np
+
+from QuasarCode.Data import Rect
+from QuasarCode.Plotting import CachedPlotFactory, CachedPlot, CachedPlotFontInfo, CachedPlotLine, CachedPlotScatter, Bins
+from QuasarCode.IO.Caching import CacheTargetFactory, CacheTarget, BulkCacheError, CacheDependencies, ColumnarSerialiser, ObjectCache, PackedCacheStore, cached, hash_cache_data
+from QuasarCode.IO.Caching._CacheableList import CacheableList
+
+class Test_Caching(object):
+
+    def test_CacheableList(self):
+        bins = CacheableList([Bins.make_linear_bins(0, 1, 10), Bins.make_logarithmic_bins(1, 100, 5), Bins(np.array([0.0, 1.0, 5.0])), Bins(np.array([], dtype = float))])
+        data = bins.__get_cache_data__()
+        assert data["type"] is Bins and "types" not in data and data["batch"]["bin_edges"].shape == (11 + 6 + 3,)
+        loaded = CacheableList.__from_cache_data__(pickle.loads(pickle.dumps(data)))
+        assert len(loaded) == 4 and [item.spacing for item in loaded] == ["linear", "logarithmic", "irregular", "irregular"]
+        assert all(np.array_equal(a.edges, b.edges) and np.array_equal(a.centres, b.centres) and np.array_equal(a.widths, b.widths) for a, b in zip(bins, loaded))
+        assert loaded[0].edges.base is loaded[1].edges.base # Views of the stored array
+
+        # Edges that can't be concatenated without changing their type are stored separately
+        mixed_types = CacheableList([Bins(np.arange(5, dtype = np.float32)), Bins(np.arange(4.0))])
+        loaded = CacheableList.__from_cache_data__(mixed_types.__get_cache_data__())
+        assert [item.edges.dtype for item in loaded] == [np.float32, np.float64]
+
+        # Lists of different types store each item's type and data
+        font = CachedPlotFontInfo(size = 12, family = ["serif"])
+        heterogeneous = CacheableList([Bins.make_linear_bins(0, 1, 4), font])
+        data = heterogeneous.__get_cache_data__()
+        assert data["types"] == [Bins, CachedPlotFontInfo]
+        loaded = CacheableList.__from_cache_data__(data)
+        assert np.array_equal(loaded[0].edges, heterogeneous[0].edges) and loaded[1].size == 12 and loaded[1].family == ["serif"]
+
+    def test_columnar_serialiser(self):
+
+        plot_factory = CachedPlotFactory(".")
+        cache_factory = CacheTargetFactory("test_cache/Test_Caching/test_columnar_serialiser/{file}.qcc", "file")
+        cache = cache_factory.new(file = "test_columnar_serialiser")
+        assert isinstance(cache.serialiser, ColumnarSerialiser)
+
+        x = np.linspace(0, 1, 10000)
+        y = np.random.rand(10000)
+        plot_data = plot_factory.new(Rect.create_from_limits(0, 1, 0, 1))
+        plot_data.add_element("line", CachedPlotLine(x = x, y = y, label = "line", font = CachedPlotFontInfo(size = 12)))
+        plot_data.add_element("scatter", CachedPlotScatter(x = x, y = y, colour = np.float32(0.5)))
+        plot_factory.save(plot_data, cache)
+        with open(cache.get_filepath("."), "rb") as file:
+            assert file.read(len(ColumnarSerialiser.magic)) == ColumnarSerialiser.magic
+
+        loaded_plot_data: CachedPlot = plot_factory.load(cache)
+        assert hash_cache_data(loaded_plot_data) == hash_cache_data(plot_data)
+        loaded_y = loaded_plot_data.plot_elements["line"].y
+        assert not loaded_y.flags.owndata and loaded_y.ctypes.data % ColumnarSerialiser.ALIGNMENT == 0
+        assert loaded_plot_data.plot_elements["scatter"].colour.dtype == np.float32
+
+        # Re-saving over the file that the loaded arrays are mapped from
+        plot_factory.save(loaded_plot_data, cache)
+        assert np.all(plot_factory.load(cache).plot_elements["line"].y == y)
+
+        # Files are loaded in the format they were saved in
+        CacheTarget("test_cache/Test_Caching/test_columnar_serialiser/pickled.pickle").save_object(".", plot_data)
+        os.replace("test_cache/Test_Caching/test_columnar_serialiser/pickled.pickle", "test_cache/Test_Caching/test_columnar_serialiser/pickled.qcc")
+        assert hash_cache_data(CacheTarget("test_cache/Test_Caching/test_columnar_serialiser/pickled.qcc").load_object(".", CachedPlot)) == hash_cache_data(plot_data)
+
+        data = { "tuple" : (1, "a", None), 2 : float("nan"), (1, 2) : b"bytes", "@" : 1 + 2j, "empty" : np.zeros((0, 3)), "object" : { 1, 2 }, "type" : CachedPlotLine }
+        CacheTarget("test_cache/Test_Caching/test_columnar_serialiser/data.qcc", mmap_mode = None).save_data(".", data)
+        loaded_data = CacheTarget("test_cache/Test_Caching/test_columnar_serialiser/data.qcc", mmap_mode = None).load_data(".")
+        assert hash_cache_data({ key : value for key, value in loaded_data.items() if key != 2 }) == hash_cache_data({ key : value for key, value in data.items() if key != 2 })
+        assert np.isnan(loaded_data[2])
+
+        # Formats that are not registered for an extension are still recognised by the target that saved them
+        class UnregisteredSerialiser(ColumnarSerialiser):
+            magic = b"QCTESTUNREGISTEREDv1\0"
+        cache = CacheTarget("test_cache/Test_Caching/test_columnar_serialiser/unregistered.dat", serialiser = UnregisteredSerialiser())
+        cache.save_data(".", { "x" : np.arange(10.0) })
+        assert np.array_equal(cache.load_data(".")["x"], np.arange(10.0))
+
+    def test_atomic_compressed_save(self):
+
+        shutil.rmtree("test_cache/Test_Caching/test_atomic_compressed_save", ignore_errors = True)
+        data = { "x" : np.zeros(100000), "label" : "data" }
+        for filename, compression in (("data.pickle", "gzip"), ("data.qcc", "auto")):
+            cache = CacheTarget(f"test_cache/Test_Caching/test_atomic_compressed_save/{filename}", compression = compression, compression_level = 1)
+            cache.save_data(".", data)
+            assert os.path.getsize(cache.get_filepath(".")) < data["x"].nbytes / 10
+            assert hash_cache_data(cache.load_data(".")) == hash_cache_data(data)
+            # Compression is detected when loading
+            assert hash_cache_data(CacheTarget(cache.relative_filepath).load_data(".")) == hash_cache_data(data)
+
+        class Unpicklable(object):
+            def __reduce__(self):
+                raise RuntimeError("Unable to pickle.")
+        try:
+            cache.save_data(".", { "x" : Unpicklable() })
+            assert False
+        except RuntimeError:
+            pass
+        # The previous file is left intact, without any temporary files
+        assert hash_cache_data(cache.load_data(".")) == hash_cache_data(data)
+        assert sorted(os.listdir("test_cache/Test_Caching/test_atomic_compressed_save")) == ["data.pickle", "data.qcc"]
+
+        # Files have the same permissions as those created with open(), and keep them when replaced
+        if os.name == "posix":
+            cache = CacheTarget("test_cache/Test_Caching/test_atomic_compressed_save/permissions/data.pickle")
+            previous_umask = os.umask(0o022)
+            try:
+                cache.save_data(".", data)
+            finally:
+                os.umask(previous_umask)
+            assert stat.S_IMODE(os.stat(cache.get_filepath(".")).st_mode) == 0o644
+            os.chmod(cache.get_filepath("."), 0o664)
+            cache.save_data(".", data)
+            assert stat.S_IMODE(os.stat(cache.get_filepath(".")).st_mode) == 0o664
+
+    def test_object_cache(self):
+
+        plot_factory = CachedPlotFactory(".")
+        cache_factory = CacheTargetFactory("test_cache/Test_Caching/test_object_cache/{file}.pickle", "file", object_cache = ObjectCache(maximum_size = 200000))
+        cache = cache_factory.new(file = "a")
+        other_cache = cache_factory.new(file = "b")
+        assert cache.object_cache is cache_factory.object_cache and other_cache.object_cache is cache_factory.object_cache
+        object_cache = cast(ObjectCache, cache_factory.object_cache)
+
+        plot_data = plot_factory.new(Rect.create_from_limits(0, 1, 0, 1))
+        plot_data.add_element("line", CachedPlotLine(x = np.linspace(0, 1, 10000), y = np.zeros(10000)))
+        plot_factory.save(plot_data, cache)
+        plot_factory.save(plot_data, other_cache)
+
+        first = plot_factory.load(cache)
+        second = plot_factory.load(cache)
+        assert object_cache.misses == 1 and object_cache.hits == 1
+        assert first.plot_elements["line"].y is second.plot_elements["line"].y
+        assert 160000 <= object_cache.size <= 200000
+
+        # Saving (or otherwise changing the file) invalidates the cached data
+        plot_data.plot_elements["line"].y = np.ones(10000)
+        plot_factory.save(plot_data, cache)
+        assert np.all(plot_factory.load(cache).plot_elements["line"].y == 1)
+        assert object_cache.misses == 2
+
+        # Loading another file exceeds the maximum size, so the least recently used data is discarded
+        plot_factory.load(other_cache)
+        assert object_cache.evictions == 1 and len(object_cache) == 1 and other_cache.get_filepath(".") in object_cache
+
+        object_cache.invalidate()
+        assert len(object_cache) == 0 and object_cache.size == 0
+
+    def test_cache_dependencies(self):
+
+        shutil.rmtree("test_cache/Test_Caching/test_cache_dependencies", ignore_errors = True)
+        os.makedirs("test_cache/Test_Caching/test_cache_dependencies", exist_ok = True)
+        input_filepath = "test_cache/Test_Caching/test_cache_dependencies/input.txt"
+        with open(input_filepath, "w") as file:
+            file.write("input")
+
+        plot_factory = CachedPlotFactory(".")
+        plot_data = plot_factory.new(Rect.create_from_limits(0, 1, 0, 1))
+        plot_data.add_element("line", CachedPlotLine(x = np.arange(10), y = np.arange(10)))
+        def get_dependencies(bins: int) -> CacheDependencies:
+            return CacheDependencies(files = [input_filepath], parameters = { "bins" : bins, "edges" : np.linspace(0, 1, bins + 1) }, code_versions = { "analysis" : "1.0" })
+
+        for filename, options in (("plot.pickle", {}), ("plot.qcc", {}), ("compressed.qcc", { "compression" : "gzip" })):
+            cache = CacheTarget(f"test_cache/Test_Caching/test_cache_dependencies/{filename}", **options)
+            assert not cache.check_exists(".", check_fresh = True)
+            plot_factory.save(plot_data, cache, get_dependencies(10))
+            assert cache.check_exists(".", check_fresh = True) and plot_factory.check_fresh(cache, get_dependencies(10))
+            assert not cache.check_exists(".", dependencies = get_dependencies(20))
+            assert cache.get_dependency_fingerprint(".")["code_versions"] == { "analysis" : "1.0" }
+            assert hash_cache_data(plot_factory.load(cache)) == hash_cache_data(plot_data)
+
+        # Arrays in columnar files remain aligned after the dependency header
+        aligned_cache = CacheTarget("test_cache/Test_Caching/test_cache_dependencies/aligned.qcc", mmap_mode = "r")
+        aligned_cache.save_data(".", { "x" : np.arange(1000.0) }, get_dependencies(10))
+        x = aligned_cache.load_data(".")["x"]
+        assert x.flags.aligned and x.ctypes.data % ColumnarSerialiser.ALIGNMENT == 0 and np.array_equal(x, np.arange(1000.0))
+
+        # Data saved without dependencies can't be checked against them
+        CacheTarget(cache.relative_filepath).save_object(".", plot_data)
+        assert cache.check_exists(".", check_fresh = True) and not cache.check_exists(".", dependencies = get_dependencies(10))
+
+        os.utime(input_filepath, ns = (0, 0))
+        assert not plot_factory.check_fresh(CacheTarget("test_cache/Test_Caching/test_cache_dependencies/plot.pickle"))
+
+        cache.save_object(".", plot_data, CacheDependencies(hashed_files = [input_filepath]).add_module(np))
+        os.utime(input_filepath, ns = (10**9, 10**9))
+        assert cache.check_exists(".", check_fresh = True)
+        with open(input_filepath, "w") as file:
+            file.write("changed")
+        assert not cache.check_exists(".", check_fresh = True)
+
+    def test_cached_decorator(self):
+
+        calls: list[str] = []
+
+        @cached(CacheTargetFactory("test_cache/Test_Caching/test_cached_decorator/{name}_{hash}.qcc", "name", "hash"))
+        def make_histogram(name: str, values: np.ndarray, bins: int = 10) -> Bins:
+            calls.append(name)
+            return Bins(np.histogram_bin_edges(values, bins = bins))
+
+        @cached(CacheTargetFactory("test_cache/Test_Caching/test_cached_decorator/{name}.pickle", "name"), mpi = True)
+        def get_total(name: str, values: np.ndarray) -> dict[str, float]:
+            calls.append(name)
+            return { "total" : float(values.sum()) }
+
+        values = np.random.rand(1000)
+        first = make_histogram("a", values)
+        second = make_histogram("a", values.copy(), bins = 10)
+        assert calls == ["a"] and isinstance(second, Bins) and np.array_equal(first.edges, second.edges)
+        make_histogram("a", values, bins = 20)
+        make_histogram("a", values + 1)
+        assert calls == ["a", "a", "a"]
+        assert make_histogram.get_target("a", values).relative_filepath != make_histogram.get_target("a", values + 1).relative_filepath
+
+        assert get_total("b", values) == get_total("b", values) == { "total" : float(values.sum()) }
+        # Arguments that are not part of the file name are still checked
+        assert get_total("b", values[:10]) == { "total" : float(values[:10].sum()) }
+        assert calls == ["a", "a", "a", "b", "b"]
+
+        # Dependencies given to the decorator are not modified
+        shared_dependencies = CacheDependencies(parameters = { "version" : 1 })
+        fingerprint = shared_dependencies.get_fingerprint()
+        @cached(CacheTargetFactory("test_cache/Test_Caching/test_cached_decorator/{name}_dependencies.pickle", "name"), dependencies = shared_dependencies)
+        def get_mean(name: str, values: np.ndarray) -> float:
+            return float(values.mean())
+        assert get_mean("c", values) == get_mean("c", values) == float(values.mean())
+        assert shared_dependencies.get_fingerprint() == fingerprint
+
+        # Errors when saving on the root rank are raised
+        @cached(CacheTargetFactory("test_cache/Test_Caching/test_cached_decorator/{name}.pickle", "name"), mpi = True)
+        def get_function(name: str):
+            return lambda: None
+        try:
+            get_function("d")
+            assert False, "Expected an error when saving an unpicklable result."
+        except (pickle.PicklingError, AttributeError):
+            pass
+
+    def test_bulk_load_save(self):
+
+        cache_factory = CacheTargetFactory("test_cache/Test_Caching/test_bulk_load_save/{index}.pickle", "index")
+        targets = [cache_factory.new(index = str(index)) for index in range(20)]
+        bins = [Bins.make_linear_bins(0, index + 1, 10) for index in range(20)]
+        assert CacheTarget.save_many(targets, ".", bins, max_workers = 4) == [None] * 20
+
+        loaded_bins = CacheTarget.load_many(targets, ".", Bins, max_workers = 4)
+        assert all(np.array_equal(loaded.edges, original.edges) for loaded, original in zip(loaded_bins, bins))
+        assert np.array_equal(CacheTarget.load_many(targets[:2], ".")[1]["bin_edges"], bins[1].edges)
+
+        missing_targets = [targets[0], cache_factory.new(index = "missing"), targets[2]]
+        try:
+            CacheTarget.load_many(missing_targets, ".", Bins)
+            assert False
+        except BulkCacheError as error:
+            assert list(error.errors) == [1] and isinstance(error.errors[1], FileNotFoundError)
+            assert error.results[1] is None and np.array_equal(error.results[2].edges, bins[2].edges)
+        results = CacheTarget.load_many(missing_targets, ".", Bins, return_exceptions = True)
+        assert isinstance(results[0], Bins) and isinstance(results[1], FileNotFoundError)
+
+    def test_packed_store(self):
+
+        shutil.rmtree("test_cache/Test_Caching/test_packed_store", ignore_errors = True)
+        plot_factory = CachedPlotFactory(".")
+        cache_factory = CacheTargetFactory("plots/{name}.qcc", "name", packed_store = "test_cache/Test_Caching/test_packed_store/cache.sqlite", object_cache = True)
+        targets = [cache_factory.new(name = str(index)) for index in range(50)]
+        # Checking for data doesn't create the container file
+        assert not targets[0].check_exists(".") and not os.path.exists("test_cache/Test_Caching/test_packed_store")
+        plots = []
+        for index, target in enumerate(targets):
+            plot_data = plot_factory.new(Rect.create_from_limits(0, 1, 0, 1))
+            plot_data.add_element("line", CachedPlotLine(x = np.arange(100.0), y = np.full(100, float(index))))
+            plots.append(plot_data)
+        CacheTarget.save_many(targets, ".", plots)
+        plot_factory.save(plots[0], targets[0], CacheDependencies(parameters = { "index" : 0 }))
+        assert os.listdir("test_cache/Test_Caching/test_packed_store") == ["cache.sqlite"]
+
+        store = cast(PackedCacheStore, targets[0].get_packed_store("."))
+        assert len(store) == 50 and "plots/7.qcc" in store and store.get_version("plots/0.qcc") == 51
+        assert targets[3].check_exists(".") and not cache_factory.new(name = "missing").check_exists(".")
+        assert targets[0].check_exists(".", dependencies = CacheDependencies(parameters = { "index" : 0 }))
+        assert not targets[0].check_exists(".", dependencies = CacheDependencies(parameters = { "index" : 1 }))
+        assert all(np.all(plot.plot_elements["line"].y == index) for index, plot in enumerate(CacheTarget.load_many(targets, ".", CachedPlot)))
+
+        # Replacing an entry (the old data is still cached)
+        plot_factory.load(targets[1])
+        plots[1].plot_elements["line"].y = np.zeros(100)
+        plot_factory.save(plots[1], targets[1])
+        assert np.all(plot_factory.load(targets[1]).plot_elements["line"].y == 0)
+
+        # Entries that are deleted and written again (e.g. by another process) get a new version
+        version = store.get_version("plots/2.qcc")
+        plot_factory.load(targets[2])
+        store.delete("plots/2.qcc")
+        store.write("plots/2.qcc", store.read("plots/1.qcc"))
+        assert cast(int, store.get_version("plots/2.qcc")) > cast(int, version)
+        assert np.all(plot_factory.load(targets[2]).plot_elements["line"].y == 0)
+
+        for target in targets[10:]:
+            store.delete(target.relative_filepath)
+        size_before_compaction = os.path.getsize(store.filepath)
+        store.compact()
+        assert len(store) == 10 and os.path.getsize(store.filepath) < size_before_compaction
+        assert np.all(plot_factory.load(targets[5]).plot_elements["line"].y == 5)
+        store.close()